@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark du pipeline parallèle en fonction du nombre de sujets N.
+
+Pour chaque N, un pipeline de N chercheurs est construit (``build_pipeline``)
+et exécuté avec le backend LLM local et une latence simulée par appel. Les
+appels des chercheurs passent par le scheduler (``--concurrency`` par modèle) :
+ils s'exécutent par lots, la latence attendue est donc d'environ
+``ceil(N / concurrency) + 1`` appels (lots de chercheurs puis fusion).
+
+Mesures par N :
+- latence d'un tour p50 / p95
+- latence attendue (lots × latence simulée) et écart mesuré
+- appels modèle par tour, attente maximale dans le scheduler
+
+Usage :
+    python benchmarks/bench_fanout.py
+    python benchmarks/bench_fanout.py --topics 1 4 16 64 --concurrency 16 --latency-ms 100
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+from bench_templates import TEMPLATES_DIR, percentile
+
+sys.path.insert(0, str(TEMPLATES_DIR / "parallel-agent"))
+
+
+async def run_turns(pipeline, turns: int) -> list:
+    """Exécuter ``turns`` tours séquentiels (une session neuve par tour)."""
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="bench", session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="Research these topics")])
+    latencies = []
+    for turn in range(turns):
+        session_id = f"s_{turn}"
+        await session_service.create_session(app_name="bench", user_id="u", session_id=session_id)
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+            pass
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench(args) -> list:
+    from src.parallel_agent.agent import build_pipeline
+    from src.parallel_agent.fake_llm import CALL_COUNTS
+    from src.parallel_agent.scheduler import get_scheduler
+
+    results = []
+    for count in args.topics:
+        pipeline = build_pipeline([f"Topic {index}" for index in range(count)])
+        await run_turns(pipeline, 1)  # Échauffement
+        calls_before = sum(CALL_COUNTS.values())
+        latencies = sorted(await run_turns(pipeline, args.turns))
+        calls = sum(CALL_COUNTS.values()) - calls_before
+
+        batches = math.ceil(count / args.concurrency) if args.concurrency else 1
+        expected_ms = (batches + 1) * args.latency_ms
+        p50_ms = percentile(latencies, 50) * 1000
+        scheduler = get_scheduler()
+        max_wait = max(
+            (m["wait_ms"]["max"] for m in scheduler.metrics().values()), default=0.0
+        ) if scheduler else 0.0
+        results.append({
+            "topics": count,
+            "latency_ms": {
+                "p50": p50_ms,
+                "p95": percentile(latencies, 95) * 1000,
+            },
+            "expected_ms": expected_ms,
+            "overhead_ms": p50_ms - expected_ms,
+            "model_calls_per_turn": calls / args.turns,
+            "max_scheduler_wait_ms": max_wait,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", type=int, nargs="+", default=[1, 3, 6, 12, 24, 48])
+    parser.add_argument("--turns", type=int, default=5, help="Tours mesurés par N")
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="Latence simulée par appel modèle")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Appels simultanés par modèle (MODEL_CONCURRENCY, 0 = sans limite)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    # Avant le premier import du package : backend local et scheduler configurés
+    os.environ["ADK_FAKE_LLM"] = "1"
+    os.environ["ADK_FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["MODEL_CONCURRENCY"] = str(args.concurrency)
+
+    results = asyncio.run(bench(args))
+
+    print(f"latence simulée {args.latency_ms:.0f} ms, MODEL_CONCURRENCY={args.concurrency}")
+    print(f"{'N':>4} {'p50 ms':>9} {'p95 ms':>9} {'attendu':>9} {'écart':>8} {'appels':>7}")
+    for r in results:
+        print(f"{r['topics']:>4} {r['latency_ms']['p50']:>9.1f} {r['latency_ms']['p95']:>9.1f} "
+              f"{r['expected_ms']:>9.1f} {r['overhead_ms']:>8.1f} {r['model_calls_per_turn']:>7.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "latency_ms": args.latency_ms,
+                "concurrency": args.concurrency,
+                "turns": args.turns,
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
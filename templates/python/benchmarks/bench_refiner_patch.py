@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark du refiner de loop-agent : texte complet contre correctifs.
+
+La boucle critique/refiner est exécutée deux fois avec le backend LLM local :
+refiner d'origine (régénération complète) puis ``PatchRefiner`` (correctif
+JSON appliqué localement). Le coût d'un appel simulé est
+``--latency-ms + --token-latency-ms × tokens de sortie`` : la durée du refiner
+suit la longueur de sa réponse, comme avec Gemini.
+
+Le correctif simulé remplace la première phrase (règle de script du backend
+local) ; le critique ne converge jamais, chaque tour est donc mesuré.
+
+Mesures par mode et par tour :
+- tokens de sortie du refiner
+- latence du refiner (réponse du critique → document mis à jour)
+
+Usage :
+    python benchmarks/bench_refiner_patch.py
+    python benchmarks/bench_refiner_patch.py --iterations 5 --output-tokens 300 \
+        --token-latency-ms 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from bench_templates import TEMPLATES_DIR
+
+sys.path.insert(0, str(TEMPLATES_DIR / "loop-agent"))
+
+PATCH = {"operations": [{"op": "replace", "sentence": 1, "text": "The robot painted at dawn."}]}
+
+
+def build_pipeline(mode: str, iterations: int):
+    """Pipeline rédacteur → boucle [critique → refiner] pour un mode."""
+    from google.adk.agents import LoopAgent, SequentialAgent
+    from src.loop_agent.patching import PatchRefiner
+    from src.loop_agent.sub_agents import critic_agent, initial_writer, refiner_agent
+
+    refiner = refiner_agent.clone()
+    loop = LoopAgent(
+        name="refinement_loop",
+        sub_agents=[critic_agent.clone(), PatchRefiner(refiner) if mode == "patch" else refiner],
+        max_iterations=iterations,
+    )
+    return SequentialAgent(name="pipeline", sub_agents=[initial_writer.clone(), loop])
+
+
+def refiner_iterations(events: list) -> list:
+    """(tokens de sortie, latence ms) du refiner pour chaque tour.
+
+    ``events`` : couples (événement, instant de réception par le Runner).
+    """
+    iterations = []
+    critic_at = None
+    tokens = 0
+    for event, received in events:
+        if event.partial:
+            continue
+        if event.author == "critic" and event.is_final_response():
+            critic_at, tokens = received, 0
+        elif critic_at is not None and event.author.startswith("refiner") and event.usage_metadata:
+            tokens += event.usage_metadata.candidates_token_count or 0
+        delta = event.actions.state_delta if event.actions else {}
+        if critic_at is not None and "current_document" in delta:
+            iterations.append((tokens, (received - critic_at) * 1000))
+            critic_at = None
+    return iterations
+
+
+async def run_mode(mode: str, args) -> dict:
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=build_pipeline(mode, args.iterations), app_name="bench",
+                    session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="Generate and refine a story")])
+    iterations = []
+    for turn in range(args.turns):
+        await session_service.create_session(app_name="bench", user_id="u",
+                                             session_id=f"s_{turn}",
+                                             state={"topic": "A robot learning to paint"})
+        events = [(event, time.perf_counter()) async for event in runner.run_async(
+            user_id="u", session_id=f"s_{turn}", new_message=content
+        )]
+        iterations.extend(refiner_iterations(events))
+
+    return {
+        "mode": mode,
+        "iterations": len(iterations),
+        "output_tokens_per_iteration": statistics.mean(t for t, _ in iterations),
+        "latency_ms_per_iteration": statistics.mean(ms for _, ms in iterations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=3, help="Tours de boucle par exécution")
+    parser.add_argument("--turns", type=int, default=3, help="Exécutions mesurées par mode")
+    parser.add_argument("--output-tokens", type=int, default=200,
+                        help="Longueur (mots) des textes générés")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Latence fixe simulée par appel modèle")
+    parser.add_argument("--token-latency-ms", type=float, default=2.0,
+                        help="Latence simulée par token de sortie")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    # Le correctif simulé est servi par une règle de script du backend local
+    script = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    json.dump([{"match": "minimal edits", "text": json.dumps(PATCH)}], script)
+    script.close()
+
+    # Avant le premier import du package : backend local configuré
+    os.environ["ADK_FAKE_LLM"] = "1"
+    os.environ["ADK_FAKE_LLM_SCRIPT"] = script.name
+    os.environ["ADK_FAKE_LLM_OUTPUT_TOKENS"] = str(args.output_tokens)
+    os.environ["ADK_FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["ADK_FAKE_LLM_TOKEN_LATENCY_MS"] = str(args.token_latency_ms)
+    os.environ["ADK_FAKE_LLM_CONVERGE_AFTER"] = "1000"
+
+    try:
+        results = [asyncio.run(run_mode(mode, args)) for mode in ("full", "patch")]
+    finally:
+        os.unlink(script.name)
+
+    print(f"latence simulée {args.latency_ms:.0f} ms + {args.token_latency_ms:g} ms/token, "
+          f"{args.output_tokens} mots par texte")
+    print(f"{'mode':>6} {'tours':>6} {'tokens/tour':>12} {'ms/tour':>9}")
+    for r in results:
+        print(f"{r['mode']:>6} {r['iterations']:>6} {r['output_tokens_per_iteration']:>12.1f} "
+              f"{r['latency_ms_per_iteration']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "latency_ms": args.latency_ms,
+                "token_latency_ms": args.token_latency_ms,
+                "output_tokens": args.output_tokens,
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
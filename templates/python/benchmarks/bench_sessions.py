@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark des services de sessions : InMemorySessionService vs SQLite.
+
+Mesures par service :
+- ajouts d'événements par seconde (sessions concurrentes)
+- latence de ``get_session`` sur une session longue (historique complet et
+  N derniers événements)
+- taille de la base sur disque
+
+Le service SQLite est mesuré avec écriture immédiate (``batch_size=1``) et
+avec ajouts groupés.
+
+Usage :
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sessions 50 --events 200 --output results/sessions.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_templates import TEMPLATES_DIR, percentile
+
+# Le service est identique dans tous les templates : on utilise celui de simple-agent
+sys.path.insert(0, str(TEMPLATES_DIR / "simple-agent"))
+
+
+def make_event(index: int, payload_chars: int):
+    from google.adk.events import Event, EventActions
+    from google.genai import types
+
+    author = "user" if index % 2 == 0 else "agent"
+    return Event(
+        author=author,
+        invocation_id=f"inv_{index // 2}",
+        content=types.Content(
+            role="user" if author == "user" else "model",
+            parts=[types.Part(text=f"message {index} " + "x" * payload_chars)],
+        ),
+        actions=EventActions(state_delta={"last_index": index}),
+    )
+
+
+async def bench_service(name: str, service, args) -> dict:
+    """Remplir ``args.sessions`` sessions en parallèle puis relire la plus longue."""
+    sessions = [
+        await service.create_session(app_name="bench", user_id=f"user_{i}", session_id=f"s_{i}")
+        for i in range(args.sessions)
+    ]
+
+    async def fill(session) -> None:
+        for index in range(args.events):
+            await service.append_event(session, make_event(index, args.payload_chars))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fill(session) for session in sessions))
+    if hasattr(service, "flush"):
+        await service.flush()
+    append_wall = time.perf_counter() - start
+    total_events = args.sessions * args.events
+
+    async def read_latencies(**kwargs) -> list:
+        latencies = []
+        for _ in range(args.reads):
+            start = time.perf_counter()
+            await service.get_session(app_name="bench", user_id="user_0", session_id="s_0", **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    from google.adk.sessions.base_session_service import GetSessionConfig
+
+    full = await read_latencies()
+    recent = await read_latencies(config=GetSessionConfig(num_recent_events=args.recent))
+    return {
+        "service": name,
+        "events": total_events,
+        "appends_per_sec": total_events / append_wall,
+        "get_session_full_ms": {"p50": statistics.median(full), "p95": percentile(full, 95)},
+        "get_session_recent_ms": {"p50": statistics.median(recent), "p95": percentile(recent, 95)},
+    }
+
+
+async def run(args) -> list:
+    from google.adk.sessions import InMemorySessionService
+
+    from src.simple_agent.sqlite_session_service import SqliteSessionService
+
+    results = [await bench_service("in-memory", InMemorySessionService(), args)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in (1, args.batch_size):
+            db_path = Path(tmp) / f"sessions_{batch_size}.db"
+            service = SqliteSessionService(db_path, batch_size=batch_size)
+            result = await bench_service(f"sqlite batch={batch_size}", service, args)
+            await service.close()
+            result["db_mb"] = sum(
+                p.stat().st_size for p in Path(tmp).glob(f"{db_path.name}*")
+            ) / (1024 * 1024)
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des services de sessions")
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions remplies en parallèle")
+    parser.add_argument("--events", type=int, default=200, help="Événements par session")
+    parser.add_argument("--payload-chars", type=int, default=400, help="Taille du texte par événement")
+    parser.add_argument("--batch-size", type=int, default=32, help="Taille de lot SQLite")
+    parser.add_argument("--recent", type=int, default=20, help="Événements relus (fenêtre)")
+    parser.add_argument("--reads", type=int, default=20, help="Lectures par mesure")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    header = (f"{'service':<18} {'appends/s':>10} {'get full p50':>13} "
+              f"{'get recent p50':>15} {'db Mo':>7}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        db = f"{r['db_mb']:>7.1f}" if "db_mb" in r else f"{'-':>7}"
+        print(f"{r['service']:<18} {r['appends_per_sec']:>10.0f} "
+              f"{r['get_session_full_ms']['p50']:>10.2f} ms "
+              f"{r['get_session_recent_ms']['p50']:>12.2f} ms {db}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
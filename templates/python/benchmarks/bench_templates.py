@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Benchmark de l'overhead d'orchestration des templates Python.
+
+Chaque template est exécuté dans son propre processus (ils partagent tous le
+package ``src``), avec le backend LLM local (``ADK_FAKE_LLM=1``) : les mesures
+reflètent le coût Python d'ADK (Runner, sessions, événements, callbacks) et
+non celui de Gemini.
+
+Mesures par template :
+- turns/sec
+- latence par tour p50 / p95 / p99
+- événements par tour
+- temps CPU Python par événement
+- RSS maximal du processus
+
+Usage :
+    python benchmarks/bench_templates.py --turns 200 --output results/main.json
+    python benchmarks/bench_templates.py --templates simple loop --latency-ms 20
+    python benchmarks/compare.py results/main.json results/feature.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent
+
+# Nom → (répertoire, package, message utilisateur, état initial de session)
+TEMPLATES = {
+    "simple": ("simple-agent", "simple_agent", "What's the weather in Paris?", {}),
+    "sequential": ("sequential-agent", "sequential_agent",
+                   "Write a short paragraph about artificial intelligence", {}),
+    "parallel": ("parallel-agent", "parallel_agent",
+                 "Research sustainable technology trends", {}),
+    "loop": ("loop-agent", "loop_agent", "Generate and refine a story",
+             {"topic": "A robot learning to paint"}),
+    "custom": ("custom-agent", "custom_agent", "Generate a story",
+               {"topic": "A robot learning to paint"}),
+    "rag": ("rag-agent", "rag_agent", "What information is available?", {}),
+}
+
+
+def percentile(values: list, pct: float) -> float:
+    """Percentile par rang le plus proche."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """RSS maximal du processus courant en Mo."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en Ko sur Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+async def run_worker(name: str, turns: int, warmup: int, concurrency: int) -> dict:
+    """Exécuter les tours d'un template dans le processus courant."""
+    import importlib
+
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    _, package, prompt, state = TEMPLATES[name]
+    agent_module = importlib.import_module(f"src.{package}.agent")
+
+    session_service = InMemorySessionService()
+    runner = Runner(
+        agent=agent_module.root_agent,
+        app_name="agents",
+        session_service=session_service
+    )
+
+    async def one_turn(index: int) -> tuple:
+        session_id = f"bench_{index}"
+        await session_service.create_session(
+            app_name="agents",
+            user_id="bench_user",
+            session_id=session_id,
+            state=dict(state)
+        )
+        content = types.Content(role='user', parts=[types.Part(text=prompt)])
+        start = time.perf_counter()
+        events = 0
+        async for _ in runner.run_async(
+            user_id="bench_user",
+            session_id=session_id,
+            new_message=content
+        ):
+            events += 1
+        return time.perf_counter() - start, events
+
+    # Échauffement (imports paresseux, résolution des modèles, caches)
+    for i in range(warmup):
+        await one_turn(-1 - i)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int) -> tuple:
+        async with semaphore:
+            return await one_turn(index)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    results = await asyncio.gather(*(bounded(i) for i in range(turns)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latencies = [latency for latency, _ in results]
+    total_events = sum(events for _, events in results)
+    return {
+        "template": name,
+        "turns": turns,
+        "concurrency": concurrency,
+        "turns_per_sec": turns / wall,
+        "latency_ms": {
+            "p50": statistics.median(latencies) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "mean": statistics.fmean(latencies) * 1000,
+        },
+        "events_per_turn": total_events / turns,
+        "cpu_us_per_event": cpu / total_events * 1e6 if total_events else 0.0,
+        "cpu_ms_per_turn": cpu / turns * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_template(name: str, args) -> dict:
+    """Lancer le benchmark d'un template dans un sous-processus isolé."""
+    directory = TEMPLATES_DIR / TEMPLATES[name][0]
+    env = {
+        **os.environ,
+        "ADK_FAKE_LLM": "1",
+        "ADK_FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "ADK_FAKE_LLM_OUTPUT_TOKENS": str(args.output_tokens),
+        "ADK_FAKE_LLM_CONVERGE_AFTER": str(args.converge_after),
+        # Le template RAG exige un corpus ; il n'est pas interrogé par le fake
+        "RAG_CORPUS": os.getenv(
+            "RAG_CORPUS", "projects/bench/locations/us-central1/ragCorpora/bench"
+        ),
+        "GOOGLE_CLOUD_PROJECT": os.getenv("GOOGLE_CLOUD_PROJECT", "bench"),
+        "PYTHONWARNINGS": "ignore",
+    }
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--worker", name,
+        "--turns", str(args.turns), "--warmup", str(args.warmup),
+        "--concurrency", str(args.concurrency),
+    ]
+    completed = subprocess.run(
+        command, cwd=directory, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {"template": name, "error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=TEMPLATES_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def adk_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("google-adk")
+    except Exception:
+        return "unknown"
+
+
+def print_table(results: list) -> None:
+    header = (f"{'template':<11} {'turns/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'ev/turn':>8} {'cpu µs/ev':>10} {'rss Mo':>8}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['template']:<11} ❌ {' '.join(r['error'])}")
+            continue
+        lat = r["latency_ms"]
+        print(f"{r['template']:<11} {r['turns_per_sec']:>9.1f} {lat['p50']:>8.2f} "
+              f"{lat['p95']:>8.2f} {lat['p99']:>8.2f} {r['events_per_turn']:>8.1f} "
+              f"{r['cpu_us_per_event']:>10.0f} {r['peak_rss_mb']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des templates Python ADK")
+    parser.add_argument("--templates", nargs="+", choices=list(TEMPLATES),
+                        default=list(TEMPLATES))
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Tours exécutés simultanément (sessions distinctes)")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latence simulée par appel modèle")
+    parser.add_argument("--output-tokens", type=int, default=40)
+    parser.add_argument("--converge-after", type=int, default=2,
+                        help="Tours avant que le critique des boucles ne converge")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats")
+    parser.add_argument("--worker", choices=list(TEMPLATES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, os.getcwd())
+        result = asyncio.run(run_worker(args.worker, args.turns, args.warmup, args.concurrency))
+        print(json.dumps(result))
+        return
+
+    results = []
+    for name in args.templates:
+        print(f"⏱️  {name}...", file=sys.stderr)
+        results.append(run_template(name, args))
+
+    print_table(results)
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "google_adk": adk_version(),
+            "settings": {
+                "turns": args.turns,
+                "warmup": args.warmup,
+                "concurrency": args.concurrency,
+                "latency_ms": args.latency_ms,
+                "output_tokens": args.output_tokens,
+                "converge_after": args.converge_after,
+            },
+        },
+        "results": {r["template"]: r for r in results},
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Comparer deux fichiers de résultats de ``bench_templates.py``.
+
+Usage :
+    python benchmarks/compare.py results/base.json results/head.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+# Métrique → (chemin dans le résultat, True si plus haut = mieux)
+METRICS = {
+    "turns/s": (("turns_per_sec",), True),
+    "p50 ms": (("latency_ms", "p50"), False),
+    "p95 ms": (("latency_ms", "p95"), False),
+    "p99 ms": (("latency_ms", "p99"), False),
+    "ev/turn": (("events_per_turn",), False),
+    "cpu µs/ev": (("cpu_us_per_event",), False),
+    "rss Mo": (("peak_rss_mb",), False),
+}
+
+
+def lookup(result: dict, path: tuple) -> float:
+    value = result
+    for key in path:
+        value = value[key]
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparer deux résultats de benchmark")
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=5.0,
+                        help="Variation (%%) à partir de laquelle signaler un écart")
+    args = parser.parse_args()
+
+    base = json.loads(args.base.read_text())
+    head = json.loads(args.head.read_text())
+    print(f"base : {base['meta']['git_revision']} ({base['meta']['timestamp']})")
+    print(f"head : {head['meta']['git_revision']} ({head['meta']['timestamp']})")
+    if base["meta"]["settings"] != head["meta"]["settings"]:
+        print("⚠️  Paramètres différents :", base["meta"]["settings"], head["meta"]["settings"])
+
+    for template, head_result in head["results"].items():
+        base_result = base["results"].get(template)
+        if base_result is None or "error" in base_result or "error" in head_result:
+            print(f"\n{template} : non comparable")
+            continue
+
+        print(f"\n{template}")
+        for label, (path, higher_is_better) in METRICS.items():
+            before, after = lookup(base_result, path), lookup(head_result, path)
+            delta = (after - before) / before * 100 if before else 0.0
+            improved = delta > 0 if higher_is_better else delta < 0
+            flag = ""
+            if abs(delta) >= args.threshold:
+                flag = "✅" if improved else "🔺"
+            print(f"  {label:<10} {before:>10.2f} → {after:>10.2f}  {delta:>+7.1f}% {flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Rapport de temps d'import et de démarrage par template.
+
+Pour chaque template, dans un processus Python neuf :
+
+- ``import src.<pkg>.agent`` seul (doit rester léger : construction différée)
+- accès à ``root_agent`` (imports ADK + construction des agents)
+- temps jusqu'à la première invite de ``run.py`` (``Vous:``)
+
+Le détail ``-X importtime`` est agrégé par package (``google.adk``,
+``google.genai``, ``vertexai``, ``pydantic``...) au lieu d'une ligne par module.
+
+Usage :
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --templates rag --top 12 --output results/imports.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from bench_templates import TEMPLATES, TEMPLATES_DIR
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\s*)(\S+)")
+
+
+def package_group(module: str) -> str:
+    """Regrouper un module par package (2 niveaux pour les namespaces google.*)."""
+    parts = module.split(".")
+    if parts[0] == "google" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def template_env() -> dict:
+    return {
+        **os.environ,
+        "RAG_CORPUS": os.getenv(
+            "RAG_CORPUS", "projects/bench/locations/us-central1/ragCorpora/bench"
+        ),
+        "GOOGLE_CLOUD_PROJECT": os.getenv("GOOGLE_CLOUD_PROJECT", "bench"),
+        "PYTHONWARNINGS": "ignore",
+        "PYTHONUNBUFFERED": "1",
+    }
+
+
+def measure_import(directory: Path, code: str) -> dict:
+    """Exécuter ``code`` avec ``-X importtime`` et agréger le temps par package."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=directory, env=template_env(), capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    groups: Counter = Counter()
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, _, _, module = match.groups()
+            groups[package_group(module)] += int(self_us)
+
+    return {
+        "wall_ms": wall * 1000,
+        "import_ms": sum(groups.values()) / 1000,
+        "by_package_ms": {name: us / 1000 for name, us in groups.most_common()},
+    }
+
+
+def measure_first_prompt(directory: Path, timeout: float = 60.0) -> float:
+    """Temps (ms) entre le lancement de ``run.py`` et l'affichage de l'invite."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "run.py"], cwd=directory, env=template_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b""
+    try:
+        while b"Vous:" not in output:
+            chunk = process.stdout.read1(1024)
+            if not chunk or time.perf_counter() - start > timeout:
+                raise RuntimeError("invite de run.py non affichée")
+            output += chunk
+        elapsed = time.perf_counter() - start
+        process.communicate(b"quit\n", timeout=timeout)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    return elapsed * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport de temps d'import par template")
+    parser.add_argument("--templates", nargs="+", choices=list(TEMPLATES),
+                        default=list(TEMPLATES))
+    parser.add_argument("--top", type=int, default=6, help="Packages affichés par template")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.templates:
+        directory = TEMPLATES_DIR / TEMPLATES[name][0]
+        package = TEMPLATES[name][1]
+        module_only = measure_import(directory, f"import src.{package}.agent")
+        full = measure_import(
+            directory, f"import src.{package}.agent as m; m.root_agent"
+        )
+        first_prompt = measure_first_prompt(directory)
+        report[name] = {
+            "module_import": module_only,
+            "root_agent": full,
+            "run_py_first_prompt_ms": first_prompt,
+        }
+
+        print(f"\n📦 {name}")
+        print(f"   import agent.py       : {module_only['import_ms']:8.1f} ms")
+        print(f"   accès root_agent      : {full['import_ms']:8.1f} ms "
+              f"(processus {full['wall_ms']:.0f} ms)")
+        print(f"   run.py → invite       : {first_prompt:8.1f} ms")
+        for group, ms in list(full["by_package_ms"].items())[:args.top]:
+            print(f"     {group:<28} {ms:8.1f} ms")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
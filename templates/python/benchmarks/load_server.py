@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Générateur de charge pour ``server.py`` (débit soutenu en requêtes/s).
+
+Chaque client virtuel possède une session et envoie ses messages en boucle
+fermée pendant ``--duration`` secondes ; ``--pipeline`` > 1 envoie plusieurs
+messages simultanés dans la même session (ils sont sérialisés par le verrou
+de session du serveur).
+
+Sans ``--url``, le serveur du template est lancé dans un sous-processus avec
+le backend LLM local (``ADK_FAKE_LLM=1``).
+
+Usage :
+    python benchmarks/load_server.py --template simple --users 10 --sessions 5 --duration 20
+    python benchmarks/load_server.py --template parallel --latency-ms 100 --output results/load.json
+    python benchmarks/load_server.py --url http://127.0.0.1:8000 --template loop
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from bench_templates import TEMPLATES, TEMPLATES_DIR, percentile
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name: str, port: int, args) -> subprocess.Popen:
+    """Lancer ``server.py`` du template avec le backend LLM local."""
+    env = {
+        **os.environ,
+        "ADK_FAKE_LLM": "1",
+        "ADK_FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "ADK_FAKE_LLM_CONVERGE_AFTER": str(args.converge_after),
+        "RAG_CORPUS": os.getenv(
+            "RAG_CORPUS", "projects/bench/locations/us-central1/ragCorpora/bench"
+        ),
+        "GOOGLE_CLOUD_PROJECT": os.getenv("GOOGLE_CLOUD_PROJECT", "bench"),
+        "PYTHONWARNINGS": "ignore",
+    }
+    command = [sys.executable, "server.py", "--port", str(port)]
+    if args.db:
+        command += ["--db", str(args.db)]
+    return subprocess.Popen(
+        command, cwd=TEMPLATES_DIR / TEMPLATES[name][0], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("serveur non disponible")
+
+
+async def generate_load(url: str, prompt: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.users * args.sessions * args.pipeline)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        await wait_ready(client)
+
+        latencies, queued = [], []
+        errors = 0
+        deadline = time.perf_counter() + args.duration
+
+        async def client_loop(user: int, session: int) -> None:
+            nonlocal errors
+            path = f"/users/load_{user}/sessions/s{session}/messages"
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(path, json={"message": prompt})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                queued.append(response.json()["queued_ms"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(user, session)
+            for user in range(args.users)
+            for session in range(args.sessions)
+            for _ in range(args.pipeline)
+        ))
+        wall = time.perf_counter() - start
+        health = (await client.get("/health")).json()
+
+    if not latencies:
+        raise RuntimeError(f"aucune requête réussie ({errors} erreurs)")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_sec": len(latencies) / wall,
+        "latency_ms": {
+            "p50": statistics.median(latencies) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+        },
+        "queued_ms_mean": statistics.fmean(queued),
+        "server": health,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de charge pour server.py")
+    parser.add_argument("--template", choices=list(TEMPLATES), default="simple")
+    parser.add_argument("--url", help="Serveur déjà lancé (sinon lancé automatiquement)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--sessions", type=int, default=2, help="Sessions par utilisateur")
+    parser.add_argument("--pipeline", type=int, default=1,
+                        help="Messages simultanés par session")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de la charge (s)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout par requête (s)")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latence simulée par appel modèle (serveur lancé ici)")
+    parser.add_argument("--converge-after", type=int, default=2)
+    parser.add_argument("--db", type=Path, help="Base SQLite des sessions du serveur lancé")
+    parser.add_argument("--output", type=Path, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    prompt = TEMPLATES[args.template][2]
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        process = start_server(args.template, port, args)
+        url = f"http://127.0.0.1:{port}"
+
+    try:
+        result = asyncio.run(generate_load(url, prompt, args))
+    except RuntimeError:
+        if process is not None and process.poll() is not None:
+            print(process.stderr.read().decode(errors="replace"), file=sys.stderr)
+        raise
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    clients = args.users * args.sessions
+    lat = result["latency_ms"]
+    print(f"📈 {args.template} : {clients} sessions × {args.pipeline} message(s) en vol, "
+          f"{args.duration:.0f} s")
+    print(f"   requêtes/s   : {result['requests_per_sec']:.1f} "
+          f"({result['requests']} requêtes, {result['errors']} erreurs)")
+    print(f"   latence      : p50 {lat['p50']:.1f} ms · p95 {lat['p95']:.1f} ms · "
+          f"p99 {lat['p99']:.1f} ms")
+    print(f"   attente verrou session (moyenne) : {result['queued_ms_mean']:.1f} ms")
+
+    if args.output:
+        result["settings"] = {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()}
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
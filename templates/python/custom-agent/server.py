@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Serveur HTTP asynchrone multi-utilisateurs pour l'agent personnalisé.
+
+Un seul ``Runner`` partagé sert toutes les sessions : les tours d'une même
+session sont exécutés dans l'ordre d'arrivée (verrou par session), les
+sessions différentes en parallèle.
+
+Usage :
+    python server.py --port 8000
+    curl -X POST localhost:8000/users/alice/sessions/s1/messages \\
+         -H 'Content-Type: application/json' -d '{"message": "Generate a story"}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+    from google.adk.sessions import BaseSessionService
+
+# Charger le fichier .env
+env_path = Path(__file__).parent / '.env'
+if env_path.exists():
+    load_dotenv(env_path)
+
+APP_NAME = "agents"
+# État initial des nouvelles sessions
+INITIAL_STATE: dict = {"topic": "A robot learning to paint"}
+
+
+class MessageRequest(BaseModel):
+    message: str
+
+
+class MessageResponse(BaseModel):
+    user_id: str
+    session_id: str
+    response: str | None
+    events: int
+    queued_ms: float
+    latency_ms: float
+
+
+class SessionLocks:
+    """Verrous par session, supprimés dès qu'aucun tour ne les attend.
+
+    ``asyncio.Lock`` réveille les tâches dans l'ordre d'attente : les tours
+    d'une session s'exécutent dans l'ordre de réception.
+    """
+
+    def __init__(self):
+        self._locks: dict = {}
+        self._holders: Counter = Counter()
+
+    @asynccontextmanager
+    async def hold(self, key: tuple):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._holders[key] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._holders[key] -= 1
+            if not self._holders[key]:
+                del self._holders[key]
+                del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class AgentServer:
+    """Exécution concurrente des tours sur un ``Runner`` partagé."""
+
+    def __init__(self, runner: Runner, session_service: BaseSessionService):
+        self.runner = runner
+        self.session_service = session_service
+        self.locks = SessionLocks()
+        self.turns = 0
+        self.in_flight = 0
+
+    async def run_turn(self, user_id: str, session_id: str, message: str) -> MessageResponse:
+        """Exécuter un tour, après les tours déjà en attente sur la session."""
+        from google.genai import types
+
+        received = time.perf_counter()
+        async with self.locks.hold((user_id, session_id)):
+            started = time.perf_counter()
+            self.in_flight += 1
+            try:
+                session = await self.session_service.get_session(
+                    app_name=APP_NAME, user_id=user_id, session_id=session_id
+                )
+                if session is None:
+                    await self.session_service.create_session(
+                        app_name=APP_NAME,
+                        user_id=user_id,
+                        session_id=session_id,
+                        state=dict(INITIAL_STATE)
+                    )
+
+                content = types.Content(role='user', parts=[types.Part(text=message)])
+                events = 0
+                responses = []
+                async for event in self.runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=content
+                ):
+                    events += 1
+                    if event.is_final_response() and event.content and event.content.parts:
+                        if event.content.parts[0].text:
+                            responses.append(event.content.parts[0].text)
+            finally:
+                self.in_flight -= 1
+                self.turns += 1
+
+        finished = time.perf_counter()
+        return MessageResponse(
+            user_id=user_id,
+            session_id=session_id,
+            response="\n".join(responses) if responses else None,
+            events=events,
+            queued_ms=(started - received) * 1000,
+            latency_ms=(finished - received) * 1000,
+        )
+
+
+def default_session_service() -> BaseSessionService:
+    """Sessions SQLite si ``SESSION_DB`` est défini, en mémoire sinon."""
+    db_path = os.getenv("SESSION_DB")
+    if db_path:
+        from src.custom_agent.sqlite_session_service import SqliteSessionService
+        return SqliteSessionService(db_path)
+    from google.adk.sessions import InMemorySessionService
+    return InMemorySessionService()
+
+
+def create_app(session_service: BaseSessionService | None = None) -> FastAPI:
+    """Créer l'application ASGI ; l'agent est construit au démarrage du serveur."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        from google.adk.runners import Runner
+        from src.custom_agent.agent import build_root_agent
+
+        service = session_service or default_session_service()
+        runner = Runner(agent=build_root_agent(), app_name=APP_NAME, session_service=service)
+        app.state.agent_server = AgentServer(runner, service)
+        yield
+        # Sessions SQLite : écrire les événements encore en tampon
+        if hasattr(service, "close"):
+            await service.close()
+
+    app = FastAPI(title="Custom Agent", lifespan=lifespan)
+
+    @app.post("/users/{user_id}/sessions/{session_id}/messages", response_model=MessageResponse)
+    async def post_message(user_id: str, session_id: str, request: MessageRequest):
+        return await app.state.agent_server.run_turn(user_id, session_id, request.message)
+
+    @app.get("/health")
+    async def health():
+        server = app.state.agent_server
+        return {
+            "status": "ok",
+            "turns": server.turns,
+            "in_flight": server.in_flight,
+            "active_sessions": len(server.locks),
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--db",
+        default=os.getenv("SESSION_DB"),
+        help="Base SQLite des sessions (défaut : $SESSION_DB, sinon en mémoire)"
+    )
+    args = parser.parse_args()
+    if args.db:
+        os.environ["SESSION_DB"] = args.db
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
@@ -1,93 +1,57 @@
-"""Agent personnalisé avec logique d'orchestration avancée."""
+"""Agent personnalisé avec logique d'orchestration avancée.
 
-from google.adk.agents import BaseAgent, LlmAgent, LoopAgent, SequentialAgent
-from google.adk.agents.invocation_context import InvocationContext
-from google.adk.events import Event
-from typing import AsyncGenerator
-from typing_extensions import override
-from .sub_agents import story_generator, critic, reviser, grammar_check, tone_check
+``root_agent`` est construit au premier accès (PEP 562) : importer ce module
+ne charge pas ADK et ne crée pas les sous-agents. La classe de l'agent est
+définie dans ``story_flow.py``.
+"""
 
+import threading
 
-class StoryFlowAgent(BaseAgent):
-    """
-    Agent personnalisé pour génération d'histoires avec logique conditionnelle.
-    
-    Workflow:
-    1. Génération initiale
-    2. Boucle critique/refinement
-    3. Vérification grammaire et ton
-    4. Régénération conditionnelle si ton négatif
-    """
-    
-    def __init__(
-        self,
-        name: str,
-        story_generator: LlmAgent,
-        critic: LlmAgent,
-        reviser: LlmAgent,
-        grammar_check: LlmAgent,
-        tone_check: LlmAgent,
-    ):
-        # Créer la boucle critique/revision
-        loop_agent = LoopAgent(
-            name="CriticReviserLoop",
-            sub_agents=[critic, reviser],
-            max_iterations=2
-        )
-        
-        # Créer le séquentiel post-traitement
-        sequential_agent = SequentialAgent(
-            name="PostProcessing",
-            sub_agents=[grammar_check, tone_check]
-        )
-        
-        super().__init__(
-            name=name,
-            description="Agent personnalisé pour génération d'histoires avec workflow conditionnel",
-            sub_agents=[story_generator, loop_agent, sequential_agent]
-        )
-        
-        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
-        object.__setattr__(self, '_story_generator', story_generator)
-        object.__setattr__(self, '_loop_agent', loop_agent)
-        object.__setattr__(self, '_sequential_agent', sequential_agent)
+_lock = threading.Lock()
+_root_agent = None
 
-    @override
-    async def _run_async_impl(
-        self, ctx: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
-        """Logique d'orchestration personnalisée."""
-        
-        # Étape 1 : Génération initiale
-        async for event in self._story_generator.run_async(ctx):
-            yield event
-        
-        if "current_story" not in ctx.session.state:
-            return
-        
-        # Étape 2 : Boucle critique/revision
-        async for event in self._loop_agent.run_async(ctx):
-            yield event
-        
-        # Étape 3 : Vérification grammaire et ton
-        async for event in self._sequential_agent.run_async(ctx):
-            yield event
-        
-        # Étape 4 : Régénération conditionnelle si ton négatif
-        tone_result = ctx.session.state.get("tone_check_result")
-        
-        if tone_result == "negative":
-            # Régénérer l'histoire si le ton est négatif
-            async for event in self._story_generator.run_async(ctx):
-                yield event
 
+def build_root_agent():
+    """Construire l'agent personnalisé une seule fois (imports ADK différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            from .budget import LoopBudget
+            from .checkpoint import CheckpointStore, install_checkpoint_resume
+            from .compaction import install_history_compaction
+            from .model_cache import install_model_cache
+            from .patching import PatchRefiner
+            from .story_flow import StoryFlowAgent
+            from .sub_agents import story_generator, critic, reviser, grammar_check, tone_check
 
-# Créer l'instance de l'agent personnalisé
-root_agent = StoryFlowAgent(
-    name="StoryFlowAgent",
-    story_generator=story_generator,
-    critic=critic,
-    reviser=reviser,
-    grammar_check=grammar_check,
-    tone_check=tone_check
-)
+            # Créer l'instance de l'agent personnalisé
+            _root_agent = StoryFlowAgent(
+                name="StoryFlowAgent",
+                story_generator=story_generator,
+                critic=critic,
+                # Réviseur par correctifs, régénération en secours (désactivé sans REFINER_PATCH)
+                reviser=PatchRefiner.from_env(reviser) or reviser,
+                grammar_check=grammar_check,
+                tone_check=tone_check,
+                # Points de reprise après chaque tour (désactivés sans LOOP_CHECKPOINT_DB)
+                checkpoint_store=CheckpointStore.from_env(),
+                # Budget de temps et de tokens (désactivé sans LOOP_BUDGET_S / LOOP_BUDGET_TOKENS)
+                budget=LoopBudget.from_env()
+            )
+
+            # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+            install_history_compaction(_root_agent)
+            # Cache des appels modèle (désactivé sans MODEL_CACHE)
+            install_model_cache(_root_agent)
+            # Reprise sans regénérer l'histoire (sans effet sans LOOP_CHECKPOINT_DB)
+            install_checkpoint_resume(story_generator, _root_agent.sub_agents[1])
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    if name == "StoryFlowAgent":
+        from .story_flow import StoryFlowAgent
+        return StoryFlowAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,250 @@
+"""Points de reprise de la boucle critique/révision.
+
+Si le processus s'arrête pendant ``CriticReviserLoop``, la session relancée
+repart de ``StoryGenerator`` et repaie tous les appels modèle.
+``ResumableLoopAgent`` remplace ``LoopAgent`` et enregistre après chaque tour
+terminé un point de reprise dans une base SQLite :
+
+- clé : (application, utilisateur, session, nom de la boucle)
+- contenu : ``current_story``, ``criticism`` et nombre de tours terminés
+- à la fin normale de la boucle (``escalate`` ou ``max_iterations``), le point
+  est marqué terminé : le tour suivant de la session repart de zéro
+
+Relancer une session interrompue restaure l'histoire et la critique puis
+reprend au tour suivant le dernier tour terminé. ``install_checkpoint_resume``
+évite aussi l'appel du générateur initial : il reçoit l'histoire enregistrée.
+
+Configuration par variables d'environnement (désactivé sans
+``LOOP_CHECKPOINT_DB``) : ``LOOP_CHECKPOINT_DB`` (chemin du fichier SQLite).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.agents.invocation_context import InvocationContext
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "loop_checkpoint"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS loop_checkpoints (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    loop_name TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    document TEXT,
+    criticism TEXT,
+    finished INTEGER NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, loop_name)
+);
+"""
+
+
+@dataclass
+class Checkpoint:
+    """Dernier tour terminé d'une boucle."""
+
+    iteration: int
+    document: Optional[str]
+    criticism: Optional[str]
+    finished: bool = False
+
+
+class CheckpointStore:
+    """Points de reprise persistés dans un fichier SQLite.
+
+    Écriture synchrone d'une ligne par tour (mode WAL) : négligeable devant
+    les appels modèle du tour, et déjà sur disque si le processus s'arrête.
+
+    Args:
+        db_path: Chemin du fichier SQLite (``":memory:"`` pour les tests)
+    """
+
+    def __init__(self, db_path: str = "checkpoints.db"):
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["CheckpointStore"]:
+        """Base configurée par l'environnement, None si désactivée."""
+        db_path = os.getenv("LOOP_CHECKPOINT_DB", "")
+        return cls(db_path) if db_path else None
+
+    def load(self, session, loop_name: str) -> Optional[Checkpoint]:
+        """Point de reprise de la boucle pour cette session (None si absent)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT iteration, document, criticism, finished FROM loop_checkpoints "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ? AND loop_name = ?",
+                (session.app_name, session.user_id, session.id, loop_name),
+            ).fetchone()
+        if row is None:
+            return None
+        return Checkpoint(row[0], row[1], row[2], bool(row[3]))
+
+    def save(self, session, loop_name: str, checkpoint: Checkpoint) -> None:
+        """Enregistrer (ou remplacer) le point de reprise de la boucle."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO loop_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session.app_name, session.user_id, session.id, loop_name,
+                 checkpoint.iteration, checkpoint.document, checkpoint.criticism,
+                 int(checkpoint.finished), time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResumableLoopAgent(BaseAgent):
+    """Boucle ``LoopAgent`` qui enregistre un point de reprise après chaque tour.
+
+    Args:
+        name: Nom de l'agent
+        sub_agents: Agents exécutés à chaque tour, dans l'ordre
+        max_iterations: Nombre maximal de tours (reprise comprise)
+        store: Base des points de reprise
+        description: Description de l'agent
+        document_key: Clé d'état du document
+        criticism_key: Clé d'état de la critique
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sub_agents: list,
+        max_iterations: int,
+        store: CheckpointStore,
+        description: str = "",
+        document_key: str = "current_story",
+        criticism_key: str = "criticism",
+    ):
+        super().__init__(name=name, description=description, sub_agents=sub_agents)
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_max_iterations', max_iterations)
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_document_key', document_key)
+        object.__setattr__(self, '_criticism_key', criticism_key)
+
+    @property
+    def max_iterations(self) -> int:
+        return self._max_iterations
+
+    @property
+    def store(self) -> CheckpointStore:
+        return self._store
+
+    def pending(self, session) -> Optional[Checkpoint]:
+        """Point de reprise d'un tour interrompu pour cette session (None sinon)."""
+        checkpoint = self._store.load(session, self.name)
+        if checkpoint is None or checkpoint.finished:
+            return None
+        return checkpoint
+
+    def _snapshot(self, ctx: InvocationContext, iteration: int, finished: bool) -> Checkpoint:
+        state = ctx.session.state
+        return Checkpoint(iteration, state.get(self._document_key),
+                          state.get(self._criticism_key), finished)
+
+    def before_writer(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Callback ``before_model`` du rédacteur : document enregistré si reprise."""
+        checkpoint = self.pending(callback_context.session)
+        if checkpoint is None or not checkpoint.document:
+            return None
+        logger.info("Reprise : rédaction initiale remplacée par le point de reprise")
+        return LlmResponse(content=types.Content(
+            role="model", parts=[types.Part(text=checkpoint.document)]
+        ))
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        iteration = 0
+        checkpoint = self.pending(ctx.session)
+        if checkpoint is not None:
+            iteration = checkpoint.iteration
+            logger.info("Reprise de %s après le tour %d", self.name, iteration)
+            restored = {key: value for key, value in (
+                (self._document_key, checkpoint.document),
+                (self._criticism_key, checkpoint.criticism),
+            ) if value is not None}
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={
+                    **restored,
+                    CHECKPOINT_KEY: {"resumed_from": iteration},
+                }),
+            )
+
+        should_exit = False
+        while iteration < self._max_iterations and not should_exit:
+            for sub_agent in self.sub_agents:
+                async for event in sub_agent.run_async(ctx):
+                    yield event
+                    if event.actions.escalate:
+                        should_exit = True
+                if should_exit:
+                    break
+            iteration += 1
+            finished = should_exit or iteration >= self._max_iterations
+            # Le Runner a déjà appliqué les événements du tour à la session
+            self._store.save(ctx.session, self.name, self._snapshot(ctx, iteration, finished))
+
+
+def install_checkpoint_resume(writer, loop) -> None:
+    """Servir le rédacteur initial depuis le point de reprise de ``loop``.
+
+    Sans effet si ``loop`` n'est pas une ``ResumableLoopAgent``.
+    """
+    if not isinstance(loop, ResumableLoopAgent):
+        return
+    callbacks = writer.before_model_callback
+    if callbacks is None:
+        callbacks = []
+    elif not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    # En premier : en reprise, ni le cache ni le modèle ne sont sollicités
+    writer.before_model_callback = [loop.before_writer, *callbacks]
+
+
+def checkpoint_report(events: list) -> Optional[str]:
+    """Résumé lisible de la reprise d'un tour, s'il y en a eu une."""
+    for event in events:
+        delta = event.actions.state_delta if event.actions else None
+        if delta and CHECKPOINT_KEY in delta:
+            return (f"♻️  Reprise après le tour {delta[CHECKPOINT_KEY]['resumed_from']} "
+                    f"(génération initiale et tours terminés non rejoués)")
+    return None
@@ -0,0 +1,290 @@
+"""Backend LLM local et déterministe (sans réseau ni clé d'API).
+
+Activé par la variable d'environnement ``ADK_FAKE_LLM=1`` : ``FakeGemini`` est
+alors enregistré dans le registre de modèles ADK pour les noms ``gemini-*``,
+si bien que les agents existants (``model="gemini-2.5-flash"``, etc.) l'utilisent
+sans modification.
+
+Réponses, par ordre de priorité :
+
+1. Règles scriptées (fichier JSON ``ADK_FAKE_LLM_SCRIPT``)
+2. Après un appel d'outil : texte résumant la réponse de l'outil
+3. ``exit_loop`` si la critique injectée est la phrase de complétion attendue
+4. Phrase de complétion (« respond exactly: "..." ») une fois la boucle
+   convergée (``ADK_FAKE_LLM_CONVERGE_AFTER`` tours précédents)
+5. Appel d'outil quand le message utilisateur cite un outil disponible
+   (ex. « weather » → ``get_weather`` avec la ville extraite)
+6. Sinon : texte pseudo-aléatoire déterministe
+
+Latence et nombre de tokens sont configurables :
+
+- ``ADK_FAKE_LLM_LATENCY_MS`` : latence fixe par appel (défaut 0)
+- ``ADK_FAKE_LLM_TOKEN_LATENCY_MS`` : latence par token généré (défaut 0)
+- ``ADK_FAKE_LLM_OUTPUT_TOKENS`` : longueur des textes générés (défaut 40)
+
+Format du script JSON (liste de règles, la première qui matche gagne) ::
+
+    [
+      {"match": "weather in Paris", "function_call": {"name": "get_weather",
+                                                       "args": {"city": "Paris"}}},
+      {"match": "(?s)critic", "text": "No major issues found."}
+    ]
+
+``match`` est une regex appliquée à l'instruction système suivie du dernier
+message utilisateur.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from typing import AsyncGenerator, Optional
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+from pydantic import Field
+
+
+# Appels par nom de modèle (utilisé par les tests et benchmarks)
+CALL_COUNTS: Counter = Counter()
+
+_WORDS = (
+    "agent model session state event pipeline result draft report data "
+    "energy story weather review signal system context update insight "
+    "trend value quality summary detail analysis research outcome"
+).split()
+
+_ENTITY_RE = re.compile(
+    r"(?:\bin|\bfor|\bat|\band|\bvs\.?|\bà|,)\s+"
+    r"([A-Z][\w'-]*(?:\s[A-Z][\w'-]*)*)"
+)
+_EXACT_PHRASE_RE = re.compile(r'exactly:?\s*"([^"]+)"')
+_COMPLETION_RE = re.compile(r'respond exactly:?\s*"([^"]+)"', re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens (~4 caractères par token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _content_text(content: types.Content) -> str:
+    return "".join(part.text or "" for part in content.parts or [])
+
+
+def _system_instruction(llm_request: LlmRequest) -> str:
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if instruction is None:
+        return ""
+    if isinstance(instruction, str):
+        return instruction
+    if isinstance(instruction, types.Content):
+        return _content_text(instruction)
+    return str(instruction)
+
+
+def _function_declarations(llm_request: LlmRequest) -> dict:
+    declarations = {}
+    for tool in (llm_request.config.tools or []) if llm_request.config else []:
+        for declaration in getattr(tool, "function_declarations", None) or []:
+            declarations[declaration.name] = declaration
+    return declarations
+
+
+def _parameter_types(declaration: types.FunctionDeclaration) -> dict:
+    """Nom → type ("string", "array", ...) des paramètres d'une déclaration."""
+    if declaration.parameters is not None and declaration.parameters.properties:
+        return {
+            name: str(schema.type.value if schema.type else "string").lower()
+            for name, schema in declaration.parameters.properties.items()
+        }
+    schema = declaration.parameters_json_schema or {}
+    return {
+        name: str(prop.get("type", "string")).lower()
+        for name, prop in schema.get("properties", {}).items()
+    }
+
+
+def _env_float(name: str, default: str = "0"):
+    return lambda: float(os.getenv(name, default))
+
+
+def _env_int(name: str, default: str = "0"):
+    return lambda: int(os.getenv(name, default))
+
+
+def _load_script() -> list:
+    script_path = os.getenv("ADK_FAKE_LLM_SCRIPT")
+    if not script_path:
+        return []
+    with open(script_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakeGemini(BaseLlm):
+    """Modèle local à réponses scriptées ou déterministes.
+
+    Les paramètres non fournis sont lus dans l'environnement à la création,
+    ce qui permet au registre ADK de l'instancier avec ``FakeGemini(model=...)``.
+    """
+
+    latency_ms: float = Field(default_factory=_env_float("ADK_FAKE_LLM_LATENCY_MS"))
+    token_latency_ms: float = Field(default_factory=_env_float("ADK_FAKE_LLM_TOKEN_LATENCY_MS"))
+    output_tokens: int = Field(default_factory=_env_int("ADK_FAKE_LLM_OUTPUT_TOKENS", "40"))
+    converge_after: int = Field(default_factory=_env_int("ADK_FAKE_LLM_CONVERGE_AFTER"))
+    rules: list = Field(default_factory=_load_script)
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"gemini-.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        CALL_COUNTS[self.model] += 1
+        instruction = _system_instruction(llm_request)
+        contents = llm_request.contents or []
+        part = self._respond(instruction, contents, llm_request)
+
+        prompt_text = instruction + "".join(_content_text(c) for c in contents)
+        if part is None:
+            output_text = ""
+        else:
+            output_text = part.text or json.dumps(part.function_call.args or {})
+        output_tokens = estimate_tokens(output_text)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=estimate_tokens(prompt_text),
+            candidates_token_count=output_tokens,
+            total_token_count=estimate_tokens(prompt_text) + output_tokens,
+        )
+
+        await asyncio.sleep(self.latency_ms / 1000)
+
+        if stream and part is not None and part.text:
+            words = part.text.split(" ")
+            for i, word in enumerate(words):
+                await asyncio.sleep(self.token_latency_ms / 1000)
+                chunk = word if i == 0 else " " + word
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        else:
+            await asyncio.sleep(self.token_latency_ms * output_tokens / 1000)
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part] if part else []),
+            usage_metadata=usage,
+            model_version=self.model,
+            finish_reason=types.FinishReason.STOP,
+            partial=False if stream else None,
+            turn_complete=True,
+        )
+
+    def _respond(
+        self, instruction: str, contents: list, llm_request: LlmRequest
+    ) -> Optional[types.Part]:
+        user_text = self._last_user_text(contents)
+        declarations = _function_declarations(llm_request)
+
+        # 1. Règles scriptées
+        haystack = f"{instruction}\n{user_text}"
+        for rule in self.rules:
+            if re.search(rule["match"], haystack):
+                if "function_call" in rule:
+                    call = rule["function_call"]
+                    return types.Part(function_call=types.FunctionCall(
+                        name=call["name"], args=call.get("args", {})
+                    ))
+                return types.Part(text=rule["text"])
+
+        # 2. Réponse d'outil reçue : la résumer
+        last_parts = contents[-1].parts or [] if contents else []
+        responses = [p.function_response for p in last_parts if p.function_response]
+        if responses:
+            # Outil de contrôle sans résultat (ex. exit_loop) : aucun texte, pour
+            # ne pas écraser l'output_key de l'agent
+            if not any(r.response for r in responses):
+                return None
+            summary = "; ".join(
+                f"{r.name}: {json.dumps(r.response, ensure_ascii=False)}" for r in responses
+            )
+            return types.Part(text=f"Here is what I found. {summary}")
+
+        # 3. Sortie de boucle quand la critique est la phrase de complétion
+        phrases = _EXACT_PHRASE_RE.findall(instruction)
+        if "exit_loop" in declarations:
+            if any(instruction.count(p) >= 2 for p in phrases):
+                return types.Part(function_call=types.FunctionCall(name="exit_loop", args={}))
+
+        # 4. Critique : phrase de complétion une fois la boucle convergée
+        completions = _COMPLETION_RE.findall(instruction)
+        if completions and self._prior_turns(contents) >= self.converge_after:
+            return types.Part(text=completions[0])
+
+        # 5. Appel d'outil demandé par l'utilisateur
+        call = self._match_tool(user_text, declarations)
+        if call is not None:
+            return types.Part(function_call=call)
+
+        # 6. Texte déterministe
+        return types.Part(text=self._generate_text(haystack))
+
+    @staticmethod
+    def _last_user_text(contents: list) -> str:
+        for content in reversed(contents):
+            if content.role == "user":
+                text = _content_text(content)
+                if text:
+                    return text
+        return ""
+
+    @staticmethod
+    def _prior_turns(contents: list) -> int:
+        """Nombre de réponses d'agents déjà présentes dans l'historique."""
+        return sum(
+            1 for c in contents
+            if c.role == "model" or _content_text(c).startswith("For context:")
+        )
+
+    @staticmethod
+    def _match_tool(user_text: str, declarations: dict) -> Optional[types.FunctionCall]:
+        text = user_text.lower()
+        entities = _ENTITY_RE.findall(user_text)
+        candidates = []
+        for name, declaration in declarations.items():
+            keywords = [w for w in name.lower().split("_") if w not in ("get", "batch", "tool")]
+            if keywords and all(k in text for k in keywords):
+                candidates.append((name, _parameter_types(declaration)))
+        if not candidates or not entities:
+            return None
+
+        # Plusieurs entités : préférer un outil qui accepte une liste
+        def score(candidate):
+            has_array = "array" in candidate[1].values()
+            return has_array == (len(entities) > 1)
+
+        name, params = max(candidates, key=score)
+        args = {}
+        for param, param_type in params.items():
+            if param_type == "array":
+                args[param] = entities
+            elif param_type == "string" and param not in ("units",):
+                args[param] = entities[0]
+        return types.FunctionCall(name=name, args=args)
+
+    def _generate_text(self, seed_text: str) -> str:
+        seed = hashlib.sha256(f"{self.model}\n{seed_text}".encode()).digest()
+        words = [
+            _WORDS[seed[i % len(seed)] * (i + 1) % len(_WORDS)]
+            for i in range(self.output_tokens)
+        ]
+        words[0] = words[0].capitalize()
+        return " ".join(words) + "."
+
+
+def install_fake_llm() -> None:
+    """Enregistrer ``FakeGemini`` pour tous les modèles ``gemini-*``."""
+    LLMRegistry.register(FakeGemini)
@@ -0,0 +1,329 @@
+"""Cache des appels modèle des ``LlmAgent`` (opt-in).
+
+Les sous-agents déterministes (vérifications, relectures...) reçoivent souvent
+exactement la même requête : instruction résolue, historique, message
+utilisateur. ``ModelCallCache`` s'installe en ``before_model_callback`` /
+``after_model_callback`` :
+
+- clé : hash SHA-256 d'une forme canonique de la requête (modèle, instruction
+  système, contenus, outils, paramètres de génération) ; en mode normalisé,
+  les espaces des textes sont compactés et l'Unicode normalisé (NFC)
+- succès : la réponse enregistrée est renvoyée par ``before_model_callback``,
+  ADK n'appelle pas le modèle (aucun appel réseau)
+- backends : mémoire (LRU) ou disque (un fichier par entrée), tous deux
+  bornés en taille avec éviction des entrées les moins récemment utilisées
+- compteurs hits / misses par nom d'agent
+- les réponses marquées ``custom_metadata["no_cache"]`` (ex. marqueur
+  ``[MISSING]`` d'une branche hors délai) ne sont jamais enregistrées
+
+Configuration par variables d'environnement (désactivé sans ``MODEL_CACHE``) :
+``MODEL_CACHE`` (``memory`` ou ``disk``), ``MODEL_CACHE_DIR``,
+``MODEL_CACHE_MAX_MB``, ``MODEL_CACHE_AGENTS`` (noms séparés par des virgules,
+tous les agents par défaut).
+"""
+
+import hashlib
+import json
+import os
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+# Clé de ``LlmResponse.custom_metadata`` : réponse à ne pas mettre en cache
+NO_CACHE = "no_cache"
+
+# Paramètres de génération qui influencent la réponse
+_CONFIG_FIELDS = (
+    "temperature", "top_p", "top_k", "max_output_tokens", "stop_sequences",
+    "response_mime_type", "response_schema", "seed", "candidate_count",
+)
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _normalize(value, normalize: bool):
+    """Forme canonique JSON : clés triées, textes normalisés si demandé."""
+    if isinstance(value, dict):
+        return {k: _normalize(v, normalize) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, normalize) for v in value]
+    if isinstance(value, str) and normalize:
+        return _normalize_text(value)
+    return value
+
+
+def request_key(llm_request: LlmRequest, normalize: bool = True) -> str:
+    """Hash canonique d'une requête modèle."""
+    config = llm_request.config
+    tools = []
+    generation = {}
+    system_instruction = None
+    if config is not None:
+        system_instruction = config.system_instruction
+        if not isinstance(system_instruction, (str, type(None))):
+            system_instruction = system_instruction.model_dump(mode="json", exclude_none=True)
+        for tool in config.tools or []:
+            tools.append(tool.model_dump(mode="json", exclude_none=True))
+        dumped = config.model_dump(mode="json", exclude_none=True)
+        generation = {field: dumped[field] for field in _CONFIG_FIELDS if field in dumped}
+
+    canonical = _normalize({
+        "model": llm_request.model,
+        "system_instruction": system_instruction,
+        "contents": [
+            content.model_dump(mode="json", exclude_none=True)
+            for content in llm_request.contents or []
+        ],
+        "tools": tools,
+        "generation": generation,
+    }, normalize)
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Stockage clé → réponse sérialisée (JSON)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Réponse enregistrée pour ``key``, None si absente."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Enregistrer une réponse, en évinçant si la taille maximale est dépassée."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Vider le cache."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Cache en mémoire, LRU borné en octets."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """Cache sur disque : un fichier JSON par entrée, LRU par date d'accès.
+
+    Partagé entre processus et conservé entre deux lancements.
+    """
+
+    def __init__(self, directory: str = ".model_cache", max_bytes: int = 256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.size = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            value = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # Date d'accès pour l'éviction LRU
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        data = value.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        if path.exists():
+            self.size -= path.stat().st_size
+        # Écriture atomique : un lecteur concurrent ne voit jamais un fichier partiel
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (path.stat().st_mtime, path) for path in self.directory.glob("*.json")
+        )
+        self.size = sum(path.stat().st_size for _, path in entries)
+        for _, path in entries:
+            if self.size <= self.max_bytes:
+                break
+            self.size -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self.size = 0
+
+
+@dataclass
+class AgentCacheStats:
+    """Compteurs du cache pour un agent."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ModelCallCache:
+    """Callbacks modèle servant les requêtes identiques depuis un cache.
+
+    Args:
+        backend: Stockage des réponses (mémoire par défaut)
+        agents: Noms des agents mis en cache (None = tous)
+        normalize: Normaliser les espaces / l'Unicode des textes dans la clé
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        agents: Optional[set] = None,
+        normalize: bool = True,
+    ):
+        self.backend = backend or MemoryCacheBackend()
+        self.agents = set(agents) if agents else None
+        self.normalize = normalize
+        self.stats: defaultdict = defaultdict(AgentCacheStats)
+        # (invocation, agent) → clé de la requête en cours, pour after_model
+        self._pending: dict = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["ModelCallCache"]:
+        """Cache configuré par l'environnement, None si désactivé."""
+        kind = os.getenv("MODEL_CACHE", "").lower()
+        if kind not in ("memory", "disk"):
+            return None
+        max_bytes = int(float(os.getenv("MODEL_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        if kind == "disk":
+            backend = DiskCacheBackend(os.getenv("MODEL_CACHE_DIR", ".model_cache"), max_bytes)
+        else:
+            backend = MemoryCacheBackend(max_bytes)
+        names = {n.strip() for n in os.getenv("MODEL_CACHE_AGENTS", "").split(",") if n.strip()}
+        return cls(backend, agents=names or None)
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent = callback_context.agent_name
+        if self.agents is not None and agent not in self.agents:
+            return None
+
+        key = request_key(llm_request, self.normalize)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.stats[agent].hits += 1
+            return LlmResponse.model_validate_json(cached)
+
+        self.stats[agent].misses += 1
+        self._pending[(callback_context.invocation_id, agent)] = key
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        key = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if key is None or llm_response.error_code or not llm_response.content:
+            return None
+        if (llm_response.custom_metadata or {}).get(NO_CACHE):
+            return None
+        self.backend.set(
+            key, llm_response.model_dump_json(exclude_none=True, exclude={"usage_metadata"})
+        )
+        return None
+
+    def report(self) -> dict:
+        """Compteurs par agent : ``{agent: {"hits", "misses", "hit_rate"}}``."""
+        return {
+            agent: {"hits": s.hits, "misses": s.misses, "hit_rate": s.hit_rate}
+            for agent, s in sorted(self.stats.items())
+        }
+
+
+_installed: Optional[ModelCallCache] = None
+
+
+def get_model_cache() -> Optional[ModelCallCache]:
+    """Dernier cache installé par ``install_model_cache`` (None si aucun)."""
+    return _installed
+
+
+def _append_callback(agent, attribute: str, callback) -> None:
+    callbacks = getattr(agent, attribute)
+    if callbacks is None:
+        callbacks = []
+    elif not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    if callback not in callbacks:
+        setattr(agent, attribute, [*callbacks, callback])
+
+
+def install_model_cache(agent, cache: Optional[ModelCallCache] = None):
+    """Ajouter le cache aux callbacks modèle de l'arbre d'agents.
+
+    Sans ``cache``, utilise ``ModelCallCache.from_env()`` (rien n'est installé
+    si le cache est désactivé). Renvoie le cache installé.
+    """
+    global _installed
+    cache = cache or ModelCallCache.from_env()
+    if cache is None:
+        return None
+
+    def visit(node) -> None:
+        if hasattr(node, "before_model_callback"):
+            # En dernier : la clé porte sur la requête finale (après compaction)
+            _append_callback(node, "before_model_callback", cache.before_model)
+            _append_callback(node, "after_model_callback", cache.after_model)
+        for child in node.sub_agents:
+            visit(child)
+
+    visit(agent)
+    _installed = cache
+    return cache
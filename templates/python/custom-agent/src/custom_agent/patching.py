@@ -0,0 +1,296 @@
+"""Réviseur en mode correctif : modifications par phrase au lieu du texte complet.
+
+``Reviser`` réécrit toute ``current_story`` à chaque tour de
+``CriticReviserLoop``, même quand la critique ne demande qu'une phrase. Les
+tokens de sortie dominent la latence. ``PatchRefiner`` remplace le réviseur
+dans la boucle :
+
+1. ``ReviserPatch`` reçoit l'histoire en phrases numérotées et répond par un
+   correctif JSON ::
+
+       {"operations": [
+         {"op": "replace", "sentence": 2, "text": "New sentence."},
+         {"op": "insert_after", "sentence": 3, "text": "Added sentence."},
+         {"op": "delete", "sentence": 4}
+       ]}
+
+2. le correctif est validé (JSON, opérations connues, numéros existants, une
+   seule opération remplaçante par phrase, histoire non vide) puis appliqué
+   localement ; l'histoire complète est écrite dans l'état et émise comme
+   réponse
+3. correctif invalide : le réviseur d'origine régénère l'histoire complète
+
+Correctifs appliqués et régénérations sont comptés dans l'état
+(``refiner_patch``).
+
+Configuration par variable d'environnement (désactivé sans
+``REFINER_PATCH``) : ``REFINER_PATCH=1``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+    from google.adk.agents.readonly_context import ReadonlyContext
+
+logger = logging.getLogger(__name__)
+
+PATCH_KEY = "refiner_patch"
+OPERATIONS = ("replace", "insert_after", "delete")
+# Fin de phrase : espaces après ``.``, ``!`` ou ``?``, ou tout saut de ligne
+_SEPARATOR_RE = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+_PATCH_TEMPLATE = """You are a creative writer refining a document with minimal edits.
+
+Current document, one numbered sentence per line:
+{numbered}
+
+Critique:
+{criticism}
+
+Your task:
+{exit_rule}Apply the critique by changing as few sentences as possible.
+Output ONLY a JSON object (no code fences, no explanations) in this format:
+{{"operations": [
+  {{"op": "replace", "sentence": 2, "text": "New sentence."}},
+  {{"op": "insert_after", "sentence": 3, "text": "Added sentence."}},
+  {{"op": "delete", "sentence": 4}}
+]}}
+Sentence numbers refer to the numbered document above; "insert_after" with
+sentence 0 adds a sentence at the beginning."""
+
+_EXIT_RULE = """IF the critique is exactly "{phrase}":
+   call the 'exit_loop' function and do not output any text.
+OTHERWISE: """
+
+
+class PatchError(ValueError):
+    """Correctif illisible ou inapplicable au document."""
+
+
+def _split(text: str) -> list:
+    """``(phrase, séparateur)`` du document ; le séparateur suit la phrase."""
+    text = text.strip()
+    pieces = []
+    start = 0
+    for match in _SEPARATOR_RE.finditer(text):
+        pieces.append((text[start:match.start()], match.group()))
+        start = match.end()
+    pieces.append((text[start:], ""))
+    return [(sentence, separator) for sentence, separator in pieces if sentence]
+
+
+def split_sentences(text: str) -> list:
+    """Phrases du document (découpage après ``.``, ``!`` ou ``?`` et aux sauts de ligne)."""
+    return [sentence for sentence, _ in _split(text)]
+
+
+def number_sentences(text: str) -> str:
+    """Document présenté au modèle : ``[n] phrase`` par ligne."""
+    return "\n".join(f"[{i}] {s}" for i, s in enumerate(split_sentences(text), start=1))
+
+
+def parse_patch(text: str) -> list:
+    """Opérations du correctif JSON, validées en forme (pas encore en numéros)."""
+    try:
+        payload = json.loads(_FENCE_RE.sub("", (text or "").strip()))
+    except json.JSONDecodeError as e:
+        raise PatchError(f"JSON invalide : {e}") from e
+    operations = payload.get("operations") if isinstance(payload, dict) else payload
+    if not isinstance(operations, list):
+        raise PatchError("liste 'operations' absente")
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise PatchError(f"opération inconnue : {operation!r}")
+        index = operation.get("sentence")
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise PatchError(f"numéro de phrase invalide : {operation!r}")
+        if operation["op"] != "delete":
+            if not isinstance(operation.get("text"), str) or not operation["text"].strip():
+                raise PatchError(f"texte manquant : {operation!r}")
+    return operations
+
+
+def _stronger(separator: str, other: str) -> str:
+    """Séparateur qui coupe le plus (sauts de ligne) entre les deux."""
+    return other if other.count("\n") > separator.count("\n") else separator
+
+
+def apply_patch(document: str, operations: list) -> str:
+    """Appliquer les opérations (numéros du document d'origine).
+
+    Chaque phrase garde le séparateur qui la suivait (espace, saut de ligne ou
+    de paragraphe) : le correctif ne change pas la mise en page.
+    """
+    pieces = _split(document)
+    sentences = [sentence for sentence, _ in pieces]
+    replaced: dict = {}
+    inserted: dict = {}
+    for operation in operations:
+        index = operation["sentence"]
+        lowest = 0 if operation["op"] == "insert_after" else 1
+        if not lowest <= index <= len(sentences):
+            raise PatchError(f"phrase {index} hors du document ({len(sentences)} phrases)")
+        if operation["op"] == "insert_after":
+            inserted.setdefault(index, []).append(operation["text"].strip())
+            continue
+        if index in replaced:
+            raise PatchError(f"phrase {index} modifiée deux fois")
+        replaced[index] = operation["text"].strip() if operation["op"] == "replace" else None
+
+    # [texte, séparateur qui le suit]
+    result = [[text, " "] for text in inserted.get(0, [])]
+    for index, (sentence, separator) in enumerate(pieces, start=1):
+        sentence = replaced.get(index, sentence)
+        if sentence:
+            result.append([sentence, separator])
+        elif result:
+            # Phrase supprimée : sa fin de paragraphe reste en place
+            result[-1][1] = _stronger(result[-1][1], separator)
+        for text in inserted.get(index, []):
+            # Insertion dans le paragraphe de la phrase, avant son séparateur
+            following = result[-1][1] if result else " "
+            if result:
+                result[-1][1] = " "
+            result.append([text, following])
+    if not result:
+        raise PatchError("document vide après correctif")
+    result[-1][1] = ""
+    return "".join(text + separator for text, separator in result)
+
+
+class PatchRefiner(BaseAgent):
+    """Réviseur par correctifs, avec régénération complète en secours.
+
+    Args:
+        full_refiner: Réviseur d'origine (texte complet), utilisé en secours
+        name: Nom de l'agent
+        document_key: Clé d'état du document (``output_key`` du refiner)
+        criticism_key: Clé d'état de la critique
+        completion_phrase: Critique qui demande ``exit_loop`` (None : pas d'outil)
+    """
+
+    def __init__(
+        self,
+        full_refiner: LlmAgent,
+        name: str = "PatchReviser",
+        document_key: str = "current_story",
+        criticism_key: str = "criticism",
+        completion_phrase: Optional[str] = None,
+    ):
+        patch_agent = LlmAgent(
+            name=f"{full_refiner.name}Patch",
+            model=full_refiner.model,
+            description="Propose un correctif par phrase du document",
+            instruction=self._instruction,
+            tools=list(full_refiner.tools) if completion_phrase else [],
+        )
+
+        super().__init__(
+            name=name,
+            description="Applique un correctif local ou régénère le document",
+            sub_agents=[patch_agent, full_refiner]
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_patch_agent', patch_agent)
+        object.__setattr__(self, '_full_refiner', full_refiner)
+        object.__setattr__(self, '_document_key', document_key)
+        object.__setattr__(self, '_criticism_key', criticism_key)
+        object.__setattr__(self, '_completion_phrase', completion_phrase)
+
+    @classmethod
+    def from_env(cls, full_refiner: LlmAgent, **kwargs) -> Optional["PatchRefiner"]:
+        """Réviseur par correctifs si ``REFINER_PATCH`` est activé, sinon None."""
+        if os.getenv("REFINER_PATCH", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(full_refiner, **kwargs)
+
+    @property
+    def patch_agent(self) -> LlmAgent:
+        return self._patch_agent
+
+    def _instruction(self, context: ReadonlyContext) -> str:
+        exit_rule = ""
+        if self._completion_phrase:
+            exit_rule = _EXIT_RULE.format(phrase=self._completion_phrase)
+        return _PATCH_TEMPLATE.format(
+            numbered=number_sentences(str(context.state.get(self._document_key) or "")),
+            criticism=context.state.get(self._criticism_key, ""),
+            exit_rule=exit_rule,
+        )
+
+    def _stats(self, ctx: InvocationContext, **changes) -> dict:
+        report = dict(ctx.session.state.get(PATCH_KEY) or {})
+        if report.get("invocation_id") != ctx.invocation_id:
+            report = {"invocation_id": ctx.invocation_id,
+                      "patched": 0, "fallbacks": 0, "operations": 0}
+        for name, value in changes.items():
+            report[name] += value
+        return report
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        patch_text = None
+        escalated = False
+        async for event in self._patch_agent.run_async(ctx):
+            yield event
+            escalated = escalated or bool(event.actions.escalate)
+            if event.is_final_response() and event.content and event.content.parts:
+                patch_text = "".join(p.text for p in event.content.parts if p.text) or None
+        if escalated:
+            return
+
+        document = str(ctx.session.state.get(self._document_key) or "")
+        try:
+            operations = parse_patch(patch_text)
+            patched = apply_patch(document, operations)
+        except PatchError as e:
+            logger.info("Correctif rejeté (%s) : régénération complète", e)
+            async for event in self._full_refiner.run_async(ctx):
+                yield event
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={PATCH_KEY: self._stats(ctx, fallbacks=1)}),
+            )
+            return
+
+        logger.info("Correctif appliqué : %d opération(s)", len(operations))
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=patched)]),
+            actions=EventActions(state_delta={
+                self._document_key: patched,
+                PATCH_KEY: self._stats(ctx, patched=1, operations=len(operations)),
+            }),
+        )
+
+
+def patch_report(events: list) -> Optional[str]:
+    """Résumé lisible des correctifs d'un tour, s'il y en a eu."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and PATCH_KEY in delta:
+            report = delta[PATCH_KEY]
+            return (f"🩹 Correctifs : {report['patched']} appliqué(s) "
+                    f"({report['operations']} opération(s)), "
+                    f"{report['fallbacks']} régénération(s) complète(s)")
+    return None
@@ -0,0 +1,104 @@
+"""Agent personnalisé StoryFlowAgent (logique d'orchestration conditionnelle)."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, LoopAgent, SequentialAgent
+from typing_extensions import override
+
+from .budget import BudgetCheck, LoopBudget, install_loop_budget
+from .checkpoint import CheckpointStore, ResumableLoopAgent
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+    from google.adk.events import Event
+
+
+class StoryFlowAgent(BaseAgent):
+    """
+    Agent personnalisé pour génération d'histoires avec logique conditionnelle.
+    
+    Workflow:
+    1. Génération initiale
+    2. Boucle critique/refinement
+    3. Vérification grammaire et ton
+    4. Régénération conditionnelle si ton négatif
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        story_generator: LlmAgent,
+        critic: LlmAgent,
+        reviser: BaseAgent,
+        grammar_check: LlmAgent,
+        tone_check: LlmAgent,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        budget: Optional[LoopBudget] = None,
+    ):
+        # Contrôle du budget en fin de tour (si un budget est fourni)
+        loop_agents = [critic, reviser, *([BudgetCheck(budget)] if budget else [])]
+
+        # Créer la boucle critique/revision (avec points de reprise si une base est fournie)
+        if checkpoint_store is not None:
+            loop_agent = ResumableLoopAgent(
+                name="CriticReviserLoop",
+                sub_agents=loop_agents,
+                max_iterations=2,
+                store=checkpoint_store
+            )
+        else:
+            loop_agent = LoopAgent(
+                name="CriticReviserLoop",
+                sub_agents=loop_agents,
+                max_iterations=2
+            )
+        # Mesure du budget et raison de l'arrêt (sans effet sans budget)
+        install_loop_budget(loop_agent, budget)
+
+        # Créer le séquentiel post-traitement
+        sequential_agent = SequentialAgent(
+            name="PostProcessing",
+            sub_agents=[grammar_check, tone_check]
+        )
+        
+        super().__init__(
+            name=name,
+            description="Agent personnalisé pour génération d'histoires avec workflow conditionnel",
+            sub_agents=[story_generator, loop_agent, sequential_agent]
+        )
+        
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_story_generator', story_generator)
+        object.__setattr__(self, '_loop_agent', loop_agent)
+        object.__setattr__(self, '_sequential_agent', sequential_agent)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """Logique d'orchestration personnalisée."""
+        
+        # Étape 1 : Génération initiale
+        async for event in self._story_generator.run_async(ctx):
+            yield event
+        
+        if "current_story" not in ctx.session.state:
+            return
+        
+        # Étape 2 : Boucle critique/revision
+        async for event in self._loop_agent.run_async(ctx):
+            yield event
+        
+        # Étape 3 : Vérification grammaire et ton
+        async for event in self._sequential_agent.run_async(ctx):
+            yield event
+        
+        # Étape 4 : Régénération conditionnelle si ton négatif
+        tone_result = ctx.session.state.get("tone_check_result")
+        
+        if tone_result == "negative":
+            # Régénérer l'histoire si le ton est négatif
+            async for event in self._story_generator.run_async(ctx):
+                yield event
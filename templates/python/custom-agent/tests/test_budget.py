@@ -0,0 +1,64 @@
+"""Tests pour le budget de CriticReviserLoop."""
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.custom_agent.budget import BUDGET_KEY, LoopBudget
+from src.custom_agent.story_flow import StoryFlowAgent
+
+
+class MeteredLlm(BaseLlm):
+    """Modèle de test : texte fixe et 100 tokens par appel."""
+
+    text: str
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        self.calls += 1
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.text)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=100),
+        )
+
+
+async def run_flow(budget):
+    critic_llm = MeteredLlm(model="critic", text="Give the robot a name.")
+    flow = StoryFlowAgent(
+        name="StoryFlowAgent",
+        story_generator=LlmAgent(name="StoryGenerator", model=MeteredLlm(model="s", text="Story."),
+                                 instruction="Write.", output_key="current_story"),
+        critic=LlmAgent(name="Critic", model=critic_llm,
+                        instruction="Critique.", output_key="criticism"),
+        reviser=LlmAgent(name="Reviser", model=MeteredLlm(model="r", text="Revised story."),
+                         instruction="Revise.", output_key="current_story"),
+        grammar_check=LlmAgent(name="GrammarCheck",
+                               model=MeteredLlm(model="g", text="Grammar is good!"),
+                               instruction="Grammar.", output_key="grammar_suggestions"),
+        tone_check=LlmAgent(name="ToneCheck", model=MeteredLlm(model="t", text="positive"),
+                            instruction="Tone.", output_key="tone_check_result"),
+        budget=budget,
+    )
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    runner = Runner(agent=flow, app_name="agents", session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="A story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    return critic_llm.calls, session.state[BUDGET_KEY]
+
+
+@pytest.mark.asyncio
+async def test_critic_reviser_loop_reports_stop_reason():
+    """Test : budget de 300 tokens → un seul tour ; budget large → max_iterations."""
+    critic_calls, report = await run_flow(LoopBudget(max_tokens=300))
+    assert critic_calls == 1
+    assert (report["stop_reason"], report["iterations"], report["tokens"]) == ("budget", 1, 200)
+
+    critic_calls, report = await run_flow(LoopBudget(max_seconds=60))
+    assert critic_calls == 2
+    assert report["stop_reason"] == "max_iterations"
@@ -0,0 +1,73 @@
+"""Tests pour les points de reprise de CriticReviserLoop."""
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.custom_agent.checkpoint import CheckpointStore, install_checkpoint_resume
+from src.custom_agent.story_flow import StoryFlowAgent
+
+
+class CountingLlm(BaseLlm):
+    """Modèle de test : réponse numérotée, échec simulé à l'appel ``fail_at``."""
+
+    prefix: str
+    calls: int = 0
+    fail_at: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("processus interrompu")
+        text = f"{self.prefix} {self.calls}"
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def build_flow(store, reviser_fail_at=0):
+    llms = {name: CountingLlm(model=name, prefix=name) for name in
+            ("story", "critic", "grammar", "tone")}
+    llms["reviser"] = CountingLlm(model="reviser", prefix="revision", fail_at=reviser_fail_at)
+    agents = {
+        "story_generator": LlmAgent(name="StoryGenerator", model=llms["story"],
+                                    instruction="Write.", output_key="current_story"),
+        "critic": LlmAgent(name="Critic", model=llms["critic"],
+                           instruction="Critique.", output_key="criticism"),
+        "reviser": LlmAgent(name="Reviser", model=llms["reviser"],
+                            instruction="Revise.", output_key="current_story"),
+        "grammar_check": LlmAgent(name="GrammarCheck", model=llms["grammar"],
+                                  instruction="Grammar.", output_key="grammar_suggestions"),
+        "tone_check": LlmAgent(name="ToneCheck", model=llms["tone"],
+                               instruction="Tone.", output_key="tone_check_result"),
+    }
+    flow = StoryFlowAgent(name="StoryFlowAgent", checkpoint_store=store, **agents)
+    install_checkpoint_resume(agents["story_generator"], flow.sub_agents[1])
+    return flow, llms
+
+
+async def run_turn(flow):
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    runner = Runner(agent=flow, app_name="agents", session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="A story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    return await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+
+
+@pytest.mark.asyncio
+async def test_story_flow_resumes_inside_critic_reviser_loop():
+    """Test : un arrêt au 2ᵉ tour reprend au 2ᵉ tour, sans regénérer l'histoire."""
+    store = CheckpointStore(":memory:")
+    crashing, _ = build_flow(store, reviser_fail_at=2)
+    with pytest.raises(RuntimeError):
+        await run_turn(crashing)
+
+    resumed, llms = build_flow(store)
+    session = await run_turn(resumed)
+    calls = {name: llm.calls for name, llm in llms.items()}
+    assert calls == {"story": 0, "critic": 1, "reviser": 1, "grammar": 1, "tone": 1}
+    assert session.state["current_story"] == "revision 1"
+    assert store.load(session, "CriticReviserLoop").finished
@@ -0,0 +1,80 @@
+"""Tests pour le réviseur en mode correctif."""
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.custom_agent.patching import PATCH_KEY, PatchRefiner, apply_patch, split_sentences
+from src.custom_agent.story_flow import StoryFlowAgent
+
+STORY = "A robot found a brush. It painted the sky grey. Nobody noticed."
+
+
+class ScriptedLlm(BaseLlm):
+    """Modèle de test : renvoie les textes de ``replies`` dans l'ordre (le dernier ensuite)."""
+
+    replies: list
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        text = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+@pytest.mark.asyncio
+async def test_story_flow_applies_patches_then_falls_back():
+    """Test : tour 1 corrigé localement, tour 2 (correctif invalide) régénéré."""
+    full_llm = ScriptedLlm(model="full", replies=["A fully rewritten story."])
+    reviser = LlmAgent(name="Reviser", model=full_llm, instruction="Revise.",
+                       output_key="current_story")
+    patch_reviser = PatchRefiner(reviser)
+    patch_reviser.patch_agent.model = ScriptedLlm(model="patch", replies=[
+        '{"operations": [{"op": "insert_after", "sentence": 3, "text": "Then it smiled."}]}',
+        "I rewrote the whole story for you.",
+    ])
+
+    def agent(name, reply, key):
+        return LlmAgent(name=name, model=ScriptedLlm(model=name, replies=[reply]),
+                        instruction=f"{name}.", output_key=key)
+
+    flow = StoryFlowAgent(
+        name="StoryFlowAgent",
+        story_generator=agent("StoryGenerator", STORY, "current_story"),
+        critic=agent("Critic", "Give it an ending.", "criticism"),
+        reviser=patch_reviser,
+        grammar_check=agent("GrammarCheck", "Grammar is good!", "grammar_suggestions"),
+        tone_check=agent("ToneCheck", "positive", "tone_check_result"),
+    )
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    runner = Runner(agent=flow, app_name="agents", session_service=session_service)
+    versions = []
+    content = types.Content(role="user", parts=[types.Part(text="A story")])
+    async for event in runner.run_async(user_id="u", session_id="s", new_message=content):
+        if event.actions.state_delta.get("current_story"):
+            versions.append(event.actions.state_delta["current_story"])
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert versions == [STORY, STORY + " Then it smiled.", "A fully rewritten story."]
+    assert full_llm.calls == 1
+    report = session.state[PATCH_KEY]
+    assert (report["patched"], report["fallbacks"], report["operations"]) == (1, 1, 1)
+
+
+def test_apply_patch_keeps_paragraph_breaks():
+    """Test : titres et paragraphes conservés autour des phrases modifiées."""
+    document = "# Title\n\nFirst para one. Two.\n\nSecond para three."
+    assert split_sentences(document) == ["# Title", "First para one.", "Two.",
+                                         "Second para three."]
+    assert apply_patch(document, [{"op": "replace", "sentence": 3, "text": "TWO."}]) == \
+        "# Title\n\nFirst para one. TWO.\n\nSecond para three."
+    # Dernière phrase d'un paragraphe supprimée : la coupure reste
+    assert apply_patch(document, [{"op": "delete", "sentence": 3}]) == \
+        "# Title\n\nFirst para one.\n\nSecond para three."
+    # Insertion en fin de paragraphe : avant la coupure
+    assert apply_patch(document, [{"op": "insert_after", "sentence": 3, "text": "Added."}]) == \
+        "# Title\n\nFirst para one. Two. Added.\n\nSecond para three."
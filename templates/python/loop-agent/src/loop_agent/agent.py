@@ -1,19 +1,94 @@
-"""Pipeline avec boucle d'amélioration : Initial → [Critic → Refiner]×N."""
-
-from google.adk.agents import Agent, LoopAgent, SequentialAgent
-from .sub_agents import initial_writer, critic_agent, refiner_agent
-
-# Créer la boucle de refinement
-refinement_loop = LoopAgent(
-    name="refinement_loop",
-    description="Boucle d'amélioration itérative du contenu",
-    sub_agents=[critic_agent, refiner_agent],
-    max_iterations=5
-)
-
-# Pipeline complet : Initial + Boucle
-root_agent = SequentialAgent(
-    name="iterative_writing_pipeline",
-    description="Génération initiale suivie d'amélioration itérative",
-    sub_agents=[initial_writer, refinement_loop]
-)
+"""Pipeline avec boucle d'amélioration : Initial → [Critic → Refiner]×N.
+
+``root_agent`` (et ``refinement_loop``) sont construits au premier accès
+(PEP 562) : importer ce module ne charge pas ADK et ne crée pas les sous-agents.
+"""
+
+import threading
+
+_lock = threading.Lock()
+_root_agent = None
+
+
+def build_root_agent():
+    """Construire le pipeline une seule fois (imports ADK différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            from google.adk.agents import LoopAgent, SequentialAgent
+            from .best_of_n import BestOfNRefiner
+            from .budget import BudgetCheck, LoopBudget, install_loop_budget
+            from .checkpoint import CheckpointStore, ResumableLoopAgent, install_checkpoint_resume
+            from .compaction import install_history_compaction
+            from .convergence import ConvergenceCheck
+            from .critic_gate import install_critic_gate
+            from .model_cache import install_model_cache
+            from .patching import PatchRefiner
+            from .sub_agents import initial_writer, critic_agent, refiner_agent
+
+            # Sortie dès que le document ne change plus (désactivée sans LOOP_CONVERGENCE)
+            convergence_check = ConvergenceCheck.from_env()
+
+            # Budget de temps et de tokens (désactivé sans LOOP_BUDGET_S / LOOP_BUDGET_TOKENS)
+            loop_budget = LoopBudget.from_env()
+
+            # N candidats en parallèle, meilleur score gardé (désactivé sans BEST_OF_N)
+            best_of_n = BestOfNRefiner.from_env(refiner_agent)
+            # Refiner par correctifs, régénération complète en secours (désactivé sans
+            # REFINER_PATCH ; sans effet avec BEST_OF_N, qui possède déjà le refiner)
+            patch_refiner = None if best_of_n else PatchRefiner.from_env(refiner_agent)
+
+            # Points de reprise après chaque tour (désactivés sans LOOP_CHECKPOINT_DB)
+            checkpoint_store = CheckpointStore.from_env()
+
+            # Créer la boucle de refinement
+            loop_agents = [
+                critic_agent,
+                best_of_n or patch_refiner or refiner_agent,
+                *([convergence_check] if convergence_check else []),
+                *([BudgetCheck(loop_budget)] if loop_budget else [])
+            ]
+            if checkpoint_store is not None:
+                refinement_loop = ResumableLoopAgent(
+                    name="refinement_loop",
+                    description="Boucle d'amélioration itérative du contenu",
+                    sub_agents=loop_agents,
+                    max_iterations=5,
+                    store=checkpoint_store
+                )
+            else:
+                refinement_loop = LoopAgent(
+                    name="refinement_loop",
+                    description="Boucle d'amélioration itérative du contenu",
+                    sub_agents=loop_agents,
+                    max_iterations=5
+                )
+
+            # Pipeline complet : Initial + Boucle
+            _root_agent = SequentialAgent(
+                name="iterative_writing_pipeline",
+                description="Génération initiale suivie d'amélioration itérative",
+                sub_agents=[initial_writer, refinement_loop]
+            )
+
+            # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+            install_history_compaction(_root_agent)
+            # Cache des appels modèle (désactivé sans MODEL_CACHE)
+            install_model_cache(_root_agent)
+            # Pré-contrôle local devant le critique (désactivé sans CRITIC_GATE)
+            install_critic_gate(
+                critic_agent, patch_refiner.patch_agent if patch_refiner else refiner_agent
+            )
+            # Reprise sans réécrire le premier draft (sans effet sans LOOP_CHECKPOINT_DB)
+            install_checkpoint_resume(initial_writer, refinement_loop)
+            # Mesure du budget et raison de l'arrêt (sans effet sans budget)
+            install_loop_budget(refinement_loop, loop_budget)
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    if name == "refinement_loop":
+        return build_root_agent().sub_agents[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
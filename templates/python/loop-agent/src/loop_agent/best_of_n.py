@@ -0,0 +1,247 @@
+"""Refinement best-of-N : plusieurs candidats en parallèle, un seul gardé.
+
+``refinement_loop`` affine en série : un candidat par tour, et chaque tour
+coûte deux appels modèle successifs. ``BestOfNRefiner`` remplace le refiner
+dans la boucle :
+
+1. ``n`` copies du refiner (modèle flash, températures étagées) génèrent
+   chacune un candidat, en parallèle (``ParallelAgent``)
+2. chaque candidat reçoit un score local, sans appel modèle : lisibilité
+   (Flesch), répétitions, longueur comparée au document actuel, et pénalité
+   pour un candidat identique au document
+3. juge optionnel : un seul appel modèle reçoit tous les candidats et renvoie
+   le numéro du meilleur ; réponse illisible → meilleur score local
+4. seul le gagnant devient ``current_document``
+
+Quand la critique est la phrase de fin, le refiner d'origine s'exécute seul
+(``exit_loop``). Scores et gagnant sont publiés dans l'état (``best_of_n``).
+
+Configuration par variables d'environnement (désactivé sans ``BEST_OF_N``) :
+``BEST_OF_N`` (nombre de candidats), ``BEST_OF_N_MODEL`` (défaut
+``gemini-2.5-flash``), ``BEST_OF_N_JUDGE=1``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+from .convergence import shingle_similarity
+from .critic_gate import COMPLETION_PHRASE, readability, repetition
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+    from google.adk.agents.readonly_context import ReadonlyContext
+
+logger = logging.getLogger(__name__)
+
+BEST_OF_N_KEY = "best_of_n"
+CANDIDATE_KEY = "refine_candidate_{index}"
+_WORD_RE = re.compile(r"\w+")
+_NUMBER_RE = re.compile(r"\d+")
+
+_JUDGE_TEMPLATE = """You are judging refined versions of a short document.
+
+Critique the refinement had to address:
+{criticism}
+
+Candidates:
+{candidates}
+
+Answer only with the number of the candidate that best addresses the critique
+while staying clear and engaging."""
+
+
+def score_candidate(candidate: str, current: str) -> float:
+    """Score local d'un candidat (plus haut = meilleur), sans appel modèle."""
+    words = len(_WORD_RE.findall(candidate))
+    if not words:
+        return float("-inf")
+    clarity = min(max(readability(candidate), 0.0), 100.0) / 100
+    variety = 1.0 - min(repetition(candidate) * 5, 1.0)
+    current_words = len(_WORD_RE.findall(current)) or words
+    ratio = words / current_words
+    length = 1.0 if 0.5 <= ratio <= 2.0 else 0.5
+    # Un candidat identique au document n'a pas appliqué la critique
+    changed = 0.0 if shingle_similarity(candidate, current) >= 0.98 else 1.0
+    return round(clarity + variety + length + changed, 4)
+
+
+def parse_choice(text: str, count: int) -> Optional[int]:
+    """Numéro (1..count) choisi par le juge, None si la réponse est illisible."""
+    match = _NUMBER_RE.search(text or "")
+    if match is None or not 1 <= int(match.group()) <= count:
+        return None
+    return int(match.group())
+
+
+class BestOfNRefiner(BaseAgent):
+    """Refiner qui génère ``n`` candidats en parallèle et garde le meilleur.
+
+    Args:
+        refiner: Refiner d'origine (modèle des candidats copié, ``exit_loop``)
+        n: Nombre de candidats par tour
+        model: Modèle des candidats
+        judge: Départager les candidats par un appel modèle unique
+        judge_model: Modèle du juge
+        name: Nom de l'agent
+        document_key: Clé d'état du document
+        criticism_key: Clé d'état de la critique
+    """
+
+    def __init__(
+        self,
+        refiner: LlmAgent,
+        n: int = 3,
+        model: str = "gemini-2.5-flash",
+        judge: bool = False,
+        judge_model: str = "gemini-2.5-flash",
+        name: str = "best_of_n_refiner",
+        document_key: str = "current_document",
+        criticism_key: str = "criticism",
+    ):
+        if n < 2:
+            raise ValueError("BestOfNRefiner demande au moins 2 candidats")
+
+        candidates = [
+            refiner.clone(update={
+                "name": f"{refiner.name}_candidate_{index}",
+                "model": model,
+                "tools": [],
+                "output_key": CANDIDATE_KEY.format(index=index),
+                # Températures étagées : des candidats différents pour le même prompt
+                "generate_content_config": types.GenerateContentConfig(
+                    temperature=round(0.3 + 0.6 * index / (n - 1), 2)
+                ),
+            })
+            for index in range(1, n + 1)
+        ]
+        fan_out = ParallelAgent(name=f"{name}_candidates", sub_agents=candidates)
+        judge_agent = LlmAgent(
+            name=f"{name}_judge",
+            model=judge_model,
+            description="Choisit le meilleur candidat en un appel",
+            instruction=self._judge_instruction,
+        ) if judge else None
+
+        super().__init__(
+            name=name,
+            description="Génère plusieurs candidats en parallèle et garde le meilleur",
+            sub_agents=[refiner, fan_out, *([judge_agent] if judge_agent else [])]
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_refiner', refiner)
+        object.__setattr__(self, '_candidates', candidates)
+        object.__setattr__(self, '_fan_out', fan_out)
+        object.__setattr__(self, '_judge', judge_agent)
+        object.__setattr__(self, '_document_key', document_key)
+        object.__setattr__(self, '_criticism_key', criticism_key)
+
+    @classmethod
+    def from_env(cls, refiner: LlmAgent) -> Optional["BestOfNRefiner"]:
+        """Refiner best-of-N configuré par l'environnement, None si désactivé."""
+        n = int(os.getenv("BEST_OF_N", "0") or 0)
+        if n < 2:
+            return None
+        model = os.getenv("BEST_OF_N_MODEL", "gemini-2.5-flash")
+        return cls(
+            refiner,
+            n=n,
+            model=model,
+            judge=os.getenv("BEST_OF_N_JUDGE", "").lower() in ("1", "true", "yes"),
+            judge_model=model,
+        )
+
+    @property
+    def candidates(self) -> list:
+        return list(self._candidates)
+
+    @property
+    def judge(self) -> Optional[LlmAgent]:
+        return self._judge
+
+    def _candidate_texts(self, state) -> list:
+        return [
+            str(state.get(CANDIDATE_KEY.format(index=index)) or "").strip()
+            for index in range(1, len(self._candidates) + 1)
+        ]
+
+    def _judge_instruction(self, context: ReadonlyContext) -> str:
+        candidates = "\n\n".join(
+            f"Candidate {index}:\n{text}"
+            for index, text in enumerate(self._candidate_texts(context.state), start=1)
+        )
+        return _JUDGE_TEMPLATE.format(
+            criticism=context.state.get(self._criticism_key, ""), candidates=candidates
+        )
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        criticism = str(ctx.session.state.get(self._criticism_key) or "").strip()
+        if criticism == COMPLETION_PHRASE:
+            # Rien à affiner : le refiner d'origine appelle exit_loop
+            async for event in self._refiner.run_async(ctx):
+                yield event
+            return
+
+        async for event in self._fan_out.run_async(ctx):
+            yield event
+
+        current = str(ctx.session.state.get(self._document_key) or "")
+        texts = self._candidate_texts(ctx.session.state)
+        scores = [score_candidate(text, current) for text in texts]
+        winner = max(range(len(texts)), key=lambda i: scores[i]) + 1
+        judged = None
+        if self._judge is not None:
+            verdict = ""
+            async for event in self._judge.run_async(ctx):
+                yield event
+                if event.is_final_response() and event.content and event.content.parts:
+                    verdict = "".join(p.text for p in event.content.parts if p.text)
+            judged = parse_choice(verdict, len(texts))
+            if judged is not None and texts[judged - 1]:
+                winner = judged
+        if not texts[winner - 1]:
+            logger.info("Best-of-N : aucun candidat utilisable, document inchangé")
+            return
+
+        logger.info("Best-of-N : candidat %d retenu (scores %s%s)", winner, scores,
+                    "" if judged is None else f", juge {judged}")
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=texts[winner - 1])]),
+            actions=EventActions(state_delta={
+                self._document_key: texts[winner - 1],
+                BEST_OF_N_KEY: {
+                    "candidates": len(texts),
+                    "scores": [None if s == float("-inf") else s for s in scores],
+                    "winner": winner,
+                    "judge_choice": judged,
+                },
+            }),
+        )
+
+
+def best_of_n_report(events: list) -> Optional[str]:
+    """Résumé lisible du dernier choix best-of-N d'un tour, s'il existe."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and BEST_OF_N_KEY in delta:
+            report = delta[BEST_OF_N_KEY]
+            judge = "" if report["judge_choice"] is None else \
+                f", juge : {report['judge_choice']}"
+            return (f"🏁 Best-of-N : candidat {report['winner']}/{report['candidates']} "
+                    f"retenu (scores {report['scores']}{judge})")
+    return None
@@ -0,0 +1,226 @@
+"""Budget de temps et de tokens pour la boucle d'amélioration.
+
+``max_iterations`` est fixe : selon le brouillon, la boucle fait un tour ou
+cinq, et l'objectif de latence est dépassé dans les deux sens. ``LoopBudget``
+accorde à chaque exécution de la boucle un budget de temps (secondes) et de
+tokens (``usage_metadata`` des réponses du modèle) :
+
+- ``before_agent_callback`` de la boucle (``install_loop_budget``) : début
+  de la mesure
+- ``BudgetCheck``, dernier agent de chaque tour : coût réel du tour (durée,
+  tokens) ; si un tour de plus, estimé au coût du tour le plus cher, dépasserait
+  l'un des budgets, il émet ``escalate`` et la boucle s'arrête
+- ``after_agent_callback`` de la boucle : raison de l'arrêt publiée dans
+  l'état (``loop_budget``) — ``budget``, ``convergence`` (``exit_loop`` ou
+  détecteur de similarité) ou ``max_iterations``
+
+``max_iterations`` reste la limite haute.
+
+Configuration par variables d'environnement (désactivé sans l'une des deux) :
+``LOOP_BUDGET_S`` (secondes), ``LOOP_BUDGET_TOKENS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.agents.invocation_context import InvocationContext
+
+logger = logging.getLogger(__name__)
+
+BUDGET_KEY = "loop_budget"
+
+
+def event_tokens(events: list) -> int:
+    """Tokens consommés (entrée + sortie) par les réponses modèle des événements."""
+    return sum(
+        event.usage_metadata.total_token_count or 0
+        for event in events
+        if event.usage_metadata and not event.partial
+    )
+
+
+@dataclass
+class _LoopRun:
+    """Mesures d'une exécution de la boucle."""
+
+    started: float
+    first_event: int
+    iteration_started: float
+    iteration_first_event: int
+    iterations: list = field(default_factory=list)
+    stop_reason: Optional[str] = None
+
+
+class LoopBudget:
+    """Contrôleur de budget d'une boucle (callbacks + agent de contrôle).
+
+    Args:
+        max_seconds: Durée maximale de la boucle par invocation (None : illimitée)
+        max_tokens: Tokens maximum de la boucle par invocation (None : illimités)
+    """
+
+    def __init__(self, max_seconds: Optional[float] = None, max_tokens: Optional[int] = None):
+        if max_seconds is None and max_tokens is None:
+            raise ValueError("LoopBudget demande un budget de temps ou de tokens")
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        # invocation → mesures en cours
+        self._runs: dict = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["LoopBudget"]:
+        """Budget configuré par l'environnement, None si désactivé."""
+        seconds = os.getenv("LOOP_BUDGET_S", "")
+        tokens = os.getenv("LOOP_BUDGET_TOKENS", "")
+        if not seconds and not tokens:
+            return None
+        return cls(
+            max_seconds=float(seconds) if seconds else None,
+            max_tokens=int(tokens) if tokens else None,
+        )
+
+    def start(self, callback_context: CallbackContext) -> None:
+        """Callback ``before_agent`` de la boucle."""
+        now = time.monotonic()
+        first_event = len(callback_context.session.events)
+        self._runs[callback_context.invocation_id] = _LoopRun(now, first_event, now, first_event)
+        return None
+
+    @staticmethod
+    def _close_iteration(run: _LoopRun, events: list, now: float) -> None:
+        run.iterations.append({
+            "seconds": round(now - run.iteration_started, 3),
+            "tokens": event_tokens(events[run.iteration_first_event:]),
+        })
+        run.iteration_started, run.iteration_first_event = now, len(events)
+
+    def record_iteration(self, ctx: InvocationContext) -> dict:
+        """Mesurer le tour qui se termine ; renvoie le rapport mis à jour."""
+        run = self._runs.get(ctx.invocation_id)
+        if run is None:
+            raise RuntimeError("BudgetCheck sans install_loop_budget sur sa boucle")
+        now = time.monotonic()
+        events = ctx.session.events
+        self._close_iteration(run, events, now)
+
+        elapsed = now - run.started
+        tokens = event_tokens(events[run.first_event:])
+        next_seconds = max(i["seconds"] for i in run.iterations)
+        next_tokens = max(i["tokens"] for i in run.iterations)
+        over_time = self.max_seconds is not None and elapsed + next_seconds > self.max_seconds
+        over_tokens = self.max_tokens is not None and tokens + next_tokens > self.max_tokens
+        if over_time or over_tokens:
+            run.stop_reason = "budget"
+            logger.info(
+                "Budget : arrêt après %d tour(s) (%.2f s, %d tokens ; tour suivant estimé "
+                "à %.2f s, %d tokens)", len(run.iterations), elapsed, tokens,
+                next_seconds, next_tokens,
+            )
+        return self._report(run, elapsed, tokens)
+
+    def _report(self, run: _LoopRun, elapsed: float, tokens: int) -> dict:
+        return {
+            "stop_reason": run.stop_reason,
+            "iterations": len(run.iterations),
+            "elapsed_s": round(elapsed, 3),
+            "tokens": tokens,
+            "budget_s": self.max_seconds,
+            "budget_tokens": self.max_tokens,
+            "per_iteration": list(run.iterations),
+        }
+
+    def finish(self, callback_context: CallbackContext) -> None:
+        """Callback ``after_agent`` de la boucle : publier la raison de l'arrêt."""
+        run = self._runs.pop(callback_context.invocation_id, None)
+        if run is None:
+            return None
+        now = time.monotonic()
+        if any(BUDGET_KEY not in (event.actions.state_delta or {})
+               for event in callback_context.session.events[run.iteration_first_event:]):
+            # Dernier tour interrompu par escalate avant BudgetCheck
+            self._close_iteration(run, callback_context.session.events, now)
+        events = callback_context.session.events[run.first_event:]
+        if run.stop_reason is None:
+            escalated = any(
+                event.actions and event.actions.escalate
+                and event.invocation_id == callback_context.invocation_id
+                for event in events
+            )
+            run.stop_reason = "convergence" if escalated else "max_iterations"
+        callback_context.state[BUDGET_KEY] = self._report(
+            run, now - run.started, event_tokens(events)
+        )
+        return None
+
+
+class BudgetCheck(BaseAgent):
+    """Dernier agent du tour : arrête la boucle avant un dépassement de budget.
+
+    Args:
+        budget: Contrôleur de budget de la boucle
+        name: Nom de l'agent
+    """
+
+    def __init__(self, budget: LoopBudget, name: str = "budget_check"):
+        super().__init__(
+            name=name,
+            description="Arrête la boucle avant qu'un tour de plus ne dépasse le budget"
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_budget', budget)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        report = self._budget.record_iteration(ctx)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                escalate=report["stop_reason"] == "budget",
+                state_delta={BUDGET_KEY: report},
+            ),
+        )
+
+
+def _append_callback(agent, attribute: str, callback) -> None:
+    callbacks = getattr(agent, attribute)
+    if callbacks is None:
+        callbacks = []
+    elif not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    setattr(agent, attribute, [*callbacks, callback])
+
+
+def install_loop_budget(loop, budget: Optional[LoopBudget]) -> None:
+    """Mesurer chaque exécution de ``loop`` (dont le dernier agent est ``BudgetCheck``)."""
+    if budget is None:
+        return
+    _append_callback(loop, "before_agent_callback", budget.start)
+    _append_callback(loop, "after_agent_callback", budget.finish)
+
+
+def budget_report(events: list) -> Optional[str]:
+    """Résumé lisible du budget de la boucle d'un tour, s'il existe."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and BUDGET_KEY in delta:
+            report = delta[BUDGET_KEY]
+            return (f"⏳ Budget : arrêt sur {report['stop_reason']} après "
+                    f"{report['iterations']} tour(s), {report['elapsed_s']:.2f} s, "
+                    f"{report['tokens']} tokens")
+    return None
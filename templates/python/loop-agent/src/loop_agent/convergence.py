@@ -0,0 +1,149 @@
+"""Sortie anticipée de la boucle quand le document ne change plus.
+
+``refinement_loop`` ne s'arrête que si le critique répond exactement « No
+major issues found. » (et le refiner dépense alors un appel pour ``exit_loop``)
+ou après ``max_iterations`` tours. Un document stabilisé coûte donc encore
+deux appels modèle par tour.
+
+``ConvergenceCheck`` se place en fin de boucle, après le refiner : il compare
+localement (sans appel modèle) les deux dernières versions de
+``current_document`` du tour et émet ``escalate`` — la boucle s'arrête — dès
+que leur similarité atteint ``threshold``.
+
+- ``shingles`` : Jaccard des séquences de ``shingle_size`` mots (insensible
+  aux espaces et à la casse, coût linéaire)
+- ``edit`` : ratio de ``difflib.SequenceMatcher`` (distance d'édition
+  normalisée, au caractère près)
+
+La similarité mesurée est publiée dans l'état (``loop_convergence``).
+
+Configuration par variables d'environnement (désactivé sans
+``LOOP_CONVERGENCE``) : ``LOOP_CONVERGENCE`` (``shingles`` ou ``edit``),
+``LOOP_CONVERGENCE_THRESHOLD`` (défaut 0.9).
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+
+CONVERGENCE_KEY = "loop_convergence"
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Séquences de ``size`` mots consécutifs (minuscules)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def shingle_similarity(a: str, b: str, size: int = 3) -> float:
+    """Indice de Jaccard des shingles des deux textes."""
+    left, right = shingles(a, size), shingles(b, size)
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """Similarité par distance d'édition (1.0 = textes identiques)."""
+    return difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def document_versions(events: list, invocation_id: str, key: str) -> list:
+    """Valeurs successives de ``key`` écrites pendant l'invocation."""
+    versions = []
+    for event in events:
+        if event.invocation_id != invocation_id or not event.actions:
+            continue
+        delta = event.actions.state_delta
+        if delta and key in delta and delta[key]:
+            versions.append(str(delta[key]))
+    return versions
+
+
+class ConvergenceCheck(BaseAgent):
+    """Arrête la boucle quand deux versions successives du document se ressemblent.
+
+    Args:
+        name: Nom de l'agent
+        document_key: Clé d'état du document
+        threshold: Similarité à partir de laquelle la boucle s'arrête
+        method: ``"shingles"`` ou ``"edit"``
+        shingle_size: Mots par shingle
+    """
+
+    def __init__(
+        self,
+        name: str = "convergence_check",
+        document_key: str = "current_document",
+        threshold: float = 0.9,
+        method: str = "shingles",
+        shingle_size: int = 3,
+    ):
+        if method not in ("shingles", "edit"):
+            raise ValueError(f"Méthode de similarité inconnue : {method!r}")
+
+        super().__init__(
+            name=name,
+            description="Sort de la boucle quand le document est stabilisé"
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_document_key', document_key)
+        object.__setattr__(self, '_threshold', threshold)
+        object.__setattr__(self, '_method', method)
+        object.__setattr__(self, '_shingle_size', shingle_size)
+
+    @classmethod
+    def from_env(cls) -> Optional["ConvergenceCheck"]:
+        """Détecteur configuré par l'environnement, None si désactivé."""
+        method = os.getenv("LOOP_CONVERGENCE", "").lower()
+        if method not in ("shingles", "edit"):
+            return None
+        return cls(
+            threshold=float(os.getenv("LOOP_CONVERGENCE_THRESHOLD", "0.9")),
+            method=method,
+        )
+
+    def similarity(self, previous: str, current: str) -> float:
+        if self._method == "edit":
+            return edit_similarity(previous, current)
+        return shingle_similarity(previous, current, self._shingle_size)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        versions = document_versions(ctx.session.events, ctx.invocation_id, self._document_key)
+        if len(versions) < 2:
+            return
+
+        similarity = self.similarity(versions[-2], versions[-1])
+        converged = similarity >= self._threshold
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                escalate=converged,
+                state_delta={CONVERGENCE_KEY: {
+                    "similarity": round(similarity, 4),
+                    "threshold": self._threshold,
+                    "method": self._method,
+                    "refinements": len(versions) - 1,
+                    "converged": converged,
+                }},
+            ),
+        )
@@ -0,0 +1,254 @@
+"""Pré-contrôle local avant l'agent critique.
+
+Chaque tour de ``refinement_loop`` dépense un appel Gemini pour
+``critic_agent``, même pour un brouillon court et propre. ``CriticGate``
+évalue d'abord ``current_document`` localement :
+
+- longueur : entre ``min_words`` et ``max_words`` mots
+- répétitions : part des séquences de 3 mots en double ≤ ``max_repetition``,
+  aucune phrase répétée
+- lisibilité : score de Flesch (reading ease) ≥ ``min_readability``
+
+Si le brouillon passe nettement les trois contrôles, la réponse du critique
+est remplacée par la phrase de fin (« No major issues found. ») sans appel
+modèle ; le refiner, qui ne ferait alors qu'appeler ``exit_loop``, sort aussi
+de la boucle sans appel modèle. Sinon le critique s'exécute normalement.
+
+Chaque décision est journalisée ; les contrôles et appels évités du tour sont
+publiés dans l'état (``critic_gate``) et affichés par ``run.py``.
+
+Configuration par variables d'environnement (désactivé sans
+``CRITIC_GATE``) : ``CRITIC_GATE_MIN_WORDS``, ``CRITIC_GATE_MAX_WORDS``,
+``CRITIC_GATE_MAX_REPETITION``, ``CRITIC_GATE_MIN_READABILITY``.
+"""
+
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+
+logger = logging.getLogger(__name__)
+
+GATE_KEY = "critic_gate"
+COMPLETION_PHRASE = "No major issues found."
+_WORD_RE = re.compile(r"[A-Za-zÀ-ÿ']+")
+_SENTENCE_RE = re.compile(r"[^.!?]+[.!?]*")
+_VOWEL_GROUPS_RE = re.compile(r"[aeiouyàâäéèêëîïôöùûü]+")
+
+
+def count_syllables(word: str) -> int:
+    """Syllabes estimées : groupes de voyelles, « e » final muet retiré."""
+    word = word.lower()
+    groups = len(_VOWEL_GROUPS_RE.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+def readability(text: str) -> float:
+    """Score de Flesch (reading ease) : plus il est élevé, plus le texte est lisible."""
+    words = _WORD_RE.findall(text)
+    sentences = [s for s in _SENTENCE_RE.findall(text) if _WORD_RE.search(s)]
+    if not words or not sentences:
+        return 0.0
+    syllables = sum(count_syllables(word) for word in words)
+    return 206.835 - 1.015 * len(words) / len(sentences) - 84.6 * syllables / len(words)
+
+
+def repetition(text: str) -> float:
+    """Part des séquences de 3 mots qui apparaissent plus d'une fois."""
+    words = _WORD_RE.findall(text.lower())
+    trigrams = [tuple(words[i:i + 3]) for i in range(len(words) - 2)]
+    if not trigrams:
+        return 0.0
+    counts = Counter(trigrams)
+    return sum(count for count in counts.values() if count > 1) / len(trigrams)
+
+
+@dataclass
+class GateDecision:
+    """Résultat du pré-contrôle d'un brouillon."""
+
+    passed: bool
+    words: int
+    repetition: float
+    readability: float
+    reasons: list = field(default_factory=list)
+
+
+@dataclass
+class GateStats:
+    """Compteurs du pré-contrôle pour tout le processus."""
+
+    checked: int = 0
+    critic_skipped: int = 0
+    refiner_skipped: int = 0
+    reasons: Counter = field(default_factory=Counter)
+
+
+class CriticGate:
+    """Callbacks ``before_model`` du critique et du refiner.
+
+    Args:
+        min_words: Longueur minimale du brouillon (mots)
+        max_words: Longueur maximale du brouillon (mots)
+        max_repetition: Part maximale de séquences de 3 mots répétées
+        min_readability: Score de Flesch minimal
+        document_key: Clé d'état du brouillon
+        criticism_key: Clé d'état de la critique (``output_key`` du critique)
+    """
+
+    def __init__(
+        self,
+        min_words: int = 20,
+        max_words: int = 150,
+        max_repetition: float = 0.1,
+        min_readability: float = 50.0,
+        document_key: str = "current_document",
+        criticism_key: str = "criticism",
+    ):
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_repetition = max_repetition
+        self.min_readability = min_readability
+        self.document_key = document_key
+        self.criticism_key = criticism_key
+        self.stats = GateStats()
+
+    @classmethod
+    def from_env(cls) -> Optional["CriticGate"]:
+        """Pré-contrôle configuré par l'environnement, None si désactivé."""
+        if os.getenv("CRITIC_GATE", "").lower() not in ("1", "true", "yes"):
+            return None
+        return cls(
+            min_words=int(os.getenv("CRITIC_GATE_MIN_WORDS", "20")),
+            max_words=int(os.getenv("CRITIC_GATE_MAX_WORDS", "150")),
+            max_repetition=float(os.getenv("CRITIC_GATE_MAX_REPETITION", "0.1")),
+            min_readability=float(os.getenv("CRITIC_GATE_MIN_READABILITY", "50")),
+        )
+
+    def evaluate(self, text: str) -> GateDecision:
+        """Appliquer les trois contrôles au brouillon."""
+        words = len(_WORD_RE.findall(text))
+        repeated = repetition(text)
+        score = readability(text)
+        reasons = []
+        if words < self.min_words:
+            reasons.append("too_short")
+        if words > self.max_words:
+            reasons.append("too_long")
+        sentences = [s.strip().lower() for s in _SENTENCE_RE.findall(text) if s.strip()]
+        if repeated > self.max_repetition or len(set(sentences)) < len(sentences):
+            reasons.append("repetitive")
+        if score < self.min_readability:
+            reasons.append("hard_to_read")
+        return GateDecision(not reasons, words, round(repeated, 3), round(score, 1), reasons)
+
+    def _record(self, callback_context: CallbackContext, **changes) -> None:
+        """Cumuler les compteurs du tour dans l'état (``critic_gate``)."""
+        report = dict(callback_context.state.get(GATE_KEY) or {})
+        if report.get("invocation_id") != callback_context.invocation_id:
+            report = {"invocation_id": callback_context.invocation_id,
+                      "checked": 0, "critic_skipped": 0, "refiner_skipped": 0}
+        for name, value in changes.items():
+            report[name] = report.get(name, 0) + value if isinstance(value, int) else value
+        callback_context.state[GATE_KEY] = report
+
+    def before_critic(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        draft = str(callback_context.state.get(self.document_key) or "")
+        decision = self.evaluate(draft)
+        self.stats.checked += 1
+        self.stats.reasons.update(decision.reasons)
+        logger.info(
+            "Pré-contrôle %s : %d mots, répétition %.3f, lisibilité %.1f%s",
+            "réussi" if decision.passed else "échoué", decision.words,
+            decision.repetition, decision.readability,
+            "" if decision.passed else f" ({', '.join(decision.reasons)})",
+        )
+        last = {"passed": decision.passed, "words": decision.words,
+                "repetition": decision.repetition, "readability": decision.readability,
+                "reasons": decision.reasons}
+        if not decision.passed:
+            self._record(callback_context, checked=1, last=last)
+            return None
+
+        self.stats.critic_skipped += 1
+        self._record(callback_context, checked=1, critic_skipped=1, last=last)
+        return LlmResponse(content=types.Content(
+            role="model", parts=[types.Part(text=COMPLETION_PHRASE)]
+        ))
+
+    def before_refiner(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        criticism = str(callback_context.state.get(self.criticism_key) or "").strip()
+        if criticism != COMPLETION_PHRASE:
+            return None
+        if _answers_exit_loop(llm_request):
+            # Réponse de l'outil déjà reçue : réponse finale vide, sinon ADK
+            # rappellerait le modèle (et ce callback) indéfiniment
+            return LlmResponse(content=types.Content(role="model", parts=[]))
+        # Le refiner n'aurait qu'à appeler exit_loop : appel d'outil sans modèle
+        self.stats.refiner_skipped += 1
+        self._record(callback_context, refiner_skipped=1)
+        logger.info("Critique terminée : sortie de boucle sans appel au refiner")
+        return LlmResponse(content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(name="exit_loop", args={}))],
+        ))
+
+
+def _answers_exit_loop(llm_request: LlmRequest) -> bool:
+    """Vrai si la requête se termine par la réponse de l'outil ``exit_loop``."""
+    if not llm_request.contents:
+        return False
+    return any(
+        part.function_response and part.function_response.name == "exit_loop"
+        for part in llm_request.contents[-1].parts or []
+    )
+
+
+def _prepend_callback(agent, callback) -> None:
+    callbacks = agent.before_model_callback
+    if callbacks is None:
+        callbacks = []
+    elif not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    agent.before_model_callback = [callback, *callbacks]
+
+
+def install_critic_gate(critic, refiner=None, gate: Optional[CriticGate] = None):
+    """Placer le pré-contrôle devant le critique (et le refiner).
+
+    Sans ``gate``, utilise ``CriticGate.from_env()`` ; renvoie le pré-contrôle
+    installé (None si désactivé).
+    """
+    gate = gate or CriticGate.from_env()
+    if gate is None:
+        return None
+    # En premier : un brouillon validé n'atteint ni le cache ni le modèle
+    _prepend_callback(critic, gate.before_critic)
+    if refiner is not None:
+        _prepend_callback(refiner, gate.before_refiner)
+    return gate
+
+
+def gate_report(events: list) -> Optional[str]:
+    """Résumé lisible du pré-contrôle d'un tour, s'il existe."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and GATE_KEY in delta:
+            report = delta[GATE_KEY]
+            return (f"🚦 Pré-contrôle : {report['checked']} brouillon(s) évalué(s), "
+                    f"{report['critic_skipped']} appel(s) critique et "
+                    f"{report['refiner_skipped']} appel(s) refiner évités")
+    return None
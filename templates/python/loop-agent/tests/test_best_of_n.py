@@ -0,0 +1,81 @@
+"""Tests pour le refinement best-of-N."""
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent.best_of_n import BEST_OF_N_KEY, BestOfNRefiner, parse_choice, score_candidate
+
+DRAFT = "A robot found a brush in the attic. It painted the old wall grey."
+CLEAN = "A robot found a brush in the attic. It painted the old wall gold, and the house woke up."
+REPETITIVE = ("The robot painted and painted and painted. The robot painted and painted "
+              "and painted. The robot painted and painted and painted.")
+
+
+class ScriptedLlm(BaseLlm):
+    """Modèle de test : renvoie les textes de ``replies`` dans l'ordre (le dernier ensuite)."""
+
+    replies: list
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        text = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def test_local_score_prefers_changed_clean_candidate():
+    """Test : un candidat inchangé ou répétitif score moins qu'une vraie amélioration."""
+    assert score_candidate(CLEAN, DRAFT) > score_candidate(DRAFT, DRAFT)
+    assert score_candidate(CLEAN, DRAFT) > score_candidate(REPETITIVE, DRAFT)
+    assert score_candidate("", DRAFT) == float("-inf")
+    assert (parse_choice("Candidate 2", 3), parse_choice("7", 3), parse_choice("none", 3)) == \
+        (2, None, None)
+
+
+async def run_best_of_n(judge_reply=None):
+    refiner = Agent(model="gemini-2.5-flash", name="refiner",
+                    instruction="Refine: {current_document}", output_key="current_document")
+    best = BestOfNRefiner(refiner, n=3, judge=judge_reply is not None)
+    for candidate, reply in zip(best.candidates, (DRAFT, CLEAN, REPETITIVE)):
+        candidate.model = ScriptedLlm(model=candidate.name, replies=[reply])
+    if judge_reply is not None:
+        best.judge.model = ScriptedLlm(model="judge", replies=[judge_reply])
+    critic = Agent(model=ScriptedLlm(model="critic", replies=["Make the ending brighter."]),
+                   name="critic", instruction="Critique: {current_document}",
+                   output_key="criticism")
+    loop = LoopAgent(name="loop", max_iterations=1, sub_agents=[critic, best])
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=SequentialAgent(name="pipeline", sub_agents=[loop]),
+                    app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s",
+                                         state={"current_document": DRAFT})
+    content = types.Content(role="user", parts=[types.Part(text="Polish the story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    return session.state
+
+
+@pytest.mark.asyncio
+async def test_best_local_candidate_becomes_current_document():
+    """Test : trois candidats générés, seul le meilleur score local est gardé."""
+    state = await run_best_of_n()
+    assert state["current_document"] == CLEAN
+    assert state[BEST_OF_N_KEY]["winner"] == 2
+    assert state[BEST_OF_N_KEY]["judge_choice"] is None
+
+
+@pytest.mark.asyncio
+async def test_judge_choice_overrides_local_score():
+    """Test : le juge (un appel) départage ; réponse illisible → score local."""
+    state = await run_best_of_n(judge_reply="3")
+    assert state["current_document"] == REPETITIVE
+    assert state[BEST_OF_N_KEY]["judge_choice"] == 3
+
+    state = await run_best_of_n(judge_reply="They are all fine.")
+    assert state["current_document"] == CLEAN
@@ -0,0 +1,76 @@
+"""Tests pour le budget de temps et de tokens de la boucle."""
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent.budget import BUDGET_KEY, BudgetCheck, LoopBudget, install_loop_budget
+from src.loop_agent.convergence import ConvergenceCheck
+
+
+class MeteredLlm(BaseLlm):
+    """Modèle de test : texte fixe (ou numéroté) et 100 tokens par appel."""
+
+    text: str
+    numbered: bool = False
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        self.calls += 1
+        text = f"{self.text} {self.calls}" if self.numbered else self.text
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=100),
+        )
+
+
+async def run_loop(budget, refiner_llm, with_convergence=False):
+    critic_llm = MeteredLlm(model="critic-model", text="Tighten the ending.")
+    critic = Agent(model=critic_llm, name="critic",
+                   instruction="Critique: {current_document}", output_key="criticism")
+    refiner = Agent(model=refiner_llm, name="refiner",
+                    instruction="Refine: {current_document}", output_key="current_document")
+    checks = [ConvergenceCheck(threshold=0.9)] if with_convergence else []
+    loop = LoopAgent(name="loop", max_iterations=5,
+                     sub_agents=[critic, refiner, *checks, BudgetCheck(budget)])
+    install_loop_budget(loop, budget)
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=SequentialAgent(name="pipeline", sub_agents=[loop]),
+                    app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s",
+                                         state={"current_document": "A first draft."})
+    content = types.Content(role="user", parts=[types.Part(text="Polish the story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    return critic_llm, session.state[BUDGET_KEY]
+
+
+@pytest.mark.asyncio
+async def test_loop_stops_before_token_budget_overrun():
+    """Test : 200 tokens par tour, budget 500 → arrêt après 2 tours, pas 3."""
+    refiner_llm = MeteredLlm(model="refiner-model", text="Draft version", numbered=True)
+    critic_llm, report = await run_loop(LoopBudget(max_tokens=500), refiner_llm)
+
+    assert critic_llm.calls == 2
+    assert report["stop_reason"] == "budget"
+    assert report["iterations"] == 2 and report["tokens"] == 400
+    assert [i["tokens"] for i in report["per_iteration"]] == [200, 200]
+
+
+@pytest.mark.asyncio
+async def test_stop_reason_distinguishes_convergence_and_max_iterations():
+    """Test : arrêt sur convergence, puis sur max_iterations avec un budget large."""
+    stable = MeteredLlm(model="refiner-model", text="The same refined draft every time.")
+    _, report = await run_loop(LoopBudget(max_seconds=60), stable, with_convergence=True)
+    assert report["stop_reason"] == "convergence"
+    assert report["iterations"] == 2
+
+    changing = MeteredLlm(model="refiner-model", text="Draft version", numbered=True)
+    critic_llm, report = await run_loop(LoopBudget(max_tokens=10_000), changing)
+    assert critic_llm.calls == 5
+    assert report["stop_reason"] == "max_iterations"
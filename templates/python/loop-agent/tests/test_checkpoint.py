@@ -0,0 +1,83 @@
+"""Tests pour les points de reprise de la boucle d'amélioration."""
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent.checkpoint import (
+    CHECKPOINT_KEY,
+    CheckpointStore,
+    ResumableLoopAgent,
+    install_checkpoint_resume,
+)
+
+
+class CountingLlm(BaseLlm):
+    """Modèle de test : réponse numérotée, échec simulé à l'appel ``fail_at``."""
+
+    prefix: str
+    calls: int = 0
+    fail_at: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("processus interrompu")
+        text = f"{self.prefix} {self.calls}"
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def build_pipeline(store, writer_llm, critic_llm, refiner_llm):
+    writer = Agent(model=writer_llm, name="writer", instruction="Write.",
+                   output_key="current_document")
+    critic = Agent(model=critic_llm, name="critic",
+                   instruction="Critique: {current_document}", output_key="criticism")
+    refiner = Agent(model=refiner_llm, name="refiner",
+                    instruction="Refine: {current_document} / {criticism}",
+                    output_key="current_document")
+    loop = ResumableLoopAgent(name="loop", sub_agents=[critic, refiner],
+                              max_iterations=4, store=store)
+    install_checkpoint_resume(writer, loop)
+    return SequentialAgent(name="pipeline", sub_agents=[writer, loop])
+
+
+async def run_turn(runner):
+    content = types.Content(role="user", parts=[types.Part(text="A story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_interrupted_loop_resumes_after_last_completed_iteration():
+    """Test : après un arrêt au 3ᵉ tour, la reprise ne rejoue ni le draft ni les tours 1-2."""
+    store = CheckpointStore(":memory:")
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+
+    crashing = build_pipeline(store, CountingLlm(model="w", prefix="draft"),
+                              CountingLlm(model="c", prefix="critique"),
+                              CountingLlm(model="r", prefix="version", fail_at=3))
+    with pytest.raises(RuntimeError):
+        await run_turn(Runner(agent=crashing, app_name="agents", session_service=session_service))
+
+    # Nouveau processus : session vide, seule la base de reprise a survécu
+    session_service = InMemorySessionService()
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    writer_llm = CountingLlm(model="w", prefix="draft")
+    critic_llm = CountingLlm(model="c", prefix="critique")
+    refiner_llm = CountingLlm(model="r", prefix="version")
+    resumed = build_pipeline(store, writer_llm, critic_llm, refiner_llm)
+    await run_turn(Runner(agent=resumed, app_name="agents", session_service=session_service))
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert (writer_llm.calls, critic_llm.calls, refiner_llm.calls) == (0, 2, 2)
+    assert session.state[CHECKPOINT_KEY] == {"resumed_from": 2}
+    assert session.state["current_document"] == "version 2"
+    assert store.load(session, "loop").finished
+
+    # Boucle terminée : le tour suivant de la session repart de zéro
+    await run_turn(Runner(agent=resumed, app_name="agents", session_service=session_service))
+    assert (writer_llm.calls, critic_llm.calls) == (1, 6)
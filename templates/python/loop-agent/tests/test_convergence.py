@@ -0,0 +1,71 @@
+"""Tests pour la sortie anticipée de la boucle par similarité."""
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent.convergence import (
+    CONVERGENCE_KEY,
+    ConvergenceCheck,
+    edit_similarity,
+    shingle_similarity,
+)
+
+DRAFT = "The lighthouse keeper counted ships every night until the fog rolled in over the bay."
+
+
+class ScriptedLlm(BaseLlm):
+    """Modèle de test : renvoie les textes de ``replies`` dans l'ordre (le dernier ensuite)."""
+
+    replies: list
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        text = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def test_similarity_measures():
+    """Test : textes proches au-dessus du seuil, textes différents en dessous."""
+    tweaked = DRAFT.replace("bay.", "bay!")
+    assert shingle_similarity(DRAFT, DRAFT.upper()) == 1.0
+    assert shingle_similarity(DRAFT, tweaked) == 1.0
+    assert edit_similarity(DRAFT, tweaked) > 0.95
+    assert shingle_similarity(DRAFT, "A dragon slept under the old mountain.") < 0.1
+
+
+@pytest.mark.asyncio
+async def test_loop_exits_once_document_stabilizes():
+    """Test : la boucle s'arrête dès que le refiner ne change plus le document."""
+    critic_llm = ScriptedLlm(model="critic-model", replies=["Add a sensory detail."])
+    refiner_llm = ScriptedLlm(model="refiner-model", replies=[
+        DRAFT + " Salt stung his eyes.",
+        DRAFT + " Salt stung his eyes!",
+    ])
+    writer = Agent(model=ScriptedLlm(model="writer-model", replies=[DRAFT]), name="writer",
+                   instruction="Write.", output_key="current_document")
+    critic = Agent(model=critic_llm, name="critic",
+                   instruction="Critique: {current_document}", output_key="criticism")
+    refiner = Agent(model=refiner_llm, name="refiner",
+                    instruction="Refine: {current_document}", output_key="current_document")
+    loop = LoopAgent(name="loop", max_iterations=5,
+                     sub_agents=[critic, refiner, ConvergenceCheck(threshold=0.9)])
+    pipeline = SequentialAgent(name="pipeline", sub_agents=[writer, loop])
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="A story about a lighthouse")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    # Tour 1 : ajout d'une phrase (pas de convergence) ; tour 2 : ponctuation seule
+    assert (critic_llm.calls, refiner_llm.calls) == (2, 2)
+    report = session.state[CONVERGENCE_KEY]
+    assert report["converged"] and report["refinements"] == 2
+    assert report["similarity"] >= 0.9
@@ -0,0 +1,58 @@
+"""Tests pour le pré-contrôle local devant le critique."""
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+from src.loop_agent.critic_gate import GATE_KEY, CriticGate, install_critic_gate
+from src.loop_agent.fake_llm import CALL_COUNTS
+from src.loop_agent.sub_agents import exit_loop
+
+CLEAN = ("The old boat drifted past the pier at dawn. A gull called from the mast. "
+         "Mara waved to her father and ran down the sand to meet him. "
+         "He held up a small net full of bright fish.")
+
+
+def test_evaluate_flags_each_check():
+    """Test : longueur, répétitions et lisibilité sont contrôlées séparément."""
+    gate = CriticGate(min_words=20, max_words=60)
+    assert gate.evaluate(CLEAN).passed
+    assert gate.evaluate("Too short.").reasons == ["too_short"]
+    assert "repetitive" in gate.evaluate(CLEAN + " " + CLEAN).reasons
+    dense = ("Institutional interdisciplinary considerations notwithstanding, "
+             "organizational implementation necessitates comprehensive infrastructural "
+             "reconceptualization, particularly regarding intergovernmental accountability "
+             "mechanisms and administrative decentralization.")
+    assert "hard_to_read" in gate.evaluate(dense).reasons
+
+
+@pytest.mark.asyncio
+async def test_clean_draft_skips_critic_and_refiner_calls():
+    """Test : un brouillon propre termine la boucle sans appel critique ni refiner."""
+    critic = Agent(model="gemini-2.5-flash", name="critic",
+                   instruction="Critique: {current_document}", output_key="criticism")
+    refiner = Agent(model="gemini-2.5-pro", name="refiner",
+                    instruction="Refine: {current_document}", output_key="current_document",
+                    tools=[FunctionTool(exit_loop)])
+    loop = LoopAgent(name="loop", max_iterations=5, sub_agents=[critic, refiner])
+    gate = install_critic_gate(critic, refiner, CriticGate())
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=SequentialAgent(name="pipeline", sub_agents=[loop]),
+                    app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s",
+                                         state={"current_document": CLEAN})
+    calls_before = sum(CALL_COUNTS.values())
+    content = types.Content(role="user", parts=[types.Part(text="Polish the story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert sum(CALL_COUNTS.values()) == calls_before
+    assert session.state["criticism"] == "No major issues found."
+    assert session.state[GATE_KEY]["critic_skipped"] == 1
+    assert session.state[GATE_KEY]["refiner_skipped"] == 1
+    assert (gate.stats.checked, gate.stats.critic_skipped) == (1, 1)
@@ -0,0 +1,137 @@
+"""Tests pour le cache des appels modèle."""
+
+import pytest
+from google.adk.agents import Agent
+from google.adk.models import LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent import model_cache
+from src.loop_agent.fake_llm import CALL_COUNTS
+from src.loop_agent.model_cache import (
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    ModelCallCache,
+    install_model_cache,
+    request_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_installed_cache(monkeypatch):
+    """``install_model_cache`` retient le dernier cache installé : pas de fuite entre tests."""
+    monkeypatch.setattr(model_cache, "_installed", None)
+
+
+def make_request(text: str, instruction: str = "Check the tone.") -> LlmRequest:
+    return LlmRequest(
+        model="gemini-2.5-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(system_instruction=instruction, temperature=0.2),
+    )
+
+
+def test_request_key_exact_and_normalized():
+    """Test de la clé canonique (normalisation des espaces optionnelle)."""
+    base = make_request("Hello   world\n")
+    spaced = make_request("Hello world")
+    assert request_key(base) == request_key(spaced)
+    assert request_key(base, normalize=False) != request_key(spaced, normalize=False)
+    assert request_key(base) != request_key(make_request("Hello world", "Check the grammar."))
+
+
+def test_memory_backend_evicts_by_size():
+    """Test de l'éviction LRU par taille du backend mémoire."""
+    backend = MemoryCacheBackend(max_bytes=25)
+    backend.set("a", "x" * 10)
+    backend.set("b", "y" * 10)
+    assert backend.get("a") == "x" * 10  # "a" devient le plus récent
+    backend.set("c", "z" * 10)
+    assert backend.get("b") is None
+    assert backend.get("a") and backend.get("c")
+    assert backend.size == 20 and backend.evictions == 1
+
+
+def test_disk_backend_persists_and_evicts(tmp_path):
+    """Test de la persistance et de l'éviction du backend disque."""
+    backend = DiskCacheBackend(tmp_path, max_bytes=25)
+    backend.set("a", "x" * 10)
+    assert DiskCacheBackend(tmp_path).get("a") == "x" * 10
+
+    backend.set("b", "y" * 10)
+    backend.set("c", "z" * 10)
+    assert backend.evictions == 1
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+async def run_twice(agent):
+    session_service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="agents", session_service=session_service)
+    responses = []
+    for session_id in ("s1", "s2"):
+        await session_service.create_session(
+            app_name="agents", user_id="u", session_id=session_id
+        )
+        content = types.Content(role="user", parts=[types.Part(text="Check this  sentence.")])
+        async for event in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+            if event.is_final_response():
+                responses.append(event.content.parts[0].text)
+    return responses
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_model_call():
+    """Test : une requête identique est servie sans appel au modèle."""
+    agent = Agent(model="gemini-2.5-flash", name="GrammarCheck",
+                  instruction="Check the grammar of the text.")
+    cache = install_model_cache(agent, ModelCallCache())
+
+    calls_before = CALL_COUNTS["gemini-2.5-flash"]
+    first, second = await run_twice(agent)
+
+    assert first == second
+    assert CALL_COUNTS["gemini-2.5-flash"] - calls_before == 1
+    assert cache.report()["GrammarCheck"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_cache_only_selected_agents():
+    """Test : les agents non listés ne passent pas par le cache."""
+    agent = Agent(model="gemini-2.5-flash", name="writer", instruction="Write freely.")
+    cache = install_model_cache(agent, ModelCallCache(agents={"GrammarCheck"}))
+
+    calls_before = CALL_COUNTS["gemini-2.5-flash"]
+    await run_twice(agent)
+    assert CALL_COUNTS["gemini-2.5-flash"] - calls_before == 2
+    assert cache.report() == {}
+
+
+def test_disabled_without_configuration(monkeypatch):
+    """Test : sans MODEL_CACHE, rien n'est installé."""
+    monkeypatch.delenv("MODEL_CACHE", raising=False)
+    agent = Agent(model="gemini-2.5-flash", name="writer", instruction="Write.")
+    assert install_model_cache(agent) is None
+    assert agent.before_model_callback is None
+
+
+@pytest.mark.asyncio
+async def test_installed_on_root_agent(root_agent):
+    """Test : la même demande dans une nouvelle session ne rappelle aucun modèle."""
+    cache = install_model_cache(root_agent, ModelCallCache())
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="agents", session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="Generate and refine a story")])
+    calls = []
+    for session_id in ("first", "second"):
+        await session_service.create_session(app_name="agents", user_id="u",
+                                             session_id=session_id,
+                                             state={"topic": "A robot learning to paint"})
+        before = sum(CALL_COUNTS.values())
+        async for _ in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+            pass
+        calls.append(sum(CALL_COUNTS.values()) - before)
+
+    assert calls[0] > 0 and calls[1] == 0
+    assert sum(stats["hits"] for stats in cache.report().values()) > 0
@@ -0,0 +1,115 @@
+"""Tests pour le refiner en mode correctif."""
+
+import json
+
+import pytest
+from google.adk.agents import Agent, LoopAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.loop_agent.patching import (
+    PATCH_KEY,
+    PatchError,
+    PatchRefiner,
+    apply_patch,
+    parse_patch,
+    split_sentences,
+)
+
+DRAFT = "A robot found a brush. It painted the sky grey. Nobody noticed."
+
+
+class ScriptedLlm(BaseLlm):
+    """Modèle de test : renvoie les textes de ``replies`` dans l'ordre (le dernier ensuite)."""
+
+    replies: list
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        text = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def test_apply_patch_operations_and_validation():
+    """Test : remplacement, insertion, suppression ; numéros invalides rejetés."""
+    operations = parse_patch(json.dumps({"operations": [
+        {"op": "replace", "sentence": 2, "text": "It painted the sky gold."},
+        {"op": "insert_after", "sentence": 0, "text": "Morning came."},
+        {"op": "delete", "sentence": 3},
+    ]}))
+    assert apply_patch(DRAFT, operations) == \
+        "Morning came. A robot found a brush. It painted the sky gold."
+    assert apply_patch(DRAFT, parse_patch('```json\n{"operations": []}\n```')) == DRAFT
+
+    for bad in ("Here is the refined story.",
+                '{"operations": [{"op": "rewrite", "sentence": 1, "text": "x"}]}',
+                '{"operations": [{"op": "replace", "sentence": 1}]}'):
+        with pytest.raises(PatchError):
+            parse_patch(bad)
+    with pytest.raises(PatchError):
+        apply_patch(DRAFT, [{"op": "replace", "sentence": 7, "text": "x"}])
+    with pytest.raises(PatchError):
+        apply_patch(DRAFT, [{"op": "delete", "sentence": 1}, {"op": "replace", "sentence": 1,
+                                                             "text": "x"}])
+
+
+def test_apply_patch_keeps_paragraph_breaks():
+    """Test : titres et paragraphes conservés autour des phrases modifiées."""
+    document = "# Title\n\nFirst para one. Two.\n\nSecond para three."
+    assert split_sentences(document) == ["# Title", "First para one.", "Two.",
+                                         "Second para three."]
+    assert apply_patch(document, [{"op": "replace", "sentence": 3, "text": "TWO."}]) == \
+        "# Title\n\nFirst para one. TWO.\n\nSecond para three."
+    # Dernière phrase d'un paragraphe supprimée : la coupure reste
+    assert apply_patch(document, [{"op": "delete", "sentence": 3}]) == \
+        "# Title\n\nFirst para one.\n\nSecond para three."
+    # Insertion en fin de paragraphe : avant la coupure
+    assert apply_patch(document, [{"op": "insert_after", "sentence": 3, "text": "Added."}]) == \
+        "# Title\n\nFirst para one. Two. Added.\n\nSecond para three."
+
+
+async def run_refinement(patch_reply: str):
+    full_llm = ScriptedLlm(model="full-model", replies=["A fully rewritten story."])
+    patch_llm = ScriptedLlm(model="patch-model", replies=[patch_reply])
+    critic = Agent(model=ScriptedLlm(model="critic-model", replies=["Use a warmer colour."]),
+                   name="critic", instruction="Critique: {current_document}",
+                   output_key="criticism")
+    refiner = Agent(model=full_llm, name="refiner",
+                    instruction="Refine: {current_document}", output_key="current_document")
+    patch_refiner = PatchRefiner(refiner, completion_phrase=None)
+    patch_refiner.patch_agent.model = patch_llm
+    loop = LoopAgent(name="loop", max_iterations=1, sub_agents=[critic, patch_refiner])
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=SequentialAgent(name="pipeline", sub_agents=[loop]),
+                    app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s",
+                                         state={"current_document": DRAFT})
+    content = types.Content(role="user", parts=[types.Part(text="Polish the story")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    return session.state, full_llm.calls
+
+
+@pytest.mark.asyncio
+async def test_valid_patch_is_applied_without_full_regeneration():
+    """Test : un correctif valide met à jour le document sans appel au refiner complet."""
+    patch = '{"operations": [{"op": "replace", "sentence": 2, "text": "It painted the sky gold."}]}'
+    state, full_calls = await run_refinement(patch)
+    assert full_calls == 0
+    assert state["current_document"] == \
+        "A robot found a brush. It painted the sky gold. Nobody noticed."
+    assert (state[PATCH_KEY]["patched"], state[PATCH_KEY]["operations"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_invalid_patch_falls_back_to_full_regeneration():
+    """Test : un correctif invalide déclenche la régénération complète."""
+    state, full_calls = await run_refinement("Sure! Here is a better story.")
+    assert full_calls == 1
+    assert state["current_document"] == "A fully rewritten story."
+    assert state[PATCH_KEY]["fallbacks"] == 1
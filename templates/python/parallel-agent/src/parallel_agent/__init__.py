@@ -1,3 +1,10 @@
 """Package parallel_agent - Agents parallèles avec fusion."""
 
+import os
+
 __version__ = "1.0.0"
+
+# Backend LLM local (tests, benchmarks, exécution hors-ligne)
+if os.getenv("ADK_FAKE_LLM", "").lower() in ("1", "true", "yes"):
+    from .fake_llm import install_fake_llm
+    install_fake_llm()
@@ -1,23 +1,117 @@
-"""Pipeline parallèle : Recherche parallèle → Fusion."""
-
-from google.adk.agents import Agent, ParallelAgent, SequentialAgent
-from .sub_agents import (
-    researcher_1,
-    researcher_2,
-    researcher_3,
-    merger_agent
-)
-
-# Créer le groupe de recherche parallèle
-parallel_research = ParallelAgent(
-    name="parallel_research",
-    description="Exécute plusieurs recherches en parallèle",
-    sub_agents=[researcher_1, researcher_2, researcher_3]
-)
-
-# Pipeline : Recherche parallèle puis fusion
-root_agent = SequentialAgent(
-    name="research_and_synthesis",
-    description="Recherche parallèle suivie de synthèse",
-    sub_agents=[parallel_research, merger_agent]
-)
+"""Pipeline parallèle : Recherche parallèle → Fusion.
+
+``root_agent`` (et ``parallel_research``) sont construits au premier accès
+(PEP 562) : importer ce module ne charge pas ADK et ne crée pas les sous-agents.
+
+Les sujets de recherche viennent de ``RESEARCH_TOPICS_FILE`` s'il est défini,
+sinon des trois sujets par défaut ; ``build_pipeline`` construit un pipeline
+pour n'importe quelle liste de sujets.
+"""
+
+import os
+import threading
+
+_lock = threading.Lock()
+_root_agent = None
+
+
+def assemble_pipeline(researchers, merger):
+    """Relier chercheurs et fusion, puis installer les optimisations."""
+    from google.adk.agents import ParallelAgent, SequentialAgent
+    from .compaction import install_history_compaction
+    from .model_cache import get_model_cache, install_model_cache
+    from .model_router import install_model_router
+    from .research_cache import install_research_cache
+    from .scheduler import install_scheduler
+    from .stragglers import install_straggler_cutoff
+
+    incremental = os.getenv("PARALLEL_SYNTHESIS", "").lower() == "incremental"
+    parallel_class = ParallelAgent
+    if not incremental and os.getenv("PARALLEL_BRANCH_STATE", "").lower() == "cow":
+        # État isolé par branche, deltas appliqués en une fois à la jonction
+        from .branch_state import CopyOnWriteParallelAgent
+        parallel_class = CopyOnWriteParallelAgent
+
+    # Créer le groupe de recherche parallèle
+    parallel_research = parallel_class(
+        name="parallel_research",
+        description="Exécute plusieurs recherches en parallèle",
+        sub_agents=list(researchers)
+    )
+
+    if incremental:
+        # Fusion dès le premier résultat, mise à jour à chaque nouveau résultat
+        from .incremental import IncrementalSynthesisAgent
+
+        root_agent = IncrementalSynthesisAgent(
+            name="research_and_synthesis",
+            parallel_research=parallel_research,
+            merger=merger
+        )
+    else:
+        # Pipeline : Recherche parallèle puis fusion, avec compression des
+        # résultats entre les deux (désactivée sans MERGE_BRANCH_TOKENS)
+        from .merge_compression import ResultCompressor
+
+        compressor = ResultCompressor.from_env(
+            [researcher.output_key for researcher in researchers if researcher.output_key]
+        )
+        root_agent = SequentialAgent(
+            name="research_and_synthesis",
+            description="Recherche parallèle suivie de synthèse",
+            sub_agents=[parallel_research, *([compressor] if compressor else []), merger]
+        )
+
+    # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+    install_history_compaction(root_agent)
+    # Cache des appels modèle (désactivé sans MODEL_CACHE), partagé entre pipelines
+    install_model_cache(root_agent, get_model_cache())
+    # Appels modèle bornés par modèle, files équitables (MODEL_CONCURRENCY)
+    install_scheduler(root_agent)
+    # Flash ou pro choisi à chaque appel (désactivé sans MODEL_ROUTER), après le
+    # scheduler : chaque modèle cible prend un slot de son propre nom
+    install_model_router(root_agent)
+    # Délai par branche et requêtes de secours (BRANCH_DEADLINE_S)
+    install_straggler_cutoff(parallel_research)
+    # Résultats des chercheurs réutilisés entre sessions (désactivé sans RESEARCH_CACHE)
+    install_research_cache(parallel_research)
+    return root_agent
+
+
+def build_pipeline(topics):
+    """Nouveau pipeline avec un chercheur par sujet (libellés, dicts ou ``Topic``)."""
+    from .topics import build_merger, build_researchers, parse_topics
+
+    topics = parse_topics(topics)
+    return assemble_pipeline(build_researchers(topics), build_merger(topics))
+
+
+def build_root_agent():
+    """Construire le pipeline une seule fois (imports ADK différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            if os.getenv("RESEARCH_TOPICS_FILE"):
+                from .topics import configured_topics
+
+                _root_agent = build_pipeline(configured_topics())
+            else:
+                from .sub_agents import (
+                    researcher_1,
+                    researcher_2,
+                    researcher_3,
+                    merger_agent
+                )
+
+                _root_agent = assemble_pipeline(
+                    [researcher_1, researcher_2, researcher_3], merger_agent
+                )
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    if name == "parallel_research":
+        return build_root_agent().sub_agents[0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,152 @@
+"""État copy-on-write par branche pour la recherche parallèle.
+
+Avec ``ParallelAgent``, toutes les branches écrivent dans le même
+``session.state`` et chaque ``state_delta`` est appliqué (et persisté) au fil
+des événements, pendant que les autres branches tournent.
+``CopyOnWriteParallelAgent`` isole les branches :
+
+- chaque branche lit une vue ``ChainMap`` de l'état : ses propres écritures
+  dans une couche locale, le reste lu dans l'état de la session, sans copie
+- les ``state_delta`` des événements de branche sont retirés avant d'être
+  transmis au Runner (les événements restent dans l'historique) et gardés par
+  branche
+- à la jonction, un seul événement applique les deltas fusionnés, avant que
+  ``synthesis_agent`` ne s'exécute
+
+Fusion à la jonction, dans l'ordre des branches : la dernière branche l'emporte
+sur une même clé, sauf pour les valeurs ``dict`` modifiées par plusieurs
+branches (ex. ``history_summary``, un résumé par agent), fusionnées clé par clé.
+
+Activé par ``PARALLEL_BRANCH_STATE=cow`` (mode de synthèse séquentiel
+uniquement : la synthèse incrémentale lit les résultats dès leur arrivée).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncGenerator
+
+from google.adk.agents import ParallelAgent
+from google.adk.events import Event, EventActions
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+    from google.adk.agents.invocation_context import InvocationContext
+
+
+@dataclass
+class BranchStateStats:
+    """Compteurs des écritures d'état différées."""
+
+    deferred_deltas: int = 0
+    deferred_keys: int = 0
+    commits: int = 0
+    conflicts: int = 0
+
+
+# Compteurs pour tout le processus
+BRANCH_STATE_STATS = BranchStateStats()
+
+
+def branch_context(ctx: InvocationContext, parent: BaseAgent, sub_agent: BaseAgent):
+    """Contexte d'une branche : branche dédiée et vue copy-on-write de l'état."""
+    suffix = f"{parent.name}.{sub_agent.name}"
+    session = ctx.session.model_copy(update={"state": ChainMap({}, ctx.session.state)})
+    return ctx.model_copy(update={
+        "branch": f"{ctx.branch}.{suffix}" if ctx.branch else suffix,
+        "session": session,
+    })
+
+
+def merge_deltas(base: dict, deltas: list, stats: BranchStateStats = BRANCH_STATE_STATS) -> dict:
+    """Fusionner les deltas des branches (dans l'ordre des branches)."""
+    merged: dict = {}
+    writers: dict = {}
+    for delta in deltas:
+        for key, value in delta.items():
+            writers[key] = writers.get(key, 0) + 1
+            previous = merged.get(key)
+            if key in merged and isinstance(previous, dict) and isinstance(value, dict):
+                # Garder les sous-clés modifiées par chaque branche
+                original = base.get(key) if isinstance(base.get(key), dict) else {}
+                changed = {k: v for k, v in value.items() if original.get(k) != v}
+                merged[key] = {**previous, **changed}
+            else:
+                merged[key] = value
+    stats.conflicts += sum(1 for count in writers.values() if count > 1)
+    return merged
+
+
+class CopyOnWriteParallelAgent(ParallelAgent):
+    """``ParallelAgent`` dont les branches n'écrivent l'état qu'à la jonction."""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        if not self.sub_agents:
+            return
+
+        stats = BRANCH_STATE_STATS
+        queue: asyncio.Queue = asyncio.Queue()
+        views = []
+        deltas = [{} for _ in self.sub_agents]
+        names = {sub_agent.name for sub_agent in self.sub_agents}
+
+        async def pump(index: int, events: AsyncGenerator[Event, None]) -> None:
+            """Transmettre les événements d'une branche ; attendre leur traitement."""
+            try:
+                async for event in events:
+                    processed = asyncio.Event()
+                    await queue.put((index, event, processed))
+                    await processed.wait()
+            except Exception as error:
+                await queue.put((index, error, None))
+                return
+            await queue.put((index, None, None))
+
+        tasks = []
+        for index, sub_agent in enumerate(self.sub_agents):
+            sub_ctx = branch_context(ctx, self, sub_agent)
+            views.append(sub_ctx.session.state)
+            tasks.append(asyncio.create_task(pump(index, sub_agent.run_async(sub_ctx))))
+
+        running = len(tasks)
+        try:
+            while running:
+                index, item, processed = await queue.get()
+                if item is None:
+                    running -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                delta = item.actions.state_delta if item.actions else None
+                if delta and not item.partial:
+                    # Visible dans la branche tout de suite, dans la session à la jonction
+                    views[index].maps[0].update(delta)
+                    deltas[index].update(delta)
+                    stats.deferred_deltas += 1
+                    stats.deferred_keys += len(delta)
+                    item.actions.state_delta = {}
+
+                yield item  # Le Runner enregistre l'événement avant de reprendre ici
+                processed.set()
+                if item.actions and item.actions.escalate and item.author in names:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        merged = merge_deltas(ctx.session.state, deltas)
+        if merged:
+            stats.commits += 1
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta=merged),
+            )
@@ -0,0 +1,231 @@
+"""Compaction de l'historique des sessions longues.
+
+Chaque tour réutilise la même session : sans compaction, le prompt envoyé à
+Gemini contient tout l'historique et son coût croît avec la conversation.
+
+``HistoryCompactor`` s'installe en ``before_model_callback`` sur chaque
+``LlmAgent`` de l'arbre :
+
+- les ``keep_turns`` derniers tours sont envoyés tels quels
+- les tours plus anciens sont remplacés par un résumé glissant (extraits
+  question → réponse), conservé dans l'état de session (``history_summary``)
+  et borné à ``max_summary_tokens``
+- ``max_context_tokens`` plafonne le contexte : des tours récents passent dans
+  le résumé tant que le plafond est dépassé (le tour courant est toujours gardé)
+- les tokens économisés sont reportés par tour dans ``history_compaction``
+
+Configuration par variables d'environnement (désactivé sans
+``HISTORY_KEEP_TURNS``) : ``HISTORY_KEEP_TURNS``, ``HISTORY_MAX_CONTEXT_TOKENS``,
+``HISTORY_MAX_SUMMARY_TOKENS``.
+"""
+
+import json
+import logging
+import os
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY = "history_summary"
+STATS_KEY = "history_compaction"
+
+# Messages d'autres agents, présentés par ADK comme contenu utilisateur
+_OTHER_AGENT_PREFIX = "For context:"
+_SUMMARY_HEADER = "Summary of the earlier conversation (older turns were compacted):"
+
+
+def estimate_tokens(contents: list) -> int:
+    """Estimation du nombre de tokens (≈ 4 caractères par token)."""
+    chars = 0
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(json.dumps(part.function_call.args or {})) + len(part.function_call.name or "")
+            elif part.function_response:
+                chars += len(json.dumps(part.function_response.response or {}, default=str))
+    return chars // 4
+
+
+def _text(content: types.Content) -> str:
+    return " ".join(part.text for part in content.parts or [] if part.text).strip()
+
+
+def _is_user_turn(content: types.Content) -> bool:
+    """Début de tour : message utilisateur (ni réponse d'outil, ni autre agent)."""
+    if content.role != "user" or not content.parts:
+        return False
+    if any(part.function_response for part in content.parts):
+        return False
+    text = _text(content)
+    return bool(text) and not text.startswith(_OTHER_AGENT_PREFIX)
+
+
+def _excerpt(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class HistoryCompactor:
+    """``before_model_callback`` qui remplace les anciens tours par un résumé.
+
+    Args:
+        keep_turns: Tours récents envoyés tels quels (tour courant inclus)
+        max_context_tokens: Plafond du contexte (None = pas de plafond)
+        max_summary_tokens: Taille maximale du résumé glissant
+        excerpt_chars: Longueur des extraits question / réponse par tour
+    """
+
+    def __init__(
+        self,
+        keep_turns: int = 6,
+        max_context_tokens: Optional[int] = None,
+        max_summary_tokens: int = 800,
+        excerpt_chars: int = 240,
+    ):
+        self.keep_turns = max(1, keep_turns)
+        self.max_context_tokens = max_context_tokens
+        self.max_summary_tokens = max_summary_tokens
+        self.excerpt_chars = excerpt_chars
+        self.tokens_saved_total = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["HistoryCompactor"]:
+        """Compacteur configuré par l'environnement, None si désactivé."""
+        keep_turns = int(os.getenv("HISTORY_KEEP_TURNS", "0") or 0)
+        if keep_turns <= 0:
+            return None
+        max_context = int(os.getenv("HISTORY_MAX_CONTEXT_TOKENS", "0") or 0)
+        return cls(
+            keep_turns=keep_turns,
+            max_context_tokens=max_context or None,
+            max_summary_tokens=int(os.getenv("HISTORY_MAX_SUMMARY_TOKENS", "800")),
+        )
+
+    def summarize_turn(self, turn: list) -> str:
+        """Une ligne de résumé : question de l'utilisateur → dernière réponse texte."""
+        question = _excerpt(_text(turn[0]), self.excerpt_chars)
+        answers = [_text(c) for c in turn[1:] if c.role == "model" and _text(c)]
+        answer = _excerpt(answers[-1], self.excerpt_chars) if answers else "(no text answer)"
+        return f"- User: {question} → Assistant: {answer}"
+
+    def _trim_summary(self, lines: list) -> list:
+        """Garder les lignes les plus récentes dans ``max_summary_tokens``."""
+        budget = self.max_summary_tokens * 4
+        kept, used = [], 0
+        for line in reversed(lines):
+            if used + len(line) > budget:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        kept.reverse()
+        return kept
+
+    def __call__(self, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        contents = llm_request.contents
+        starts = [i for i, content in enumerate(contents) if _is_user_turn(content)]
+        if len(starts) <= 1:
+            return None
+
+        agent = callback_context.agent_name
+        summaries = dict(callback_context.state.get(SUMMARY_KEY) or {})
+        summary = summaries.get(agent, {"turns": 0, "lines": []})
+        tokens_before = estimate_tokens(contents)
+
+        # Résumer les tours sortis de la fenêtre (le tour courant n'est jamais résumé)
+        window = min(max(summary["turns"], len(starts) - self.keep_turns), len(starts) - 1)
+        lines = list(summary["lines"])
+        for index in range(summary["turns"], window):
+            lines.append(self.summarize_turn(contents[starts[index]:starts[index + 1]]))
+        lines = self._trim_summary(lines)
+        if window > summary["turns"]:
+            summaries[agent] = {"turns": window, "lines": lines}
+            callback_context.state[SUMMARY_KEY] = summaries
+
+        def build(compacted: int, lines: list) -> list:
+            recent = contents[starts[compacted]:] if compacted else contents
+            if not lines:
+                return list(recent)
+            header = types.Content(
+                role="user", parts=[types.Part(text="\n".join([_SUMMARY_HEADER, *lines]))]
+            )
+            return [header, *recent]
+
+        compacted = window
+        compacted_contents = build(compacted, lines)
+
+        # Plafond de contexte : résumer des tours récents supplémentaires, pour
+        # cet appel seulement (le résumé persistant suit ``keep_turns``)
+        while (self.max_context_tokens and compacted < len(starts) - 1
+               and estimate_tokens(compacted_contents) > self.max_context_tokens):
+            lines = self._trim_summary(
+                [*lines, self.summarize_turn(contents[starts[compacted]:starts[compacted + 1]])]
+            )
+            compacted += 1
+            compacted_contents = build(compacted, lines)
+
+        if not compacted:
+            return None
+
+        llm_request.contents = compacted_contents
+        tokens_after = estimate_tokens(compacted_contents)
+        saved = tokens_before - tokens_after
+        self.tokens_saved_total += saved
+
+        # Rapport par tour (cumulé sur les appels modèle de l'invocation)
+        stats = dict(callback_context.state.get(STATS_KEY) or {})
+        if stats.get("invocation_id") != callback_context.invocation_id:
+            stats = {"invocation_id": callback_context.invocation_id,
+                     "tokens_before": 0, "tokens_after": 0, "tokens_saved": 0}
+        stats["tokens_before"] += tokens_before
+        stats["tokens_after"] += tokens_after
+        stats["tokens_saved"] += saved
+        stats["summarized_turns"] = compacted
+        callback_context.state[STATS_KEY] = stats
+
+        logger.info("%s: historique compacté %d → %d tokens (%d tours résumés)",
+                    agent, tokens_before, tokens_after, compacted)
+        return None
+
+
+def install_history_compaction(agent, compactor: Optional[HistoryCompactor] = None):
+    """Ajouter ``compactor`` aux ``before_model_callback`` de l'arbre d'agents.
+
+    Sans ``compactor``, utilise ``HistoryCompactor.from_env()`` (rien n'est
+    installé si la compaction est désactivée). Renvoie le compacteur installé.
+    """
+    compactor = compactor or HistoryCompactor.from_env()
+    if compactor is None:
+        return None
+
+    def visit(node) -> None:
+        if hasattr(node, "before_model_callback"):
+            callbacks = node.before_model_callback
+            if callbacks is None:
+                callbacks = []
+            elif not isinstance(callbacks, list):
+                callbacks = [callbacks]
+            if compactor not in callbacks:
+                node.before_model_callback = [compactor, *callbacks]
+        for child in node.sub_agents:
+            visit(child)
+
+    visit(agent)
+    return compactor
+
+
+def compaction_report(events: list) -> Optional[str]:
+    """Résumé lisible du dernier rapport de compaction d'un tour, s'il existe."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and STATS_KEY in delta:
+            stats = delta[STATS_KEY]
+            return (f"🗜️  Historique compacté : {stats['tokens_before']} → "
+                    f"{stats['tokens_after']} tokens ({stats['tokens_saved']} économisés, "
+                    f"{stats['summarized_turns']} tours résumés)")
+    return None
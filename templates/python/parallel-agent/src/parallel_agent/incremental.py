@@ -0,0 +1,168 @@
+"""Synthèse incrémentale : la fusion démarre dès le premier résultat.
+
+Par défaut, ``synthesis_agent`` attend les trois ``*_result`` avant de
+commencer. En mode incrémental (``PARALLEL_SYNTHESIS=incremental``),
+``IncrementalSynthesisAgent`` exécute la recherche parallèle et la fusion
+simultanément :
+
+1. dès qu'un chercheur termine, un brouillon de rapport est produit à partir
+   des résultats disponibles (les autres sont signalés « en cours »)
+2. les résultats arrivés pendant un brouillon sont regroupés dans le suivant
+3. le dernier passage, avec tous les résultats, produit le rapport final
+
+Chaque brouillon est diffusé au client (``run.py --stream``) : le premier
+contenu utile arrive après le chercheur le plus rapide et non le plus lent,
+au prix d'appels supplémentaires au modèle de fusion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.events import Event, EventActions
+from typing_extensions import override
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+    from google.adk.agents.readonly_context import ReadonlyContext
+
+PROGRESS_KEY = "synthesis_progress"
+PENDING_TEXT = "(research still in progress)"
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def pending_aware_instruction(template: str) -> Callable[[ReadonlyContext], str]:
+    """Instruction de fusion tolérant les résultats pas encore disponibles.
+
+    Les ``{clé}`` absentes de l'état sont remplacées par ``PENDING_TEXT`` et le
+    modèle est prévenu qu'il rédige un rapport préliminaire.
+    """
+
+    def provider(context: ReadonlyContext) -> str:
+        state = context.state
+        pending = [key for key in _PLACEHOLDER_RE.findall(template) if key not in state]
+        text = _PLACEHOLDER_RE.sub(lambda m: str(state.get(m.group(1), PENDING_TEXT)), template)
+        if pending:
+            text += (
+                "\n\nSome research results are still in progress: write a short preliminary "
+                "report from the available results only. It will be updated when the "
+                "remaining results arrive."
+            )
+        return text
+
+    return provider
+
+
+def _output_keys(agent: BaseAgent) -> dict:
+    """Nom d'agent → ``output_key`` pour les ``LlmAgent`` de l'arbre."""
+    keys = {}
+    if isinstance(agent, LlmAgent) and agent.output_key:
+        keys[agent.name] = agent.output_key
+    for child in agent.sub_agents:
+        keys.update(_output_keys(child))
+    return keys
+
+
+class IncrementalSynthesisAgent(BaseAgent):
+    """Recherche parallèle et fusion incrémentale exécutées simultanément.
+
+    Le ``merger`` est cloné avec une instruction tolérant les résultats
+    manquants (voir ``pending_aware_instruction``) ; l'agent d'origine garde
+    la sienne.
+    """
+
+    def __init__(self, name: str, parallel_research: BaseAgent, merger: LlmAgent):
+        if isinstance(merger.instruction, str):
+            merger = merger.clone(
+                update={"instruction": pending_aware_instruction(merger.instruction)}
+            )
+
+        super().__init__(
+            name=name,
+            description="Recherche parallèle avec synthèse incrémentale",
+            sub_agents=[parallel_research, merger]
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_research', parallel_research)
+        object.__setattr__(self, '_merger', merger)
+        object.__setattr__(self, '_result_keys', _output_keys(parallel_research))
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        queue: asyncio.Queue = asyncio.Queue()
+        finished: set = set()
+        changed = asyncio.Event()
+        research_done = False
+        total = len(self._result_keys)
+
+        async def pump(source: str, events: AsyncGenerator[Event, None]) -> None:
+            """Transmettre les événements d'une source ; attendre leur traitement."""
+            try:
+                async for event in events:
+                    processed = asyncio.Event()
+                    await queue.put((source, event, processed))
+                    await processed.wait()
+            except Exception as error:
+                await queue.put((source, error, None))
+                return
+            await queue.put((source, None, None))
+
+        async def drafts() -> AsyncGenerator[Event, None]:
+            """Un passage de fusion par lot de nouveaux résultats."""
+            included = -1
+            while True:
+                await changed.wait()
+                changed.clear()
+                if len(finished) == included:
+                    if research_done:
+                        return
+                    continue
+                included = len(finished)
+                final = research_done or included == total
+                yield Event(
+                    invocation_id=ctx.invocation_id,
+                    author=self.name,
+                    branch=ctx.branch,
+                    actions=EventActions(state_delta={
+                        PROGRESS_KEY: {"results": included, "total": total, "final": final}
+                    }),
+                )
+                async for event in self._merger.run_async(ctx):
+                    yield event
+                if final:
+                    return
+
+        tasks = [
+            asyncio.create_task(pump("research", self._research.run_async(ctx))),
+            asyncio.create_task(pump("merger", drafts())),
+        ]
+        running = len(tasks)
+        try:
+            while running:
+                source, item, processed = await queue.get()
+                if item is None:
+                    running -= 1
+                    if source == "research":
+                        research_done = True
+                        changed.set()
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+
+                yield item  # Le Runner enregistre l'événement avant de reprendre ici
+                processed.set()
+
+                key = self._result_keys.get(item.author)
+                delta = item.actions.state_delta if item.actions else None
+                if source == "research" and key and delta and key in delta and not item.partial:
+                    finished.add(key)
+                    changed.set()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,256 @@
+"""Compression des résultats de recherche avant la fusion.
+
+``synthesis_agent`` tourne sur ``gemini-2.5-pro``, le modèle le plus lent et
+le plus cher du pipeline, et reçoit chaque ``*_result`` tel quel.
+``ResultCompressor`` s'exécute entre la recherche parallèle et la fusion :
+
+1. déduplication : une phrase déjà présente dans un résultat précédent (ou
+   presque identique, similarité des mots ≥ ``similarity``) est retirée
+2. budget par branche : un résultat qui dépasse ``branch_tokens`` est tronqué
+   à la dernière phrase entière (``overflow="truncate"``) ou résumé par le
+   modèle flash (``overflow="summarize"``, appels passés par le scheduler
+   comme ceux des agents) ; les résultats dans le budget ne sont pas modifiés
+3. les résultats compressés remplacent les ``*_result`` dans l'état, en un
+   seul événement, avec le rapport ``merge_compression`` (tokens avant /
+   après, par branche et au total)
+
+Les marqueurs ``[MISSING]`` (voir ``stragglers.py``) sont laissés tels quels.
+
+Configuration par variables d'environnement (désactivé sans
+``MERGE_BRANCH_TOKENS``) : ``MERGE_BRANCH_TOKENS``, ``MERGE_OVERFLOW``
+(``truncate`` ou ``summarize``), ``MERGE_DEDUP_SIMILARITY`` (défaut 0.8).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, Union
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.models import BaseLlm, LlmRequest
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+from typing_extensions import override
+
+from .scheduler import bind_session, schedule_llm
+from .stragglers import MISSING_MARKER
+
+if TYPE_CHECKING:
+    from google.adk.agents.invocation_context import InvocationContext
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "merge_compression"
+DUPLICATE_TEXT = "(no findings beyond the other research results)"
+_SUMMARIZER_INSTRUCTION = "Condense research findings without losing facts or figures."
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def count_tokens(text: str) -> int:
+    """Estimation du nombre de tokens (≈ 4 caractères par token, comme la compaction)."""
+    return len(text) // 4
+
+
+def split_sentences(text: str) -> list:
+    return [sentence for sentence in _SENTENCE_RE.split(text.strip()) if sentence]
+
+
+def _similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def deduplicate(results: dict, similarity: float = 0.8) -> tuple:
+    """Retirer les phrases déjà vues dans un résultat précédent (ou le même).
+
+    Renvoie ``(résultats dédupliqués, phrases retirées par clé)``.
+    """
+    seen: list = []
+    deduplicated = {}
+    removed = {}
+    for key, text in results.items():
+        kept = []
+        removed[key] = 0
+        for sentence in split_sentences(text):
+            words = frozenset(_WORD_RE.findall(sentence.lower()))
+            if any(words == other or _similarity(words, other) >= similarity for other in seen):
+                removed[key] += 1
+                continue
+            seen.append(words)
+            kept.append(sentence)
+        deduplicated[key] = " ".join(kept) if kept else DUPLICATE_TEXT
+    return deduplicated, removed
+
+
+def truncate(text: str, budget: int) -> str:
+    """Garder les premières phrases entières qui tiennent dans ``budget`` tokens."""
+    kept = []
+    for sentence in split_sentences(text):
+        if count_tokens(" ".join([*kept, sentence])) > budget:
+            break
+        kept.append(sentence)
+    if not kept:
+        # Première phrase trop longue : coupe au caractère près
+        return text[:budget * 4].rstrip() + "…"
+    return " ".join(kept)
+
+
+class ResultCompressor(BaseAgent):
+    """Étape de compression des ``*_result`` entre la recherche et la fusion.
+
+    Args:
+        name: Nom de l'agent
+        result_keys: Clés d'état des résultats, dans l'ordre des branches
+        branch_tokens: Budget de tokens par résultat
+        overflow: ``"truncate"`` ou ``"summarize"`` (modèle ``summarizer_model``)
+        summarizer_model: Nom du modèle de résumé, ou modèle déjà construit
+        similarity: Seuil de similarité des mots pour les phrases en double
+    """
+
+    def __init__(
+        self,
+        name: str,
+        result_keys: list,
+        branch_tokens: int,
+        overflow: str = "truncate",
+        summarizer_model: Union[str, BaseLlm] = "gemini-2.5-flash",
+        similarity: float = 0.8,
+    ):
+        if overflow not in ("truncate", "summarize"):
+            raise ValueError(f"overflow inconnu : {overflow!r}")
+        summarizer = None
+        if overflow == "summarize":
+            # Modèle appelé directement : le scheduler l'enveloppe explicitement
+            if isinstance(summarizer_model, str):
+                summarizer_model = LLMRegistry.new_llm(summarizer_model)
+            summarizer = schedule_llm(summarizer_model)
+
+        super().__init__(
+            name=name,
+            description="Déduplique et borne les résultats avant la fusion",
+        )
+
+        # Stocker les références avec préfixe _ pour éviter les problèmes Pydantic
+        object.__setattr__(self, '_result_keys', list(result_keys))
+        object.__setattr__(self, '_branch_tokens', branch_tokens)
+        object.__setattr__(self, '_threshold', similarity)
+        object.__setattr__(self, '_summarizer', summarizer)
+
+    @classmethod
+    def from_env(cls, result_keys: list, name: str = "result_compressor") -> Optional["ResultCompressor"]:
+        """Étape configurée par l'environnement, None si désactivée."""
+        branch_tokens = int(os.getenv("MERGE_BRANCH_TOKENS", "0") or 0)
+        if branch_tokens <= 0:
+            return None
+        return cls(
+            name=name,
+            result_keys=result_keys,
+            branch_tokens=branch_tokens,
+            overflow=os.getenv("MERGE_OVERFLOW", "truncate").lower(),
+            similarity=float(os.getenv("MERGE_DEDUP_SIMILARITY", "0.8")),
+        )
+
+    @property
+    def summarizer(self) -> Optional[BaseLlm]:
+        return self._summarizer
+
+    async def _summarize(self, text: str) -> str:
+        """Résumé par le modèle flash, tronqué si encore au-dessus du budget."""
+        words = self._branch_tokens * 3 // 4
+        request = LlmRequest(
+            model=self._summarizer.model,
+            contents=[types.Content(role="user", parts=[types.Part(
+                text=f"Summarize these findings in at most {words} words. "
+                     f"Keep every fact and figure. Output only the summary.\n\n{text}"
+            )])],
+            config=types.GenerateContentConfig(
+                system_instruction=_SUMMARIZER_INSTRUCTION,
+                max_output_tokens=self._branch_tokens,
+            ),
+        )
+        parts = []
+        try:
+            async for response in self._summarizer.generate_content_async(request):
+                if response.partial or not response.content:
+                    continue
+                parts.extend(part.text for part in response.content.parts or [] if part.text)
+        except Exception as error:
+            logger.warning("Résumé impossible, troncature : %s", error)
+            return truncate(text, self._branch_tokens)
+        summary = " ".join(parts).strip()
+        if not summary:
+            return truncate(text, self._branch_tokens)
+        return truncate(summary, self._branch_tokens)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        results = {
+            key: str(state[key]) for key in self._result_keys
+            if key in state and not str(state[key]).startswith(MISSING_MARKER)
+        }
+        if not results:
+            return
+
+        deduplicated, removed = deduplicate(results, self._threshold)
+        over_budget = [
+            key for key, text in deduplicated.items()
+            if count_tokens(text) > self._branch_tokens
+        ]
+        if self._summarizer is not None:
+            # Résumés dans la file équitable de la session (scheduler)
+            bind_session(ctx.session.id)
+            summaries = await asyncio.gather(*(self._summarize(deduplicated[key]) for key in over_budget))
+        else:
+            summaries = [truncate(deduplicated[key], self._branch_tokens) for key in over_budget]
+        compressed = {**deduplicated, **dict(zip(over_budget, summaries))}
+
+        branches = {}
+        for key, text in results.items():
+            action = "kept"
+            if key in over_budget:
+                action = "summarized" if self._summarizer is not None else "truncated"
+            elif removed[key]:
+                action = "deduplicated"
+            branches[key] = {
+                "tokens_before": count_tokens(text),
+                "tokens_after": count_tokens(compressed[key]),
+                "duplicate_sentences": removed[key],
+                "action": action,
+            }
+        tokens_before = sum(branch["tokens_before"] for branch in branches.values())
+        tokens_after = sum(branch["tokens_after"] for branch in branches.values())
+        delta = {key: text for key, text in compressed.items() if text != results[key]}
+        delta[STATS_KEY] = {
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+            "branch_tokens": self._branch_tokens,
+            "branches": branches,
+        }
+        logger.info("Résultats compressés avant fusion : %d → %d tokens", tokens_before, tokens_after)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=delta),
+        )
+
+
+def compression_report(events: list) -> Optional[str]:
+    """Résumé lisible de la compression avant fusion d'un tour, s'il existe."""
+    for event in reversed(events):
+        delta = event.actions.state_delta if event.actions else None
+        if delta and STATS_KEY in delta:
+            stats = delta[STATS_KEY]
+            return (f"✂️  Résultats compressés avant fusion : {stats['tokens_before']} → "
+                    f"{stats['tokens_after']} tokens ({stats['tokens_saved']} économisés)")
+    return None
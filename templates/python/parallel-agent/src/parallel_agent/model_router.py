@@ -0,0 +1,273 @@
+"""Routeur de modèles : flash ou pro choisi à chaque appel.
+
+``synthesis_agent`` est fixé sur ``gemini-2.5-pro`` pour tous ses appels,
+même quand quelques lignes de résultats suffiraient à flash. Pour les agents
+qui ont une politique (``RoutePolicy``), ``RoutedLlm`` remplace le modèle et
+choisit appel par appel :
+
+1. niveau de qualité ``high`` → pro ; ``draft`` → flash
+2. sinon, entrée estimée (instruction + historique) au-delà de
+   ``max_fast_tokens`` → pro, en deçà → flash
+3. quand la latence récente de pro (médiane des derniers appels) dépasse
+   ``latency_budget_ms``, le seuil est multiplié par ``slow_factor`` : plus
+   d'appels passent sur flash tant que pro est lent
+
+Le niveau de qualité d'une politique peut être remplacé pour une session par
+la clé d'état ``model_quality`` (``draft``, ``standard``, ``high``). Chaque
+décision est journalisée ; ``ModelRouter.report()`` donne par agent les
+appels flash / pro et la latence économisée (écart avec la médiane pro
+observée, estimée dès qu'un appel pro a été mesuré).
+
+Configuration par variables d'environnement (désactivé sans elles) :
+
+- ``MODEL_ROUTER=1`` : politiques par défaut (``DEFAULT_POLICIES``)
+- ``MODEL_ROUTER_POLICIES`` : fichier JSON ``{"agent": {"champ": valeur}}``
+  qui remplace les politiques par défaut
+"""
+
+import contextvars
+import json
+import logging
+import os
+import statistics
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+
+from .compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+QUALITY_KEY = "model_quality"
+QUALITY_TIERS = ("draft", "standard", "high")
+
+# Niveau de qualité demandé par la session (positionné par before_model_callback)
+_current_quality: contextvars.ContextVar = contextvars.ContextVar(
+    "router_quality", default=None
+)
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Politique de routage d'un agent entre un modèle rapide et un modèle fort."""
+
+    fast_model: str = "gemini-2.5-flash"
+    strong_model: str = "gemini-2.5-pro"
+    quality: str = "standard"
+    max_fast_tokens: int = 1500
+    latency_budget_ms: Optional[float] = None
+    slow_factor: float = 2.0
+
+    def __post_init__(self):
+        if self.quality not in QUALITY_TIERS:
+            raise ValueError(
+                f"Niveau de qualité invalide : {self.quality!r} ({', '.join(QUALITY_TIERS)})"
+            )
+        if self.max_fast_tokens < 0 or self.slow_factor < 1:
+            raise ValueError("max_fast_tokens doit être positif et slow_factor ≥ 1")
+
+    @classmethod
+    def from_value(cls, value) -> "RoutePolicy":
+        """Politique depuis un dict (fichier JSON) ou une ``RoutePolicy``."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict):
+            known = {f.name for f in fields(cls)}
+            unknown = set(value) - known
+            if unknown:
+                raise ValueError(f"Champs de politique inconnus : {', '.join(sorted(unknown))}")
+            return cls(**value)
+        raise ValueError(f"Politique invalide : {value!r}")
+
+    def decide(self, tokens: int, quality: Optional[str] = None,
+               strong_latency_ms: Optional[float] = None) -> tuple:
+        """(modèle, raison) pour une entrée de ``tokens`` tokens estimés."""
+        quality = quality if quality in QUALITY_TIERS else self.quality
+        if quality == "high":
+            return self.strong_model, "qualité high"
+        if quality == "draft":
+            return self.fast_model, "qualité draft"
+        limit = self.max_fast_tokens
+        slow = (
+            self.latency_budget_ms is not None
+            and strong_latency_ms is not None
+            and strong_latency_ms > self.latency_budget_ms
+        )
+        if slow:
+            limit = int(limit * self.slow_factor)
+        if tokens > limit:
+            return self.strong_model, f"entrée longue ({tokens} > {limit} tokens)"
+        reason = f"entrée courte ({tokens} ≤ {limit} tokens)"
+        if slow:
+            reason += f", {self.strong_model} lent ({strong_latency_ms:.0f} ms)"
+        return self.fast_model, reason
+
+
+# Agents fixés sur gemini-2.5-pro dans ce template
+DEFAULT_POLICIES = {
+    "synthesis_agent": RoutePolicy(max_fast_tokens=1500, latency_budget_ms=8000),
+}
+
+
+def request_tokens(llm_request: LlmRequest) -> int:
+    """Taille estimée de l'entrée : instruction système et historique."""
+    tokens = estimate_tokens(llm_request.contents)
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if isinstance(instruction, str):
+        tokens += len(instruction) // 4
+    elif instruction is not None and hasattr(instruction, "parts"):
+        tokens += estimate_tokens([instruction])
+    return tokens
+
+
+class ModelRouter:
+    """Décisions de routage, latences observées et compteurs par agent.
+
+    Args:
+        policies: Politique par nom d'agent
+        window: Appels récents retenus par modèle pour la médiane de latence
+    """
+
+    def __init__(self, policies: dict, window: int = 20):
+        self.policies = {name: RoutePolicy.from_value(p) for name, p in policies.items()}
+        self._latencies: dict = defaultdict(lambda: deque(maxlen=window))
+        self._stats: dict = defaultdict(lambda: {"fast": 0, "strong": 0, "saved_ms": 0.0})
+
+    @classmethod
+    def from_env(cls) -> Optional["ModelRouter"]:
+        """Routeur configuré par l'environnement, None si désactivé."""
+        path = os.getenv("MODEL_ROUTER_POLICIES")
+        if path:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError(f"{path} : objet {{agent: politique}} attendu")
+            return cls(data)
+        if os.getenv("MODEL_ROUTER", "").lower() in ("1", "true", "yes"):
+            return cls(DEFAULT_POLICIES)
+        return None
+
+    def recent_latency(self, model: str) -> Optional[float]:
+        """Médiane des latences récentes de ``model`` en ms (None sans mesure)."""
+        latencies = self._latencies.get(model)
+        return statistics.median(latencies) if latencies else None
+
+    def route(self, agent: str, tokens: int, quality: Optional[str] = None) -> str:
+        """Modèle choisi pour un appel de ``agent`` ; la décision est journalisée."""
+        policy = self.policies[agent]
+        model, reason = policy.decide(tokens, quality, self.recent_latency(policy.strong_model))
+        logger.info("Routeur %s → %s (%s)", agent, model, reason)
+        return model
+
+    def record(self, agent: str, model: str, latency_ms: float) -> None:
+        """Compter un appel terminé et mettre à jour les latences."""
+        policy = self.policies[agent]
+        stats = self._stats[agent]
+        if model == policy.strong_model:
+            stats["strong"] += 1
+        else:
+            stats["fast"] += 1
+            strong_ms = self.recent_latency(policy.strong_model)
+            if strong_ms is not None:
+                stats["saved_ms"] += max(strong_ms - latency_ms, 0.0)
+        self._latencies[model].append(latency_ms)
+
+    def report(self) -> dict:
+        """Appels flash / pro et latence économisée (ms) par agent."""
+        return {
+            agent: {**stats, "saved_ms": round(stats["saved_ms"], 1)}
+            for agent, stats in sorted(self._stats.items())
+        }
+
+
+class RoutedLlm(BaseLlm):
+    """Modèle qui délègue chaque appel au modèle choisi par le routeur."""
+
+    agent_name: str
+    targets: dict
+    router: Any
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        name = self.router.route(self.agent_name, request_tokens(llm_request),
+                                 _current_quality.get())
+        llm_request.model = name
+        start = time.perf_counter()
+        async for response in self.targets[name].generate_content_async(llm_request, stream=stream):
+            yield response
+        self.router.record(self.agent_name, name, (time.perf_counter() - start) * 1000)
+
+    def connect(self, llm_request: LlmRequest):
+        # Live : pas de décision par appel, modèle fort
+        return self.targets[self.router.policies[self.agent_name].strong_model].connect(
+            llm_request
+        )
+
+
+def _bind_quality(callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+    """Transmettre au routeur le niveau de qualité demandé par la session."""
+    _current_quality.set(callback_context.state.get(QUALITY_KEY))
+    return None
+
+
+def _target(current: BaseLlm, name: str) -> BaseLlm:
+    """Modèle ``name`` enveloppé comme ``current`` (ex. ``ScheduledLlm``)."""
+    if current.model == name:
+        return current
+    inner = getattr(current, "inner", None)
+    if isinstance(inner, BaseLlm):
+        return current.model_copy(update={"model": name, "inner": _target(inner, name)})
+    return LLMRegistry.new_llm(name)
+
+
+_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> Optional[ModelRouter]:
+    """Routeur du processus, créé depuis l'environnement (None si désactivé)."""
+    global _router
+    if _router is None:
+        _router = ModelRouter.from_env()
+    return _router
+
+
+def install_model_router(agent, router: Optional[ModelRouter] = None):
+    """Router les appels modèle des agents qui ont une politique.
+
+    À installer après ``install_scheduler`` : chaque modèle cible est
+    enveloppé comme le modèle d'origine et prend un slot de son propre nom.
+    Renvoie le routeur installé (None si désactivé).
+    """
+    router = router or get_model_router()
+    if router is None:
+        return None
+
+    def visit(node) -> None:
+        policy = router.policies.get(node.name)
+        if (policy is not None and hasattr(node, "canonical_model")
+                and not isinstance(node.model, RoutedLlm)):
+            current = node.canonical_model
+            node.model = RoutedLlm(
+                model=current.model,
+                agent_name=node.name,
+                targets={name: _target(current, name)
+                         for name in (policy.fast_model, policy.strong_model)},
+                router=router,
+            )
+            callbacks = node.before_model_callback
+            if callbacks is None:
+                callbacks = []
+            elif not isinstance(callbacks, list):
+                callbacks = [callbacks]
+            node.before_model_callback = [*callbacks, _bind_quality]
+        for child in node.sub_agents:
+            visit(child)
+
+    visit(agent)
+    return router
@@ -0,0 +1,191 @@
+"""Cache des résultats de recherche entre sessions, avec durée de validité.
+
+Les chercheurs ont des instructions fixes : leur réponse change peu dans la
+journée, mais chaque session les relance. ``ResearchCache`` garde le dernier
+résultat de chaque chercheur :
+
+- clé : (nom de l'agent, hash de l'instruction, modèle) ; le message de
+  l'utilisateur n'en fait pas partie
+- succès : ``before_model_callback`` renvoie la réponse enregistrée, ADK
+  l'écrit dans l'``output_key`` du chercheur sans appeler le modèle
+- un résultat plus vieux que ``ttl`` secondes est ignoré puis remplacé
+- les marqueurs ``[MISSING]`` (délai dépassé) ne sont jamais enregistrés
+
+Stockage : les backends de ``model_cache`` (disque par défaut, partagé entre
+processus et conservé entre deux lancements). ``warm_cache.py`` remplit le
+cache avant les heures de pointe.
+
+Configuration par variables d'environnement (désactivé sans
+``RESEARCH_CACHE``) : ``RESEARCH_CACHE`` (``disk`` ou ``memory``),
+``RESEARCH_CACHE_DIR``, ``RESEARCH_CACHE_TTL_H`` (défaut 24).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from .model_cache import CacheBackend, DiskCacheBackend, MemoryCacheBackend
+from .stragglers import MISSING_MARKER
+
+
+def research_key(agent_name: str, instruction: str, model: str) -> str:
+    """Clé d'un chercheur : nom, hash de l'instruction, modèle."""
+    instruction_hash = hashlib.sha256(instruction.encode("utf-8")).hexdigest()
+    payload = json.dumps([agent_name, instruction_hash, model])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ResearchCacheStats:
+    """Compteurs du cache pour un chercheur."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    stored: int = 0
+
+
+class ResearchCache:
+    """Callbacks modèle servant les chercheurs depuis un cache à durée limitée.
+
+    Args:
+        backend: Stockage des résultats (disque par défaut)
+        ttl: Durée de validité d'un résultat, en secondes
+        refresh: Ignorer les résultats enregistrés (préchauffage forcé)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 24 * 3600,
+        refresh: bool = False,
+    ):
+        self.backend = backend if backend is not None else DiskCacheBackend(".research_cache")
+        self.ttl = ttl
+        self.refresh = refresh
+        self.stats: defaultdict = defaultdict(ResearchCacheStats)
+        # (invocation, agent) → clé du résultat attendu, pour after_model
+        self._pending: dict = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["ResearchCache"]:
+        """Cache configuré par l'environnement, None si désactivé."""
+        kind = os.getenv("RESEARCH_CACHE", "").lower()
+        if kind not in ("disk", "memory"):
+            return None
+        if kind == "disk":
+            backend = DiskCacheBackend(os.getenv("RESEARCH_CACHE_DIR", ".research_cache"))
+        else:
+            backend = MemoryCacheBackend()
+        return cls(backend, ttl=float(os.getenv("RESEARCH_CACHE_TTL_H", "24")) * 3600)
+
+    def lookup(self, key: str, agent: Optional[str] = None) -> Optional[dict]:
+        """Entrée encore valide pour ``key`` (None si absente ou expirée).
+
+        Avec ``agent``, une entrée expirée est comptée dans ses compteurs.
+        """
+        raw = self.backend.get(key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if time.time() - entry["created"] > self.ttl:
+            if agent is not None:
+                self.stats[agent].expired += 1
+            return None
+        return entry
+
+    def before_model(
+        self, key: str, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        agent = callback_context.agent_name
+        entry = None if self.refresh else self.lookup(key, agent)
+        if entry is not None:
+            self.stats[agent].hits += 1
+            return LlmResponse(content=types.Content(
+                role="model", parts=[types.Part(text=entry["text"])]
+            ))
+
+        self.stats[agent].misses += 1
+        self._pending[(callback_context.invocation_id, agent)] = key
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        agent = callback_context.agent_name
+        key = self._pending.pop((callback_context.invocation_id, agent), None)
+        if key is None or llm_response.error_code or not llm_response.content:
+            return None
+        text = "".join(part.text for part in llm_response.content.parts or [] if part.text)
+        if not text or text.startswith(MISSING_MARKER):
+            return None
+        self.backend.set(key, json.dumps(
+            {"agent": agent, "text": text, "created": time.time()}, ensure_ascii=False
+        ))
+        self.stats[agent].stored += 1
+        return None
+
+    def report(self) -> dict:
+        """Compteurs par chercheur : ``{agent: {"hits", "misses", "expired", "stored"}}``."""
+        return {
+            agent: {"hits": s.hits, "misses": s.misses, "expired": s.expired, "stored": s.stored}
+            for agent, s in sorted(self.stats.items())
+        }
+
+
+_research_cache: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """Cache du processus, créé depuis l'environnement (None si désactivé)."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache.from_env()
+    return _research_cache
+
+
+def install_research_cache(parallel_agent, cache: Optional[ResearchCache] = None):
+    """Servir les chercheurs d'un ``ParallelAgent`` depuis le cache.
+
+    Seuls les ``LlmAgent`` avec ``output_key`` et instruction fixe (``str``)
+    sont concernés. Sans ``cache``, utilise ``get_research_cache()``.
+    Renvoie le cache installé (None si désactivé).
+    """
+    cache = cache or get_research_cache()
+    if cache is None:
+        return None
+
+    def visit(node) -> None:
+        if (getattr(node, "output_key", None) and isinstance(node.instruction, str)
+                and hasattr(node, "canonical_model")):
+            key = research_key(node.name, node.instruction, node.canonical_model.model)
+            before = node.before_model_callback
+            if before is None:
+                before = []
+            elif not isinstance(before, list):
+                before = [before]
+            after = node.after_model_callback
+            if after is None:
+                after = []
+            elif not isinstance(after, list):
+                after = [after]
+            # En premier : un succès évite aussi les autres callbacks (cache modèle...)
+            node.before_model_callback = [functools.partial(cache.before_model, key), *before]
+            node.after_model_callback = [cache.after_model, *after]
+        for child in node.sub_agents:
+            visit(child)
+
+    for branch in parallel_agent.sub_agents:
+        visit(branch)
+    return cache
@@ -0,0 +1,250 @@
+"""Ordonnanceur des appels modèle, partagé par tout le processus.
+
+Chaque ``ParallelAgent`` lance ses chercheurs en même temps : avec beaucoup de
+sessions simultanées, les appels Gemini arrivent en rafales et déclenchent
+des erreurs 429. ``ModelScheduler`` limite le nombre d'appels en vol par nom
+de modèle :
+
+- au-delà de la limite, les appels attendent dans une file par session,
+  servies à tour de rôle (une session avec beaucoup de branches ne bloque pas
+  les autres)
+- les agents prioritaires (``synthesis_agent`` par défaut), sensibles à la
+  latence, passent avant les autres files
+- métriques par modèle : appels en vol, profondeur de file (courante et
+  maximale), temps d'attente (moyenne, p95, max)
+
+Les agents passent par le scheduler via ``ScheduledLlm``, qui enveloppe leur
+modèle ; ``install_scheduler`` l'installe sur un arbre d'agents.
+
+Configuration par variables d'environnement (désactivé sans
+``MODEL_CONCURRENCY``) :
+
+- ``MODEL_CONCURRENCY`` : limite par défaut par modèle (ex. 8)
+- ``MODEL_CONCURRENCY_LIMITS`` : limites spécifiques,
+  ex. ``gemini-2.5-pro=2,gemini-2.5-flash=16``
+- ``MODEL_PRIORITY_AGENTS`` : agents prioritaires (défaut ``synthesis_agent``)
+"""
+
+import asyncio
+import contextvars
+import os
+import statistics
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+
+# Session de l'appel modèle en cours (positionnée par before_model_callback)
+_current_session: contextvars.ContextVar = contextvars.ContextVar(
+    "scheduler_session", default="-"
+)
+
+
+class _ModelQueue:
+    """Slots et files d'attente d'un modèle."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        # priorité → {session: deque[Future]} (ordre = tour de rôle)
+        self.waiting = {PRIORITY_HIGH: OrderedDict(), PRIORITY_NORMAL: OrderedDict()}
+        self.depth = 0
+        self.max_depth = 0
+        self.acquired = 0
+        self.waits: deque = deque(maxlen=1000)
+
+    def enqueue(self, priority: int, session: str, future: asyncio.Future) -> None:
+        self.waiting[priority].setdefault(session, deque()).append(future)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def discard(self, priority: int, session: str, future: asyncio.Future) -> None:
+        queue = self.waiting[priority].get(session)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            self.depth -= 1
+            if not queue:
+                del self.waiting[priority][session]
+
+    def next_waiter(self) -> Optional[asyncio.Future]:
+        """Prochaine attente servie : priorité d'abord, puis tour de rôle des sessions."""
+        for priority in (PRIORITY_HIGH, PRIORITY_NORMAL):
+            sessions = self.waiting[priority]
+            while sessions:
+                session, queue = sessions.popitem(last=False)
+                future = queue.popleft()
+                self.depth -= 1
+                if queue:
+                    sessions[session] = queue  # Fin du tour de rôle
+                if not future.done():
+                    return future
+        return None
+
+
+class ModelScheduler:
+    """Limite les appels modèle en vol par nom de modèle.
+
+    Args:
+        default_limit: Appels simultanés par modèle
+        limits: Limites spécifiques par nom de modèle
+    """
+
+    def __init__(self, default_limit: int = 8, limits: Optional[dict] = None):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._queues: dict = {}
+
+    def _queue(self, model: str) -> _ModelQueue:
+        if model not in self._queues:
+            self._queues[model] = _ModelQueue(self.limits.get(model, self.default_limit))
+        return self._queues[model]
+
+    @asynccontextmanager
+    async def slot(self, model: str, session: str = "-", priority: int = PRIORITY_NORMAL):
+        """Réserver un slot d'appel pour ``model`` pendant le bloc ``async with``."""
+        queue = self._queue(model)
+        start = time.perf_counter()
+        if queue.in_flight < queue.limit and queue.depth == 0:
+            queue.in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            queue.enqueue(priority, session, future)
+            try:
+                await future  # Le slot est transmis par release()
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self._release(queue)  # Slot reçu juste avant l'annulation
+                else:
+                    queue.discard(priority, session, future)
+                raise
+        queue.acquired += 1
+        queue.waits.append(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(queue)
+
+    def _release(self, queue: _ModelQueue) -> None:
+        future = queue.next_waiter()
+        if future is None:
+            queue.in_flight -= 1
+        else:
+            future.set_result(None)  # Slot transmis sans repasser par in_flight
+
+    def metrics(self) -> dict:
+        """Métriques par modèle (slots, files, temps d'attente en ms)."""
+        report = {}
+        for model, queue in sorted(self._queues.items()):
+            waits = sorted(queue.waits)
+            report[model] = {
+                "limit": queue.limit,
+                "in_flight": queue.in_flight,
+                "queue_depth": queue.depth,
+                "max_queue_depth": queue.max_depth,
+                "acquired": queue.acquired,
+                "wait_ms": {
+                    "mean": statistics.fmean(waits) * 1000 if waits else 0.0,
+                    "p95": waits[int(0.95 * (len(waits) - 1))] * 1000 if waits else 0.0,
+                    "max": waits[-1] * 1000 if waits else 0.0,
+                },
+            }
+        return report
+
+
+class ScheduledLlm(BaseLlm):
+    """Modèle qui attend un slot du scheduler avant de déléguer l'appel."""
+
+    inner: BaseLlm
+    scheduler: Any
+    priority: int = PRIORITY_NORMAL
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        async with self.scheduler.slot(self.model, _current_session.get(), self.priority):
+            async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                yield response
+
+    def connect(self, llm_request: LlmRequest):
+        return self.inner.connect(llm_request)
+
+
+def bind_session(session_id: str) -> None:
+    """Associer les appels modèle qui suivent (même tâche) à une session."""
+    _current_session.set(session_id)
+
+
+def _bind_session(callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+    """Associer l'appel modèle qui suit à la session (file d'attente équitable)."""
+    bind_session(callback_context.session.id)
+    return None
+
+
+_scheduler: Optional[ModelScheduler] = None
+
+
+def get_scheduler() -> Optional[ModelScheduler]:
+    """Scheduler du processus, créé depuis l'environnement (None si désactivé)."""
+    global _scheduler
+    if _scheduler is None:
+        default_limit = int(os.getenv("MODEL_CONCURRENCY", "0") or 0)
+        if default_limit <= 0:
+            return None
+        limits = {}
+        for item in os.getenv("MODEL_CONCURRENCY_LIMITS", "").split(","):
+            if "=" in item:
+                model, limit = item.split("=", 1)
+                limits[model.strip()] = int(limit)
+        _scheduler = ModelScheduler(default_limit, limits)
+    return _scheduler
+
+
+def schedule_llm(llm: BaseLlm, scheduler: Optional[ModelScheduler] = None,
+                 priority: int = PRIORITY_NORMAL) -> BaseLlm:
+    """Modèle appelé hors d'un ``LlmAgent`` (ex. résumé), passé par le scheduler.
+
+    Renvoie ``llm`` tel quel si le scheduler est désactivé.
+    """
+    scheduler = scheduler or get_scheduler()
+    if scheduler is None or isinstance(llm, ScheduledLlm):
+        return llm
+    return ScheduledLlm(model=llm.model, inner=llm, scheduler=scheduler, priority=priority)
+
+
+def install_scheduler(agent, scheduler: Optional[ModelScheduler] = None,
+                      priority_agents: Optional[set] = None):
+    """Faire passer les appels modèle de l'arbre d'agents par le scheduler.
+
+    Renvoie le scheduler installé (None si désactivé).
+    """
+    scheduler = scheduler or get_scheduler()
+    if scheduler is None:
+        return None
+    if priority_agents is None:
+        names = os.getenv("MODEL_PRIORITY_AGENTS", "synthesis_agent")
+        priority_agents = {name.strip() for name in names.split(",") if name.strip()}
+
+    def visit(node) -> None:
+        if hasattr(node, "canonical_model") and not isinstance(node.model, ScheduledLlm):
+            node.model = schedule_llm(
+                node.canonical_model,
+                scheduler,
+                PRIORITY_HIGH if node.name in priority_agents else PRIORITY_NORMAL,
+            )
+            callbacks = node.before_model_callback
+            if callbacks is None:
+                callbacks = []
+            elif not isinstance(callbacks, list):
+                callbacks = [callbacks]
+            node.before_model_callback = [*callbacks, _bind_session]
+        for child in node.sub_agents:
+            visit(child)
+
+    visit(agent)
+    return scheduler
@@ -0,0 +1,255 @@
+"""Délai maximal et requêtes de secours pour les branches parallèles.
+
+Le pipeline attend le plus lent des chercheurs avant la fusion : une branche
+lente fixe la latence de tout le tour. ``DeadlineLlm`` enveloppe le modèle de
+chaque chercheur :
+
+- le délai ``deadline`` court depuis le début de la branche et couvre tous
+  ses appels modèle (y compris après des appels d'outils) ; il porte sur le
+  premier chunk de chaque réponse, la suite est transmise au fil de l'eau
+  (``run.py --stream``, fusion incrémentale)
+- après ``hedge_after`` secondes sans premier chunk, une requête identique de
+  secours est lancée ; la première qui répond gagne, l'autre est annulée
+- délai dépassé, erreur du modèle ou d'un outil : la branche produit un
+  marqueur ``[MISSING] ...`` dans son ``output_key`` au lieu d'interrompre
+  ``ParallelAgent`` ; la fusion s'exécute avec les résultats disponibles et
+  signale les manquants
+
+Chaque branche attend ainsi au plus ``deadline`` son premier chunk : la
+latence d'un tour est bornée par ``deadline`` + la durée des flux en cours +
+la fusion.
+
+Configuration par variables d'environnement (désactivé sans
+``BRANCH_DEADLINE_S``) : ``BRANCH_DEADLINE_S``, ``BRANCH_HEDGE_AFTER_S``.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from .model_cache import NO_CACHE
+
+logger = logging.getLogger(__name__)
+
+MISSING_MARKER = "[MISSING]"
+
+
+@dataclass
+class BranchStats:
+    """Compteurs d'une branche parallèle."""
+
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    deadline_misses: int = 0
+    errors: int = 0
+
+
+# Compteurs par nom d'agent, pour tout le processus
+BRANCH_STATS: defaultdict = defaultdict(BranchStats)
+
+
+@dataclass
+class _BranchRun:
+    """Branche en cours : échéance (horloge de la boucle) et erreur d'outil."""
+
+    deadline_at: float
+    error: Optional[str] = None
+
+
+# Positionnée par before_agent_callback dans la tâche de chaque branche
+# (ParallelAgent exécute chaque branche dans sa propre tâche)
+_branch_run: contextvars.ContextVar = contextvars.ContextVar("branch_run", default=None)
+
+
+def missing_result(agent_name: str, reason: str) -> str:
+    """Texte du marqueur enregistré à la place d'un résultat manquant."""
+    return f"{MISSING_MARKER} {agent_name}: {reason}"
+
+
+class DeadlineLlm(BaseLlm):
+    """Modèle avec délai par branche et requête de secours optionnelle.
+
+    Hors d'une branche installée (``install_straggler_cutoff``), le délai
+    court depuis le début de l'appel.
+    """
+
+    inner: BaseLlm
+    agent_name: str
+    deadline: float
+    hedge_after: Optional[float] = None
+    stats: Any = None
+
+    @staticmethod
+    async def _first(responses) -> Optional[LlmResponse]:
+        """Premier chunk du flux (None si le modèle ne renvoie rien)."""
+        return await anext(responses, None)
+
+    def _marker(self, reason: str) -> LlmResponse:
+        """Réponse marqueur, jamais mise en cache."""
+        return LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=missing_result(self.agent_name, reason))]
+            ),
+            custom_metadata={NO_CACHE: True},
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        stats = self.stats if self.stats is not None else BRANCH_STATS[self.agent_name]
+        stats.calls += 1
+        loop = asyncio.get_running_loop()
+        run = _branch_run.get()
+        if run is not None and run.error is not None:
+            # Un outil de la branche a échoué : pas de nouvel appel
+            stats.errors += 1
+            yield self._marker(f"error: {run.error}")
+            return
+        deadline_at = run.deadline_at if run is not None else loop.time() + self.deadline
+        if loop.time() >= deadline_at:
+            # Échéance de la branche déjà passée (ex. après un outil lent)
+            stats.deadline_misses += 1
+            yield self._marker(f"no result within {self.deadline:.1f}s")
+            return
+        hedge_at = None
+        if self.hedge_after is not None and loop.time() + self.hedge_after < deadline_at:
+            hedge_at = loop.time() + self.hedge_after
+
+        # Tâche qui attend le premier chunk → flux de la requête
+        attempts: dict = {}
+
+        def launch() -> asyncio.Task:
+            responses = self.inner.generate_content_async(llm_request, stream=stream)
+            task = asyncio.create_task(self._first(responses))
+            attempts[task] = responses
+            return task
+
+        primary = launch()
+        winner = None
+        error = None
+        try:
+            while attempts and loop.time() < deadline_at:
+                wake_at = deadline_at if hedge_at is None else min(hedge_at, deadline_at)
+                done, _ = await asyncio.wait(
+                    list(attempts), timeout=max(0.0, wake_at - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    responses = attempts.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    winner = (task.result(), responses)
+                    if task is not primary:
+                        stats.hedge_wins += 1
+                    break
+                if winner is not None:
+                    break
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    hedge_at = None
+                    stats.hedged += 1
+                    launch()
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+            for responses in attempts.values():
+                await responses.aclose()
+
+        if winner is None:
+            if attempts or error is None:
+                stats.deadline_misses += 1
+                reason = f"no result within {self.deadline:.1f}s"
+            else:
+                stats.errors += 1
+                reason = f"error: {error}"
+                logger.warning("Branche %s en échec : %s", self.agent_name, error)
+            yield self._marker(reason)
+            return
+
+        # Premier chunk reçu à temps : le reste du flux passe tel quel
+        first, responses = winner
+        try:
+            if first is None:
+                return
+            yield first
+            async for response in responses:
+                yield response
+        except Exception as e:
+            stats.errors += 1
+            logger.warning("Branche %s en échec : %s", self.agent_name, e)
+            yield self._marker(f"error: {e}")
+        finally:
+            await responses.aclose()
+
+    def connect(self, llm_request: LlmRequest):
+        return self.inner.connect(llm_request)
+
+
+def _start_branch(deadline: float, callback_context: CallbackContext) -> None:
+    """Ouvrir l'échéance de la branche (une par exécution de la branche)."""
+    _branch_run.set(_BranchRun(asyncio.get_running_loop().time() + deadline))
+    return None
+
+
+def _record_tool_error(tool, args: dict, tool_context, error: Exception) -> Optional[dict]:
+    """Erreur d'outil dans une branche : l'appel modèle suivant produit le marqueur."""
+    run = _branch_run.get()
+    if run is None:
+        return None
+    run.error = f"{tool.name}: {error}"
+    logger.warning("Outil %s en échec dans une branche : %s", tool.name, error)
+    return {"status": "error", "error_message": str(error)}
+
+
+def _append_callback(agent, attribute: str, callback) -> None:
+    callbacks = getattr(agent, attribute)
+    if callbacks is None:
+        callbacks = []
+    elif not isinstance(callbacks, list):
+        callbacks = [callbacks]
+    setattr(agent, attribute, [*callbacks, callback])
+
+
+def install_straggler_cutoff(parallel_agent, deadline: Optional[float] = None,
+                             hedge_after: Optional[float] = None) -> bool:
+    """Appliquer délai et requêtes de secours aux branches d'un ``ParallelAgent``.
+
+    Sans ``deadline``, lit ``BRANCH_DEADLINE_S`` / ``BRANCH_HEDGE_AFTER_S`` ;
+    renvoie False si rien n'est installé.
+    """
+    if deadline is None:
+        deadline = float(os.getenv("BRANCH_DEADLINE_S", "0") or 0)
+        hedge_after = float(os.getenv("BRANCH_HEDGE_AFTER_S", "0") or 0) or None
+    if deadline <= 0:
+        return False
+
+    def visit(node) -> None:
+        if hasattr(node, "canonical_model") and not isinstance(node.model, DeadlineLlm):
+            inner = node.canonical_model
+            node.model = DeadlineLlm(
+                model=inner.model,
+                inner=inner,
+                agent_name=node.name,
+                deadline=deadline,
+                hedge_after=hedge_after,
+            )
+            _append_callback(node, "on_tool_error_callback", _record_tool_error)
+        for child in node.sub_agents:
+            visit(child)
+
+    for branch in parallel_agent.sub_agents:
+        _append_callback(branch, "before_agent_callback",
+                         functools.partial(_start_branch, deadline))
+        visit(branch)
+    return True
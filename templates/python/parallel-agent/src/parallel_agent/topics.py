@@ -0,0 +1,241 @@
+"""Sujets de recherche : un chercheur par sujet, fusion générée.
+
+Les chercheurs et l'instruction de fusion sont construits à partir d'une
+liste de sujets plutôt qu'écrits à la main :
+
+- chaque sujet produit un ``Agent`` chercheur (``<slug>_researcher``) et une
+  clé d'état (``<slug>_result``)
+- l'instruction de l'agent de fusion liste une ligne ``{clé}`` par sujet
+
+La liste vient de ``DEFAULT_TOPICS``, d'un fichier YAML ou JSON
+(``RESEARCH_TOPICS_FILE``) ou de la requête (champ ``topics`` du serveur) :
+
+.. code-block:: yaml
+
+    topics:
+      - Solid-State Batteries                 # libellé seul
+      - label: Green Hydrogen
+        focus: electrolyzer costs and storage
+
+Avec des dizaines de sujets, les chercheurs partent tous en même temps mais
+leurs appels modèle passent par ``ModelScheduler`` (``MODEL_CONCURRENCY``) :
+ils s'exécutent par lots de la taille de la limite, dans la file de la session.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+RESEARCHER_MODEL = "gemini-2.5-flash"
+MERGER_MODEL = "gemini-2.5-pro"
+
+_RESEARCHER_TEMPLATE = """You are a researcher specializing in {specialty}.
+
+Research topic: {subject}
+
+Your task:
+1. {task}
+2. Focus on {focus}
+3. Summarize key findings concisely (2-3 sentences)
+4. Output only the summary, no meta-commentary"""
+
+_MERGER_TEMPLATE = """You are a synthesis specialist.
+
+Your task:
+1. Review the research results from parallel researchers:
+{results}
+
+   A result starting with [MISSING] means that research did not finish in time:
+   say that this area is not covered and do not invent findings for it.
+
+2. Synthesize these findings into a coherent report
+
+3. Structure your response with:
+   - Introduction
+   - Key findings from each area
+   - Connections and relationships between findings
+   - Conclusion
+
+Be comprehensive but concise."""
+
+
+# Champs recopiés dans les instructions du chercheur et de la fusion
+_INSTRUCTION_FIELDS = ("label", "specialty", "subject", "task", "focus")
+
+
+def slugify(text: str) -> str:
+    """Identifiant ``snake_case`` utilisable comme clé d'état."""
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+@dataclass(frozen=True)
+class Topic:
+    """Un sujet de recherche ; seul ``label`` est obligatoire.
+
+    Les autres champs sont déduits du libellé s'ils sont absents.
+    """
+
+    label: str
+    specialty: Optional[str] = None
+    subject: Optional[str] = None
+    task: Optional[str] = None
+    focus: str = "the most significant recent developments"
+    key: Optional[str] = None
+    agent: Optional[str] = None
+    description: Optional[str] = None
+
+    def __post_init__(self):
+        slug = slugify(self.label)
+        if not slug:
+            raise ValueError(f"Libellé de sujet invalide : {self.label!r}")
+        specialty = self.specialty or self.label.lower()
+        defaults = {
+            "specialty": specialty,
+            "subject": self.label,
+            "task": f"Research the latest developments in {specialty}",
+            "key": f"{slug}_result",
+            "agent": f"{slug}_researcher",
+            "description": f"Recherche : {self.label}",
+        }
+        for name, value in defaults.items():
+            if getattr(self, name) is None:
+                object.__setattr__(self, name, value)
+        if not self.key.isidentifier() or not self.agent.isidentifier():
+            raise ValueError(f"Clé ou nom d'agent invalide pour {self.label!r}")
+        # ADK lit {...} dans une instruction comme une clé d'état à injecter
+        for name in _INSTRUCTION_FIELDS:
+            value = getattr(self, name)
+            if "{" in value or "}" in value:
+                raise ValueError(
+                    f"Accolades interdites dans le champ {name} du sujet {self.label!r}"
+                )
+
+    @classmethod
+    def from_value(cls, value) -> "Topic":
+        """Sujet depuis un libellé (``str``), un dict ou un ``Topic``."""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls(label=value)
+        if isinstance(value, dict):
+            known = {f.name for f in fields(cls)}
+            unknown = set(value) - known
+            if unknown:
+                raise ValueError(f"Champs de sujet inconnus : {', '.join(sorted(unknown))}")
+            return cls(**value)
+        raise ValueError(f"Sujet invalide : {value!r}")
+
+
+# Les trois sujets historiques du template (noms et clés inchangés)
+DEFAULT_TOPICS = (
+    Topic(
+        label="Renewable Energy",
+        subject="renewable energy sources and latest trends",
+        focus="solar, wind, and hydroelectric power",
+        description="Recherche sur les énergies renouvelables",
+    ),
+    Topic(
+        label="Electric Vehicles",
+        subject="electric vehicle technology and market trends",
+        task="Research the latest developments in EV technology",
+        focus="battery technology, charging infrastructure, and market adoption",
+        key="ev_technology_result",
+        agent="ev_researcher",
+        description="Recherche sur les véhicules électriques",
+    ),
+    Topic(
+        label="Carbon Capture",
+        subject="carbon capture and storage methods",
+        task="Research current carbon capture technologies",
+        focus="effectiveness, costs, and scalability",
+        description="Recherche sur la capture de carbone",
+    ),
+)
+
+
+def parse_topics(values) -> tuple:
+    """Valider une liste de sujets (libellés, dicts ou ``Topic``).
+
+    Lève ``ValueError`` si la liste est vide ou si deux sujets partagent une
+    clé d'état ou un nom d'agent.
+    """
+    topics = tuple(Topic.from_value(value) for value in values)
+    if not topics:
+        raise ValueError("Aucun sujet de recherche")
+    for attribute in ("key", "agent"):
+        seen = set()
+        for topic in topics:
+            value = getattr(topic, attribute)
+            if value in seen:
+                raise ValueError(f"Sujets en double ({attribute} = {value!r})")
+            seen.add(value)
+    return topics
+
+
+def load_topics(path) -> tuple:
+    """Lire les sujets d'un fichier YAML ou JSON.
+
+    Le fichier contient une liste de sujets, ou un objet avec une clé ``topics``.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(text)
+    else:
+        import yaml
+        data = yaml.safe_load(text)
+    if isinstance(data, dict):
+        data = data.get("topics")
+    if not isinstance(data, list):
+        raise ValueError(f"{path} : liste de sujets attendue")
+    return parse_topics(data)
+
+
+def configured_topics() -> tuple:
+    """Sujets de ``RESEARCH_TOPICS_FILE``, sinon ``DEFAULT_TOPICS``."""
+    path = os.getenv("RESEARCH_TOPICS_FILE")
+    return load_topics(path) if path else DEFAULT_TOPICS
+
+
+def researcher_instruction(topic: Topic) -> str:
+    return _RESEARCHER_TEMPLATE.format(
+        specialty=topic.specialty, subject=topic.subject, task=topic.task, focus=topic.focus
+    )
+
+
+def merger_instruction(topics) -> str:
+    """Instruction de fusion avec une ligne ``- Libellé: {clé}`` par sujet."""
+    results = "\n".join(f"   - {topic.label}: {{{topic.key}}}" for topic in topics)
+    return _MERGER_TEMPLATE.format(results=results)
+
+
+def build_researchers(topics, model: str = RESEARCHER_MODEL) -> list:
+    """Un ``Agent`` chercheur par sujet."""
+    from google.adk.agents import Agent
+
+    return [
+        Agent(
+            model=model,
+            name=topic.agent,
+            description=topic.description,
+            instruction=researcher_instruction(topic),
+            output_key=topic.key
+        )
+        for topic in topics
+    ]
+
+
+def build_merger(topics, model: str = MERGER_MODEL):
+    """Agent de fusion lisant les clés de résultat de tous les sujets."""
+    from google.adk.agents import Agent
+
+    return Agent(
+        model=model,
+        name="synthesis_agent",
+        description="Synthétise les résultats de recherche parallèle",
+        instruction=merger_instruction(topics),
+        output_key="synthesis_report"
+    )
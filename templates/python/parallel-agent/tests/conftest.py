@@ -4,6 +4,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+import pytest
+
 # Charger le fichier .env depuis le répertoire racine du projet
 env_path = Path(__file__).parent.parent / '.env'
 if env_path.exists():
@@ -14,3 +16,36 @@ else:
     if env_example_path.exists():
         load_dotenv(env_example_path)
 
+# Sans identifiants Gemini réels, utiliser le backend LLM local (ADK_FAKE_LLM)
+_placeholders = ("", "your-api-key-here", "your-project-id")
+if os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "0").lower() in ("1", "true"):
+    _has_credentials = os.getenv("GOOGLE_CLOUD_PROJECT", "") not in _placeholders
+else:
+    _has_credentials = os.getenv("GOOGLE_API_KEY", "") not in _placeholders
+if not _has_credentials:
+    os.environ.setdefault("ADK_FAKE_LLM", "1")
+
+
+@pytest.fixture
+def root_agent():
+    """Agent racine du template ; callbacks modèle restaurés après le test.
+
+    ``build_root_agent`` renvoie une instance partagée par le processus : les
+    hooks installés par un test (compaction, cache) ne doivent pas fuir.
+    """
+    from src.parallel_agent.agent import build_root_agent
+
+    root = build_root_agent()
+    saved = []
+
+    def visit(node) -> None:
+        if hasattr(node, "before_model_callback"):
+            saved.append((node, node.before_model_callback, node.after_model_callback))
+        for child in node.sub_agents:
+            visit(child)
+
+    visit(root)
+    yield root
+    for node, before, after in saved:
+        node.before_model_callback = before
+        node.after_model_callback = after
@@ -1,5 +1,6 @@
 """Tests pour les agents parallèles."""
 
+import os
 import pytest
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
@@ -48,3 +49,18 @@ async def test_parallel_execution():
         e for e in events if e.is_final_response()
     ]
     assert len(final_responses) > 0
+
+
+def test_agent_module_import_is_lazy():
+    """Test qu'importer agent.py ne charge pas ADK (construction différée)."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = {k: v for k, v in os.environ.items() if k != "ADK_FAKE_LLM"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, src.parallel_agent.agent; print('google.adk' in sys.modules)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "False", result.stderr
@@ -0,0 +1,82 @@
+"""Tests pour l'état copy-on-write des branches parallèles."""
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.branch_state import (
+    BranchStateStats,
+    CopyOnWriteParallelAgent,
+    merge_deltas,
+)
+
+
+def test_merge_deltas_merges_dict_values_per_key():
+    """Test : les dicts modifiés par plusieurs branches sont fusionnés clé par clé."""
+    stats = BranchStateStats()
+    base = {"history_summary": {"old": 1}}
+    merged = merge_deltas(base, [
+        {"a_result": "A", "history_summary": {"old": 1, "a": 2}},
+        {"b_result": "B", "history_summary": {"old": 1, "b": 3}},
+        {"a_result": "A2"},
+    ], stats)
+    assert merged == {
+        "a_result": "A2",
+        "b_result": "B",
+        "history_summary": {"old": 1, "a": 2, "b": 3},
+    }
+    assert stats.conflicts == 2
+
+
+class CountingSessionService(InMemorySessionService):
+    """Compte les événements ajoutés avec un ``state_delta`` non vide."""
+
+    def __init__(self):
+        super().__init__()
+        self.state_writes = []
+
+    async def append_event(self, session, event):
+        if event.actions and event.actions.state_delta:
+            self.state_writes.append(event.author)
+        return await super().append_event(session, event)
+
+
+@pytest.mark.asyncio
+async def test_branch_writes_committed_once_at_join():
+    """Test : chaque branche voit ses écritures ; la session les reçoit à la jonction."""
+    instructions = {}
+
+    def capture(callback_context, llm_request):
+        instructions[callback_context.agent_name] = llm_request.config.system_instruction
+
+    branches = []
+    for name in ("a", "b", "c"):
+        branches.append(SequentialAgent(name=f"{name}_branch", sub_agents=[
+            Agent(model="gemini-2.5-flash", name=f"{name}_draft",
+                  instruction="Draft a short note.", output_key=f"{name}_draft"),
+            Agent(model="gemini-2.5-flash", name=f"{name}_final",
+                  instruction=f"Improve this draft: {{{name}_draft}}",
+                  output_key=f"{name}_result", before_model_callback=capture),
+        ]))
+    research = CopyOnWriteParallelAgent(name="research", sub_agents=branches)
+    merger = Agent(model="gemini-2.5-flash", name="merger",
+                   instruction="Merge: {a_result} {b_result} {c_result}",
+                   before_model_callback=capture)
+    pipeline = SequentialAgent(name="pipeline", sub_agents=[research, merger])
+
+    session_service = CountingSessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Write notes")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    for name in ("a", "b", "c"):
+        assert session.state[f"{name}_draft"] in instructions[f"{name}_final"]
+        assert session.state[f"{name}_result"] in instructions["merger"]
+    # Une seule écriture d'état pour les six sorties des branches
+    assert session_service.state_writes.count("research") == 1
+    assert not any(author.endswith(("_draft", "_final")) for author in session_service.state_writes)
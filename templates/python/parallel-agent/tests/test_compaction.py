@@ -0,0 +1,116 @@
+"""Tests pour la compaction de l'historique."""
+
+import pytest
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.compaction import (
+    STATS_KEY,
+    SUMMARY_KEY,
+    HistoryCompactor,
+    compaction_report,
+    estimate_tokens,
+    install_history_compaction,
+)
+
+
+async def run_conversation(compactor, turns: int):
+    """Exécuter ``turns`` tours dans une session ; renvoie les requêtes vues par le modèle."""
+    requests = []
+    agent = Agent(
+        model="gemini-2.5-flash",
+        name="chat_agent",
+        instruction="You are a helpful assistant.",
+        before_model_callback=lambda callback_context, llm_request: requests.append(
+            list(llm_request.contents)
+        ),
+    )
+    install_history_compaction(agent, compactor)
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+
+    last_events = []
+    for turn in range(turns):
+        content = types.Content(
+            role="user", parts=[types.Part(text=f"Question number {turn}: " + "details " * 40)]
+        )
+        last_events = [
+            event async for event in runner.run_async(
+                user_id="u", session_id="s", new_message=content
+            )
+        ]
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    return requests, session, last_events
+
+
+@pytest.mark.asyncio
+async def test_keeps_recent_turns_and_summarizes_older():
+    """Test : N derniers tours verbatim, anciens tours dans le résumé d'état."""
+    compactor = HistoryCompactor(keep_turns=2)
+    requests, session, events = await run_conversation(compactor, turns=6)
+
+    last_request = requests[-1]
+    texts = [part.text for content in last_request for part in content.parts if part.text]
+    assert texts[0].startswith("Summary of the earlier conversation")
+    assert "Question number 3" in texts[0]
+    assert not any("Question number 3" in text for text in texts[1:])
+    assert any("Question number 4" in text for text in texts[1:])
+    assert any("Question number 5" in text for text in texts[1:])
+
+    summary = session.state[SUMMARY_KEY]["chat_agent"]
+    assert summary["turns"] == 4
+    assert len(summary["lines"]) == 4
+
+    stats = session.state[STATS_KEY]
+    assert stats["tokens_saved"] > 0
+    assert stats["tokens_before"] - stats["tokens_after"] == stats["tokens_saved"]
+    assert compactor.tokens_saved_total > 0
+    assert "économisés" in compaction_report(events)
+
+
+@pytest.mark.asyncio
+async def test_context_size_is_capped():
+    """Test : le contexte reste sous le plafond quelle que soit la longueur."""
+    compactor = HistoryCompactor(keep_turns=50, max_context_tokens=300, max_summary_tokens=100)
+    requests, _, _ = await run_conversation(compactor, turns=12)
+
+    sizes = [estimate_tokens(contents) for contents in requests]
+    assert max(sizes[-6:]) <= 300
+    assert sizes[-1] <= sizes[5] + 50
+
+
+@pytest.mark.asyncio
+async def test_disabled_without_configuration(monkeypatch):
+    """Test : sans HISTORY_KEEP_TURNS, rien n'est installé."""
+    monkeypatch.delenv("HISTORY_KEEP_TURNS", raising=False)
+    assert HistoryCompactor.from_env() is None
+    requests, session, _ = await run_conversation(None, turns=3)
+    assert SUMMARY_KEY not in session.state
+    assert len(requests[-1]) > len(requests[0])
+
+
+@pytest.mark.asyncio
+async def test_installed_on_root_agent(root_agent):
+    """Test : compaction installée sur l'agent racine du template, sur trois tours."""
+    compactor = install_history_compaction(root_agent, HistoryCompactor(keep_turns=1))
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    for turn in range(3):
+        content = types.Content(
+            role="user", parts=[types.Part(text=f"Research sustainable technology trends ({turn})")]
+        )
+        events = [
+            event async for event in runner.run_async(user_id="u", session_id="s",
+                                                      new_message=content)
+        ]
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert session.state[SUMMARY_KEY]
+    assert compaction_report(events) is not None
+    assert compactor.tokens_saved_total > 0
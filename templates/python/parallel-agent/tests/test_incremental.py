@@ -0,0 +1,83 @@
+"""Tests pour la synthèse incrémentale."""
+
+import pytest
+from google.adk.agents import Agent, ParallelAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.fake_llm import FakeGemini
+from src.parallel_agent.incremental import (
+    PENDING_TEXT,
+    PROGRESS_KEY,
+    IncrementalSynthesisAgent,
+)
+
+
+def build_agent(instructions: list):
+    researchers = [
+        Agent(model=FakeGemini(model="gemini-2.5-flash", latency_ms=latency),
+              name=f"researcher_{i}", instruction=f"Research topic {i}.",
+              output_key=f"topic_{i}_result")
+        for i, latency in enumerate((0, 150, 300))
+    ]
+    merger = Agent(
+        model=FakeGemini(model="gemini-2.5-pro"),
+        name="synthesis_agent",
+        instruction="Merge: {topic_0_result} | {topic_1_result} | {topic_2_result}",
+        output_key="synthesis_report",
+        before_model_callback=lambda callback_context, llm_request: instructions.append(
+            llm_request.config.system_instruction
+        ),
+    )
+    research = ParallelAgent(name="parallel_research", sub_agents=researchers)
+    return IncrementalSynthesisAgent(
+        name="research_and_synthesis", parallel_research=research, merger=merger
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_draft_before_slowest_researcher():
+    """Test : un brouillon est produit avant la fin du chercheur le plus lent."""
+    instructions = []
+    session_service = InMemorySessionService()
+    runner = Runner(agent=build_agent(instructions), app_name="agents",
+                    session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Research trends")])
+
+    authors = [
+        event.author async for event in runner.run_async(
+            user_id="u", session_id="s", new_message=content
+        )
+    ]
+
+    first_draft = authors.index("synthesis_agent")
+    assert first_draft < authors.index("researcher_2")
+    assert authors[-1] == "synthesis_agent"
+
+    assert 2 <= len(instructions) <= 3
+    assert PENDING_TEXT in instructions[0]
+    assert PENDING_TEXT not in instructions[-1]
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert session.state[PROGRESS_KEY] == {"results": 3, "total": 3, "final": True}
+    assert session.state["synthesis_report"]
+
+
+def test_shared_merger_keeps_its_instruction():
+    """Test : le merger d'origine n'est pas modifié, le mode incrémental en utilise un clone."""
+    template = "Merge: {topic_0_result}"
+    merger = Agent(model=FakeGemini(model="gemini-2.5-pro"), name="synthesis_agent",
+                   instruction=template, output_key="synthesis_report")
+    research = ParallelAgent(name="parallel_research", sub_agents=[
+        Agent(model=FakeGemini(model="gemini-2.5-flash"), name="researcher_0",
+              instruction="Research.", output_key="topic_0_result"),
+    ])
+    agent = IncrementalSynthesisAgent(name="research_and_synthesis",
+                                      parallel_research=research, merger=merger)
+
+    assert merger.instruction == template and merger.parent_agent is None
+    clone = agent.sub_agents[1]
+    assert clone is not merger and callable(clone.instruction)
+    assert clone.output_key == "synthesis_report"
@@ -0,0 +1,86 @@
+"""Tests pour la compression des résultats avant la fusion."""
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.fake_llm import CALL_COUNTS
+from src.parallel_agent.merge_compression import (
+    STATS_KEY,
+    ResultCompressor,
+    count_tokens,
+    deduplicate,
+    truncate,
+)
+from src.parallel_agent import scheduler as scheduler_module
+from src.parallel_agent.scheduler import ModelScheduler, ScheduledLlm, get_scheduler
+from src.parallel_agent.stragglers import MISSING_MARKER
+
+
+def test_deduplicate_across_branches():
+    """Test : une phrase déjà vue (ou presque identique) est retirée."""
+    results, removed = deduplicate({
+        "a_result": "Solar costs fell 20% in 2024. Wind grew steadily.",
+        "b_result": "Solar costs fell 20% in 2024! Batteries improved.",
+        "c_result": "Wind  grew steadily.",
+    })
+    assert results["a_result"] == "Solar costs fell 20% in 2024. Wind grew steadily."
+    assert results["b_result"] == "Batteries improved."
+    assert removed == {"a_result": 0, "b_result": 1, "c_result": 1}
+    assert results["c_result"].startswith("(")
+
+
+def test_truncate_keeps_whole_sentences():
+    """Test : la troncature s'arrête à la dernière phrase entière."""
+    text = "First sentence here. Second sentence is here. Third one."
+    assert truncate(text, count_tokens("First sentence here. Second")) == "First sentence here."
+    assert truncate("x" * 100, 5).endswith("…")
+
+
+async def run_pipeline(compressor, state):
+    """Exécuter compresseur puis fusion sur une session pré-remplie."""
+    merger = Agent(model="gemini-2.5-pro", name="merger", instruction="Merge: {a_result} {b_result}")
+    pipeline = SequentialAgent(name="pipeline", sub_agents=[compressor, merger])
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s", state=state)
+    content = types.Content(role="user", parts=[types.Part(text="Merge")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    return await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+
+
+@pytest.mark.asyncio
+async def test_over_budget_branch_summarized_with_flash(monkeypatch):
+    """Test : seul le résultat hors budget est résumé ; le rapport est enregistré."""
+    monkeypatch.setattr(scheduler_module, "_scheduler", ModelScheduler(default_limit=8))
+    long_text = " ".join(f"Finding number {i} about storage." for i in range(40))
+    missing = f"{MISSING_MARKER} b: no result within 5.0s"
+    compressor = ResultCompressor(
+        name="compressor", result_keys=["a_result", "b_result"],
+        branch_tokens=60, overflow="summarize"
+    )
+
+    assert compressor.sub_agents == []
+    assert isinstance(compressor.summarizer, ScheduledLlm)
+
+    flash_before = CALL_COUNTS["gemini-2.5-flash"]
+    slots_before = get_scheduler().metrics().get("gemini-2.5-flash", {}).get("acquired", 0)
+    session = await run_pipeline(compressor, {"a_result": long_text, "b_result": missing})
+
+    assert CALL_COUNTS["gemini-2.5-flash"] - flash_before == 1
+    assert get_scheduler().metrics()["gemini-2.5-flash"]["acquired"] - slots_before == 1
+    assert count_tokens(session.state["a_result"]) <= 60
+    assert session.state["b_result"] == missing
+    stats = session.state[STATS_KEY]
+    assert stats["branches"]["a_result"]["action"] == "summarized"
+    assert "b_result" not in stats["branches"]
+    assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"] > 0
+
+
+def test_disabled_without_configuration(monkeypatch):
+    """Test : sans MERGE_BRANCH_TOKENS, pas d'étape de compression."""
+    monkeypatch.delenv("MERGE_BRANCH_TOKENS", raising=False)
+    assert ResultCompressor.from_env(["a_result"]) is None
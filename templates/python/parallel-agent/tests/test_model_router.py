@@ -0,0 +1,82 @@
+"""Tests pour le routeur de modèles flash / pro."""
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.fake_llm import CALL_COUNTS
+from src.parallel_agent.model_router import (
+    QUALITY_KEY,
+    ModelRouter,
+    RoutedLlm,
+    RoutePolicy,
+    install_model_router,
+)
+from src.parallel_agent.scheduler import ModelScheduler, ScheduledLlm, install_scheduler
+
+FLASH, PRO = "gemini-2.5-flash", "gemini-2.5-pro"
+
+
+def test_policy_decision_rules():
+    """Test : taille de l'entrée, niveau de qualité, puis latence récente de pro."""
+    policy = RoutePolicy(max_fast_tokens=100, latency_budget_ms=1000)
+    assert policy.decide(80)[0] == FLASH
+    assert policy.decide(150)[0] == PRO
+    assert policy.decide(10, quality="high")[0] == PRO
+    assert policy.decide(5000, quality="draft")[0] == FLASH
+    # Pro lent : le seuil double, 150 tokens passent sur flash
+    assert policy.decide(150, strong_latency_ms=2500)[0] == FLASH
+    assert policy.decide(250, strong_latency_ms=2500)[0] == PRO
+
+    with pytest.raises(ValueError):
+        RoutePolicy.from_value({"quality": "premium"})
+    with pytest.raises(ValueError):
+        RoutePolicy.from_value({"max_tokens": 10})
+
+
+def test_savings_use_recent_pro_latency():
+    """Test : compteurs flash / pro, économie mesurée contre la médiane pro."""
+    router = ModelRouter({"synthesis_agent": {"max_fast_tokens": 100}})
+    router.record("synthesis_agent", FLASH, 200.0)  # Aucune mesure pro : pas d'estimation
+    router.record("synthesis_agent", PRO, 1200.0)
+    router.record("synthesis_agent", FLASH, 300.0)
+    assert router.report() == {"synthesis_agent": {"fast": 2, "strong": 1, "saved_ms": 900.0}}
+    assert router.recent_latency(PRO) == 1200.0
+
+
+@pytest.mark.asyncio
+async def test_routed_agent_calls_flash_for_short_input_and_pro_for_long():
+    """Test : même agent, modèle choisi par appel ; la session peut exiger pro."""
+    merger = Agent(name="synthesis_agent", model=PRO, instruction="Merge: {results}",
+                   output_key="synthesis")
+    root = SequentialAgent(name="pipeline", sub_agents=[merger])
+    scheduler = ModelScheduler(default_limit=4)
+    install_scheduler(root, scheduler)
+    router = install_model_router(root, ModelRouter({"synthesis_agent": {"max_fast_tokens": 200}}))
+
+    assert isinstance(merger.model, RoutedLlm)
+    targets = merger.model.targets
+    assert all(isinstance(targets[name], ScheduledLlm) for name in (FLASH, PRO))
+    assert targets[FLASH].model == FLASH and targets[FLASH].scheduler is scheduler
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root, app_name="agents", session_service=session_service)
+    content = types.Content(role="user", parts=[types.Part(text="Synthesize")])
+    cases = [
+        ({"results": "Short findings."}, FLASH),
+        ({"results": "Long findings. " * 200}, PRO),
+        ({"results": "Short findings.", QUALITY_KEY: "high"}, PRO),
+    ]
+    for index, (state, expected) in enumerate(cases):
+        await session_service.create_session(app_name="agents", user_id="u",
+                                             session_id=f"s{index}", state=state)
+        before = CALL_COUNTS[expected]
+        async for _ in runner.run_async(user_id="u", session_id=f"s{index}", new_message=content):
+            pass
+        assert CALL_COUNTS[expected] - before == 1
+
+    report = router.report()["synthesis_agent"]
+    assert (report["fast"], report["strong"]) == (1, 2)
+    assert scheduler.metrics()[FLASH]["acquired"] == 1
@@ -0,0 +1,66 @@
+"""Tests pour le cache des résultats de recherche entre sessions."""
+
+import json
+import time
+
+import pytest
+from google.adk.agents import Agent, ParallelAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.fake_llm import CALL_COUNTS
+from src.parallel_agent.model_cache import MemoryCacheBackend
+from src.parallel_agent.research_cache import ResearchCache, install_research_cache, research_key
+
+INSTRUCTION = "Research the latest developments in geothermal energy."
+
+
+def make_research() -> ParallelAgent:
+    researcher = Agent(model="gemini-2.5-flash", name="geothermal_researcher",
+                       instruction=INSTRUCTION, output_key="geothermal_result")
+    return ParallelAgent(name="research", sub_agents=[researcher])
+
+
+async def run_session(agent, session_service, session_id: str, message: str) -> dict:
+    runner = Runner(agent=agent, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id=session_id)
+    content = types.Content(role="user", parts=[types.Part(text=message)])
+    async for _ in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+        pass
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id=session_id)
+    return session.state
+
+
+@pytest.mark.asyncio
+async def test_hit_across_sessions_skips_model():
+    """Test : une autre session reçoit le résultat sans appel au modèle."""
+    research = make_research()
+    cache = install_research_cache(research, ResearchCache(MemoryCacheBackend()))
+    session_service = InMemorySessionService()
+
+    calls_before = CALL_COUNTS["gemini-2.5-flash"]
+    first = await run_session(research, session_service, "s1", "Research energy")
+    second = await run_session(research, session_service, "s2", "Something else")
+
+    assert CALL_COUNTS["gemini-2.5-flash"] - calls_before == 1
+    assert second["geothermal_result"] == first["geothermal_result"]
+    assert cache.report()["geothermal_researcher"] == {
+        "hits": 1, "misses": 1, "expired": 0, "stored": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_refreshed():
+    """Test : un résultat plus vieux que le TTL est recalculé puis remplacé."""
+    backend = MemoryCacheBackend()
+    key = research_key("geothermal_researcher", INSTRUCTION, "gemini-2.5-flash")
+    backend.set(key, json.dumps({"text": "stale", "created": time.time() - 2 * 3600}))
+    research = make_research()
+    cache = install_research_cache(research, ResearchCache(backend, ttl=3600))
+
+    state = await run_session(research, InMemorySessionService(), "s1", "Research energy")
+
+    assert state["geothermal_result"] != "stale"
+    assert json.loads(backend.get(key))["text"] == state["geothermal_result"]
+    assert cache.report()["geothermal_researcher"]["expired"] == 1
@@ -0,0 +1,39 @@
+"""Tests pour l'affichage en streaming de run.py."""
+
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+from run import stream_response
+
+
+def text_event(author: str, text: str, partial: bool) -> Event:
+    return Event(
+        invocation_id="i",
+        author=author,
+        branch=f"research_and_synthesis.parallel_research.{author}",
+        partial=partial,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+    )
+
+
+class InterleavedRunner:
+    """Runner de test : deux branches parallèles dont les chunks s'entrelacent."""
+
+    async def run_async(self, **kwargs):
+        yield text_event("a", "Alpha ", True)
+        yield text_event("b", "Beta ", True)
+        yield text_event("a", "one.", True)
+        yield text_event("b", "two.", True)
+        yield text_event("a", "Alpha one.", False)
+        yield text_event("b", "Beta two.", False)
+
+
+@pytest.mark.asyncio
+async def test_interleaved_branches_are_segmented_and_not_repeated(capsys):
+    """Test : un segment préfixé par changement de branche, textes complets non réaffichés."""
+    await stream_response(InterleavedRunner(), types.Content(role="user", parts=[]))
+    output = capsys.readouterr().out
+
+    assert output.startswith("[a] Alpha \n[b] Beta \n[a] one.\n[b] two.\n")
+    assert "Alpha one." not in output and "Beta two." not in output
@@ -0,0 +1,124 @@
+"""Tests pour l'ordonnanceur des appels modèle."""
+
+import asyncio
+
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent import scheduler as scheduler_module
+from src.parallel_agent.agent import build_pipeline
+from src.parallel_agent.scheduler import (
+    PRIORITY_HIGH,
+    ModelScheduler,
+    ScheduledLlm,
+    get_scheduler,
+)
+from src.parallel_agent.topics import DEFAULT_TOPICS
+
+
+@pytest.mark.asyncio
+async def test_limit_and_round_robin_across_sessions():
+    """Test : limite respectée, sessions servies à tour de rôle."""
+    scheduler = ModelScheduler(default_limit=1)
+    order = []
+    running = 0
+    max_running = 0
+
+    async def call(session: str, index: int):
+        nonlocal running, max_running
+        async with scheduler.slot("m", session):
+            running += 1
+            max_running = max(max_running, running)
+            order.append(session)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+    # La session "a" envoie 4 appels avant que "b" et "c" n'en envoient un
+    tasks = [asyncio.create_task(call("a", i)) for i in range(4)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(call("b", 0)), asyncio.create_task(call("c", 0))]
+    await asyncio.gather(*tasks)
+
+    assert max_running == 1
+    assert order[:4] == ["a", "a", "b", "c"]
+    metrics = scheduler.metrics()["m"]
+    assert metrics["acquired"] == 6 and metrics["in_flight"] == 0
+    assert metrics["max_queue_depth"] == 5 and metrics["queue_depth"] == 0
+    assert metrics["wait_ms"]["max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_priority_calls_go_first():
+    """Test : un appel prioritaire passe devant la file normale."""
+    scheduler = ModelScheduler(default_limit=1)
+    order = []
+
+    async def call(name: str, priority: int = 1):
+        async with scheduler.slot("m", name, priority):
+            order.append(name)
+            await asyncio.sleep(0.001)
+
+    tasks = [asyncio.create_task(call(f"normal_{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call("synthesis", PRIORITY_HIGH)))
+    await asyncio.gather(*tasks)
+    assert order[:2] == ["normal_0", "synthesis"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    """Test : une attente annulée ne consomme pas de slot."""
+    scheduler = ModelScheduler(default_limit=1)
+    release = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("m"):
+            await release.wait()
+
+    first = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    metrics = scheduler.metrics()["m"]
+    assert metrics["in_flight"] == 0 and metrics["queue_depth"] == 0
+
+
+
+def test_scheduler_disabled_without_env(monkeypatch):
+    """Test : sans MODEL_CONCURRENCY, aucun scheduler n'est installé."""
+    monkeypatch.delenv("MODEL_CONCURRENCY", raising=False)
+    monkeypatch.setattr(scheduler_module, "_scheduler", None)
+    assert get_scheduler() is None
+    merger = build_pipeline(DEFAULT_TOPICS).sub_agents[1]
+    assert not isinstance(merger.model, ScheduledLlm)
+
+@pytest.mark.asyncio
+async def test_pipeline_calls_go_through_scheduler(monkeypatch):
+    """Test d'intégration : les 4 appels du pipeline passent par le scheduler."""
+    monkeypatch.setattr(scheduler_module, "_scheduler", ModelScheduler(default_limit=8))
+    root_agent = build_pipeline(DEFAULT_TOPICS)
+    researchers = root_agent.sub_agents[0].sub_agents
+    merger = root_agent.sub_agents[1]
+    assert all(isinstance(agent.model, ScheduledLlm) for agent in [*researchers, merger])
+    assert merger.model.priority == PRIORITY_HIGH
+
+    scheduler = get_scheduler()
+    before = {model: m["acquired"] for model, m in scheduler.metrics().items()}
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Research trends")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    metrics = scheduler.metrics()
+    assert metrics["gemini-2.5-flash"]["acquired"] - before.get("gemini-2.5-flash", 0) == 3
+    assert metrics["gemini-2.5-pro"]["acquired"] - before.get("gemini-2.5-pro", 0) == 1
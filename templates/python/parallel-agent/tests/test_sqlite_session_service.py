@@ -0,0 +1,229 @@
+"""Tests pour le service de sessions SQLite."""
+
+import asyncio
+import logging
+import sqlite3
+
+import pytest
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+from src.parallel_agent.agent import build_root_agent
+from src.parallel_agent.sqlite_session_service import SqliteSessionService
+
+
+def make_event(text: str, **state_delta) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state_delta),
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+@pytest.mark.asyncio
+async def test_session_survives_restart(db_path):
+    """Test de la persistance des événements et de l'état entre deux instances."""
+    service = SqliteSessionService(db_path, batch_size=4)
+    session = await service.create_session(
+        app_name="app", user_id="u1", session_id="s1",
+        state={"topic": "paint", "app:theme": "dark", "user:lang": "fr"}
+    )
+    for i in range(10):
+        await service.append_event(session, make_event(f"m{i}", step=i, **{"temp:scratch": i}))
+    await service.close()
+
+    reopened = SqliteSessionService(db_path)
+    restored = await reopened.get_session(app_name="app", user_id="u1", session_id="s1")
+    assert [e.content.parts[0].text for e in restored.events] == [f"m{i}" for i in range(10)]
+    assert restored.state == {"topic": "paint", "step": 9, "app:theme": "dark", "user:lang": "fr"}
+    assert restored.last_update_time == session.last_update_time
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_scoped_state_is_shared(db_path):
+    """Test du partage des clés app: et user: entre sessions."""
+    service = SqliteSessionService(db_path)
+    first = await service.create_session(app_name="app", user_id="u1", session_id="a")
+    await service.create_session(app_name="app", user_id="u1", session_id="b")
+    await service.create_session(app_name="app", user_id="u2", session_id="c")
+    await service.append_event(first, make_event("hi", **{"app:count": 1, "user:name": "Ada"}))
+
+    same_user = await service.get_session(app_name="app", user_id="u1", session_id="b")
+    other_user = await service.get_session(app_name="app", user_id="u2", session_id="c")
+    assert same_user.state == {"app:count": 1, "user:name": "Ada"}
+    assert other_user.state == {"app:count": 1}
+    assert await service.get_user_state(app_name="app", user_id="u1") == {"name": "Ada"}
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_history_loading(db_path):
+    """Test du chargement des N derniers événements et de la pagination."""
+    service = SqliteSessionService(db_path, recent_events=3)
+    session = await service.create_session(app_name="app", user_id="u1", session_id="s1")
+    for i in range(8):
+        await service.append_event(session, make_event(f"m{i}"))
+
+    recent = await service.get_session(app_name="app", user_id="u1", session_id="s1")
+    assert [e.content.parts[0].text for e in recent.events] == ["m5", "m6", "m7"]
+
+    full = await service.get_session(
+        app_name="app", user_id="u1", session_id="s1",
+        config=GetSessionConfig(num_recent_events=None)
+    )
+    assert len(full.events) == 3  # None = défaut du service
+
+    older = await service.load_events(
+        app_name="app", user_id="u1", session_id="s1", offset=3, limit=3
+    )
+    assert [e.content.parts[0].text for e in older] == ["m2", "m3", "m4"]
+    assert await service.count_events(app_name="app", user_id="u1", session_id="s1") == 8
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_events_are_not_stored(db_path):
+    """Test : les chunks de streaming ne sont jamais persistés."""
+    service = SqliteSessionService(db_path)
+    session = await service.create_session(app_name="app", user_id="u1", session_id="s1")
+    chunk = make_event("par")
+    chunk.partial = True
+    await service.append_event(session, chunk)
+    await service.append_event(session, make_event("partial text"))
+    assert await service.count_events(app_name="app", user_id="u1", session_id="s1") == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_list_delete_and_duplicates(db_path):
+    """Test de list_sessions, delete_session et des identifiants en double."""
+    service = SqliteSessionService(db_path)
+    await service.create_session(app_name="app", user_id="u1", session_id="s1")
+    await service.create_session(app_name="app", user_id="u2", session_id="s2")
+    with pytest.raises(ValueError):
+        await service.create_session(app_name="app", user_id="u1", session_id="s1")
+
+    listed = await service.list_sessions(app_name="app")
+    assert sorted(s.id for s in listed.sessions) == ["s1", "s2"]
+    listed = await service.list_sessions(app_name="app", user_id="u1")
+    assert [s.id for s in listed.sessions] == ["s1"]
+
+    await service.delete_session(app_name="app", user_id="u1", session_id="s1")
+    assert await service.get_session(app_name="app", user_id="u1", session_id="s1") is None
+    await service.close()
+
+
+class FailingConnection:
+    """Connexion de test : les requêtes contenant ``fail_on`` échouent."""
+
+    def __init__(self, conn: sqlite3.Connection, fail_on: str):
+        self.conn = conn
+        self.fail_on = fail_on
+
+    def execute(self, sql: str, *args):
+        if self.fail_on in sql:
+            raise sqlite3.OperationalError("disk I/O error")
+        return self.conn.execute(sql, *args)
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_is_rolled_back(db_path):
+    """Test : un échec de delete_session annule la transaction, la base reste utilisable."""
+    service = SqliteSessionService(db_path)
+    session = await service.create_session(app_name="app", user_id="u", session_id="s")
+    await service.append_event(session, make_event("hello"))
+    await service.flush()
+
+    connection = service._connection
+    service._connection = lambda: FailingConnection(connection(), "DELETE FROM sessions")
+    with pytest.raises(sqlite3.OperationalError):
+        await service.delete_session(app_name="app", user_id="u", session_id="s")
+    service._connection = connection
+
+    assert await service.count_events(app_name="app", user_id="u", session_id="s") == 1
+    await service.delete_session(app_name="app", user_id="u", session_id="s")
+    assert await service.get_session(app_name="app", user_id="u", session_id="s") is None
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_deferred_flush_failure_is_logged_and_raised_on_close(db_path, caplog):
+    """Test : l'échec d'une écriture différée est journalisé puis levé par close()."""
+    service = SqliteSessionService(db_path, flush_interval=0.01)
+    session = await service.create_session(app_name="app", user_id="u", session_id="s")
+
+    def failing_write(*batch):
+        raise sqlite3.OperationalError("database is locked")
+
+    service._write_batch = failing_write
+    with caplog.at_level(logging.ERROR):
+        await service.append_event(session, make_event("hello"))
+        await asyncio.sleep(0.05)
+    assert "Écriture différée" in caplog.text
+    assert service._flush_task is None
+
+    with pytest.raises(RuntimeError) as error:
+        await service.close()
+    assert isinstance(error.value.__cause__, sqlite3.OperationalError)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_batch_for_retry(db_path):
+    """Test : un lot non écrit reste en tampon, avant les événements suivants."""
+    service = SqliteSessionService(db_path)
+    session = await service.create_session(app_name="app", user_id="u", session_id="s")
+    await service.append_event(session, make_event("first", step=1, **{"user:lang": "fr"}))
+
+    write_batch = service._write_batch
+
+    def failing_write(*batch):
+        raise sqlite3.OperationalError("database is locked")
+
+    service._write_batch = failing_write
+    with pytest.raises(sqlite3.OperationalError):
+        await service.flush()
+    await service.append_event(session, make_event("second", step=2))
+    service._write_batch = write_batch
+    await service.close()
+
+    reopened = SqliteSessionService(db_path)
+    restored = await reopened.get_session(app_name="app", user_id="u", session_id="s")
+    assert [e.content.parts[0].text for e in restored.events] == ["first", "second"]
+    assert restored.state["step"] == 2 and restored.state["user:lang"] == "fr"
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_runner_with_sqlite_sessions(db_path):
+    """Test d'intégration : le Runner fonctionne avec le service SQLite."""
+    service = SqliteSessionService(db_path)
+    runner = Runner(agent=build_root_agent(), app_name="agents", session_service=service)
+    await service.create_session(app_name="agents", user_id="u1", session_id="s1")
+
+    content = types.Content(
+        role="user", parts=[types.Part(text="Research sustainable technology trends")]
+    )
+    events = [
+        event async for event in runner.run_async(
+            user_id="u1", session_id="s1", new_message=content
+        )
+    ]
+    assert events
+    count = await service.count_events(app_name="agents", user_id="u1", session_id="s1")
+    assert count == len(events) + 1  # + message utilisateur
+    await service.close()
+
+    # Sortie de l'agent relue par une nouvelle instance
+    reopened = SqliteSessionService(db_path)
+    session = await reopened.get_session(app_name="agents", user_id="u1", session_id="s1")
+    assert session.state["synthesis_report"]
+    await reopened.close()
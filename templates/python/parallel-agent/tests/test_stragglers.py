@@ -0,0 +1,222 @@
+"""Tests pour le délai par branche et les requêtes de secours."""
+
+import asyncio
+import time
+
+import pytest
+from google.adk.agents import Agent, ParallelAgent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.fake_llm import FakeGemini
+from src.parallel_agent.model_cache import ModelCallCache, install_model_cache
+from src.parallel_agent.stragglers import (
+    MISSING_MARKER,
+    BranchStats,
+    DeadlineLlm,
+    install_straggler_cutoff,
+)
+
+
+class SequencedLlm(BaseLlm):
+    """Modèle de test : la n-ième requête répond après ``delays[n]`` secondes."""
+
+    delays: list
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        yield LlmResponse(content=types.Content(
+            role="model", parts=[types.Part(text=f"answer after {delay}s")]
+        ))
+
+
+async def collect(llm: BaseLlm) -> list:
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+    return [r.content.parts[0].text async for r in llm.generate_content_async(request)]
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_over_straggler():
+    """Test : la requête de secours répond avant la requête lente."""
+    stats = BranchStats()
+    llm = DeadlineLlm(model="m", inner=SequencedLlm(model="m", delays=[1.0, 0.01]),
+                      agent_name="researcher", deadline=0.5, hedge_after=0.02, stats=stats)
+    start = time.perf_counter()
+    assert await collect(llm) == ["answer after 0.01s"]
+    assert time.perf_counter() - start < 0.2
+    assert (stats.hedged, stats.hedge_wins, stats.deadline_misses) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_deadline_produces_missing_marker():
+    """Test : au-delà du délai, un marqueur remplace le résultat."""
+    stats = BranchStats()
+    llm = DeadlineLlm(model="m", inner=SequencedLlm(model="m", delays=[1.0]),
+                      agent_name="researcher", deadline=0.05, stats=stats)
+    start = time.perf_counter()
+    [text] = await collect(llm)
+    assert text.startswith(MISSING_MARKER) and "researcher" in text
+    assert time.perf_counter() - start < 0.3
+    assert stats.deadline_misses == 1 and stats.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_fast_branch_is_untouched():
+    """Test : une réponse rapide passe telle quelle, sans secours."""
+    stats = BranchStats()
+    llm = DeadlineLlm(model="m", inner=SequencedLlm(model="m", delays=[0.0]),
+                      agent_name="researcher", deadline=1.0, hedge_after=0.5, stats=stats)
+    assert await collect(llm) == ["answer after 0.0s"]
+    assert stats.hedged == 0 and stats.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_marker_is_not_cached():
+    """Test : le marqueur d'un délai dépassé n'est pas servi par le cache modèle."""
+    inner = SequencedLlm(model="m", delays=[1.0, 0.0])
+    researcher = Agent(model=DeadlineLlm(model="m", inner=inner, agent_name="researcher",
+                                         deadline=0.05, stats=BranchStats()),
+                       name="researcher", instruction="Research.", output_key="result")
+    cache = install_model_cache(researcher, ModelCallCache())
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=researcher, app_name="agents", session_service=session_service)
+    results = []
+    for session_id in ("s1", "s2"):
+        await session_service.create_session(app_name="agents", user_id="u",
+                                             session_id=session_id)
+        content = types.Content(role="user", parts=[types.Part(text="Go")])
+        async for _ in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+            pass
+        session = await session_service.get_session(app_name="agents", user_id="u",
+                                                    session_id=session_id)
+        results.append(session.state["result"])
+
+    assert results[0].startswith(MISSING_MARKER)
+    assert results[1] == "answer after 0.0s"
+    assert inner.calls == 2 and cache.report()["researcher"]["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_merger_runs_with_partial_results():
+    """Test d'intégration : la fusion s'exécute sans attendre la branche lente."""
+    fast = Agent(model=FakeGemini(model="gemini-2.5-flash"), name="fast_researcher",
+                 instruction="Research A.", output_key="a_result")
+    slow = Agent(model=FakeGemini(model="gemini-2.5-flash", latency_ms=2000),
+                 name="slow_researcher", instruction="Research B.", output_key="b_result")
+    research = ParallelAgent(name="research", sub_agents=[fast, slow])
+    merger = Agent(model=FakeGemini(model="gemini-2.5-pro"), name="merger",
+                   instruction="Merge: {a_result} / {b_result}", output_key="report")
+    pipeline = SequentialAgent(name="pipeline", sub_agents=[research, merger])
+    assert install_straggler_cutoff(research, deadline=0.1)
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Research trends")])
+
+    start = time.perf_counter()
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+    assert time.perf_counter() - start < 1.0
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert not session.state["a_result"].startswith(MISSING_MARKER)
+    assert session.state["b_result"].startswith(MISSING_MARKER)
+    assert session.state["report"]
+
+
+class StreamingLlm(BaseLlm):
+    """Modèle de test : un premier chunk immédiat, le second après ``delay`` secondes."""
+
+    delay: float
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        yield LlmResponse(partial=True, content=types.Content(
+            role="model", parts=[types.Part(text="first ")]
+        ))
+        await asyncio.sleep(self.delay)
+        yield LlmResponse(content=types.Content(
+            role="model", parts=[types.Part(text="first second")]
+        ))
+
+
+@pytest.mark.asyncio
+async def test_stream_passes_through_after_first_chunk():
+    """Test : premier chunk à temps, le flux continue au-delà du délai sans marqueur."""
+    llm = DeadlineLlm(model="m", inner=StreamingLlm(model="m", delay=0.1),
+                      agent_name="researcher", deadline=0.05, stats=BranchStats())
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+    start = time.perf_counter()
+    arrivals = []
+    async for response in llm.generate_content_async(request, stream=True):
+        arrivals.append((response.content.parts[0].text, time.perf_counter() - start))
+    assert [text for text, _ in arrivals] == ["first ", "first second"]
+    assert arrivals[0][1] < 0.05
+
+
+class ToolCallingLlm(BaseLlm):
+    """Modèle de test : appelle ``tool`` au premier appel, répond ensuite."""
+
+    tool: str
+    calls: int = 0
+    fail: bool = False
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        if self.calls == 1:
+            part = types.Part(function_call=types.FunctionCall(name=self.tool, args={}))
+        else:
+            part = types.Part(text="findings")
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+async def slow_lookup() -> dict:
+    """Recherche lente."""
+    await asyncio.sleep(0.2)
+    return {"status": "success"}
+
+
+def broken_lookup() -> dict:
+    """Recherche en panne."""
+    raise ConnectionError("search backend down")
+
+
+@pytest.mark.asyncio
+async def test_branch_deadline_and_errors_become_markers():
+    """Test : délai par branche à travers un outil, erreurs modèle et outil en marqueurs."""
+    slow = ToolCallingLlm(model="m", tool="slow_lookup")
+    branches = [
+        Agent(model=slow, name="slow", instruction="A.", tools=[slow_lookup],
+              output_key="slow_result"),
+        Agent(model=ToolCallingLlm(model="m", tool="broken_lookup"), name="broken",
+              instruction="B.", tools=[broken_lookup], output_key="broken_result"),
+        Agent(model=ToolCallingLlm(model="m", tool="none", fail=True), name="failing",
+              instruction="C.", output_key="failing_result"),
+        Agent(model=FakeGemini(model="gemini-2.5-flash"), name="ok", instruction="D.",
+              output_key="ok_result"),
+    ]
+    research = ParallelAgent(name="research", sub_agents=branches)
+    assert install_straggler_cutoff(research, deadline=0.1)
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=research, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Research")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    state = (await session_service.get_session(app_name="agents", user_id="u",
+                                               session_id="s")).state
+    assert state["slow_result"].startswith(f"{MISSING_MARKER} slow: no result")
+    assert slow.calls == 1  # Échéance passée pendant l'outil : pas de second appel
+    assert state["broken_result"].startswith(f"{MISSING_MARKER} broken: error: broken_lookup")
+    assert state["failing_result"] == f"{MISSING_MARKER} failing: error: quota exceeded"
+    assert not state["ok_result"].startswith(MISSING_MARKER)
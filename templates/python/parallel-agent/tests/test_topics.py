@@ -0,0 +1,89 @@
+"""Tests pour la génération des chercheurs à partir des sujets."""
+
+import json
+
+import pytest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.parallel_agent.agent import build_pipeline
+from src.parallel_agent.topics import (
+    DEFAULT_TOPICS,
+    Topic,
+    load_topics,
+    merger_instruction,
+    parse_topics,
+)
+
+
+def test_default_topics_keep_historical_names():
+    """Test : les sujets par défaut gardent les noms et clés d'origine."""
+    assert [t.agent for t in DEFAULT_TOPICS] == [
+        "renewable_energy_researcher", "ev_researcher", "carbon_capture_researcher"
+    ]
+    assert [t.key for t in DEFAULT_TOPICS] == [
+        "renewable_energy_result", "ev_technology_result", "carbon_capture_result"
+    ]
+    assert "   - Electric Vehicles: {ev_technology_result}" in merger_instruction(DEFAULT_TOPICS)
+
+
+def test_load_topics_yaml_and_json(tmp_path):
+    """Test du chargement YAML (libellés et objets) et JSON."""
+    yaml_path = tmp_path / "topics.yaml"
+    yaml_path.write_text(
+        "topics:\n"
+        "  - Solid-State Batteries\n"
+        "  - label: Green Hydrogen\n"
+        "    focus: electrolyzer costs\n",
+        encoding="utf-8"
+    )
+    topics = load_topics(yaml_path)
+    assert topics[0] == Topic(label="Solid-State Batteries")
+    assert topics[0].key == "solid_state_batteries_result"
+    assert topics[1].agent == "green_hydrogen_researcher"
+    assert topics[1].focus == "electrolyzer costs"
+
+    json_path = tmp_path / "topics.json"
+    json_path.write_text(json.dumps(["Geothermal"]), encoding="utf-8")
+    assert load_topics(json_path)[0].key == "geothermal_result"
+
+
+def test_parse_topics_rejects_invalid_lists():
+    """Test : liste vide, doublons et champs inconnus sont refusés."""
+    with pytest.raises(ValueError):
+        parse_topics([])
+    with pytest.raises(ValueError):
+        parse_topics(["Wind Power", "wind power"])
+    with pytest.raises(ValueError):
+        parse_topics([{"label": "Wind", "colour": "blue"}])
+
+
+def test_topic_fields_reject_state_placeholders():
+    """Test : des accolades dans un champ d'instruction sont refusées (pas de KeyError ADK)."""
+    for value in ({"label": "Wind {power}"}, {"label": "Wind", "focus": "costs {year}"},
+                  {"label": "Wind", "task": "Research }"}):
+        with pytest.raises(ValueError, match="Accolades"):
+            parse_topics([value])
+    assert parse_topics([{"label": "Wind", "description": "Recherche {éolien}"}])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_with_many_topics():
+    """Test : un pipeline de 12 sujets remplit les 12 clés avant la fusion."""
+    labels = [f"Topic {index}" for index in range(12)]
+    pipeline = build_pipeline(labels)
+    parallel_research, merger = pipeline.sub_agents
+    assert len(parallel_research.sub_agents) == 12
+    assert "{topic_11_result}" in merger.instruction
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    await session_service.create_session(app_name="agents", user_id="u", session_id="s")
+    content = types.Content(role="user", parts=[types.Part(text="Research these topics")])
+    async for _ in runner.run_async(user_id="u", session_id="s", new_message=content):
+        pass
+
+    session = await session_service.get_session(app_name="agents", user_id="u", session_id="s")
+    assert all(f"topic_{index}_result" in session.state for index in range(12))
+    assert session.state["synthesis_report"]
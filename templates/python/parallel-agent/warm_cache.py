@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Préchauffer le cache des résultats de recherche (voir research_cache.py).
+
+Exécute les chercheurs dont le résultat est absent ou expiré et l'enregistre
+sur disque : les sessions suivantes reçoivent ces résultats sans appel modèle.
+À lancer avant les heures de pointe, par exemple depuis cron :
+
+    0 7 * * * cd /srv/parallel-agent && python warm_cache.py
+
+Usage :
+    python warm_cache.py
+    python warm_cache.py --force --topics topics.yaml --dir .research_cache
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Charger le fichier .env
+env_path = Path(__file__).parent / '.env'
+if env_path.exists():
+    load_dotenv(env_path)
+
+WARM_UP_MESSAGE = "Research the latest developments."
+
+
+async def warm(topics_file: str | None, directory: str, ttl_hours: float, force: bool) -> dict:
+    """Exécuter les chercheurs à rafraîchir ; renvoie ``{agent: statut}``."""
+    from google.adk.agents import ParallelAgent
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+    from src.parallel_agent.model_cache import DiskCacheBackend
+    from src.parallel_agent.research_cache import ResearchCache, install_research_cache, research_key
+    from src.parallel_agent.scheduler import install_scheduler
+    from src.parallel_agent.topics import build_researchers, configured_topics, load_topics
+
+    topics = load_topics(topics_file) if topics_file else configured_topics()
+    cache = ResearchCache(DiskCacheBackend(directory), ttl=ttl_hours * 3600, refresh=force)
+
+    status = {}
+    stale = []
+    for researcher in build_researchers(topics):
+        key = research_key(researcher.name, researcher.instruction, researcher.canonical_model.model)
+        if not force and cache.lookup(key) is not None:
+            status[researcher.name] = "à jour"
+        else:
+            stale.append(researcher)
+    if not stale:
+        return status
+
+    warm_up = ParallelAgent(name="warm_up", sub_agents=stale)
+    # Appels bornés comme en production (MODEL_CONCURRENCY)
+    install_scheduler(warm_up)
+    install_research_cache(warm_up, cache)
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=warm_up, app_name="warm_up", session_service=session_service)
+    await session_service.create_session(app_name="warm_up", user_id="warm_up", session_id="warm_up")
+    content = types.Content(role="user", parts=[types.Part(text=WARM_UP_MESSAGE)])
+    async for _ in runner.run_async(user_id="warm_up", session_id="warm_up", new_message=content):
+        pass
+
+    for researcher in stale:
+        stored = cache.stats[researcher.name].stored
+        status[researcher.name] = "rafraîchi" if stored else "échec"
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topics", default=os.getenv("RESEARCH_TOPICS_FILE"),
+                        help="Fichier de sujets (défaut : $RESEARCH_TOPICS_FILE, sinon sujets par défaut)")
+    parser.add_argument("--dir", default=os.getenv("RESEARCH_CACHE_DIR", ".research_cache"),
+                        help="Répertoire du cache (défaut : $RESEARCH_CACHE_DIR)")
+    parser.add_argument("--ttl-hours", type=float,
+                        default=float(os.getenv("RESEARCH_CACHE_TTL_H", "24")))
+    parser.add_argument("--force", action="store_true",
+                        help="Rafraîchir aussi les résultats encore valides")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = asyncio.run(warm(args.topics, args.dir, args.ttl_hours, args.force))
+    for agent, state in sorted(status.items()):
+        print(f"📚 {agent} : {state}")
+    print(f"⏱️  {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
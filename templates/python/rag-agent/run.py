@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """Script pour lancer l'agent RAG de manière interactive."""
 
+from __future__ import annotations
+
+import argparse
 import asyncio
 import os
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+# Les imports ADK sont différés (voir load_agent) pour afficher l'invite
+# sans attendre leur chargement
+if TYPE_CHECKING:
+    from google.adk.runners import Runner
+    from google.genai import types
 
 # Charger le fichier .env
 env_path = Path(__file__).parent / '.env'
@@ -22,24 +30,129 @@ if not os.getenv("RAG_CORPUS"):
     print("Format attendu: projects/PROJECT_ID/locations/LOCATION/ragCorpora/CORPUS_ID")
     exit(1)
 
-from src.rag_agent.agent import root_agent
+
+def load_agent():
+    """Importer ADK et construire ``root_agent``.
+
+    Exécuté dans un thread dès le démarrage : les imports lourds
+    (google.adk, google.genai) se font pendant que l'utilisateur tape.
+    """
+    import google.adk.runners  # noqa: F401
+    import google.adk.sessions  # noqa: F401
+    from src.rag_agent.agent import build_root_agent
+    return build_root_agent()
 
 
-async def main():
-    """Fonction principale pour lancer l'agent."""
-    session_service = InMemorySessionService()
+async def create_runner(root_agent, db_path: str | None = None) -> Runner:
+    """Créer le Runner et la session de la CLI.
+
+    Args:
+        root_agent: Agent racine construit par ``load_agent``
+        db_path: Base SQLite des sessions (None : sessions en mémoire)
+    """
+    from google.adk.runners import Runner
+
+    if db_path:
+        from src.rag_agent.sqlite_session_service import SqliteSessionService
+        session_service = SqliteSessionService(db_path)
+    else:
+        from google.adk.sessions import InMemorySessionService
+        session_service = InMemorySessionService()
     runner = Runner(
         agent=root_agent,
         app_name="agents",
         session_service=session_service
     )
     
-    # Créer une session
-    session = await session_service.create_session(
+    # Reprendre la session existante (base SQLite) ou la créer
+    session = await session_service.get_session(
         app_name="agents",
         user_id="user123",
         session_id="session001"
     )
+    if session is None:
+        await session_service.create_session(
+            app_name="agents",
+            user_id="user123",
+            session_id="session001"
+        )
+    return runner
+
+
+async def stream_response(runner: Runner, content: types.Content) -> None:
+    """Afficher la réponse au fil de l'eau (mode streaming).
+
+    Le texte partiel est affiché dès réception, préfixé par l'agent qui parle,
+    puis le temps jusqu'au premier token (TTFT) et la durée totale du tour.
+    """
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+
+    from src.rag_agent.compaction import compaction_report
+
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    start = time.perf_counter()
+    first_token_at = None
+    current_stream = None  # (auteur, branche) du texte affiché en dernier
+    # Flux (auteur, branche) dont les chunks partiels sont déjà affichés : les
+    # branches parallèles s'entrelacent, chacune a son propre message en cours
+    streamed = set()
+    events = []
+
+    async for event in runner.run_async(
+        user_id="user123",
+        session_id="session001",
+        new_message=content,
+        run_config=run_config
+    ):
+        events.append(event)
+        if not event.content or not event.content.parts:
+            continue
+        text = "".join(
+            part.text for part in event.content.parts if part.text and not part.thought
+        )
+        if not text:
+            continue
+
+        # Le message complet qui suit les chunks partiels a déjà été affiché
+        stream_id = (event.author, event.branch)
+        if not event.partial and stream_id in streamed:
+            streamed.discard(stream_id)
+            continue
+
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        if stream_id != current_stream:
+            # Nouveau segment à chaque changement d'agent ou de branche
+            prefix = "\n" if current_stream else ""
+            print(f"{prefix}[{event.author}] ", end="", flush=True)
+            current_stream = stream_id
+
+        print(text, end="" if event.partial else "\n", flush=True)
+        if event.partial:
+            streamed.add(stream_id)
+
+    total = time.perf_counter() - start
+    if first_token_at is None:
+        print("Agent: (Pas de réponse finale)")
+    else:
+        ttft = (first_token_at - start) * 1000
+        print(f"\n⏱️  Premier token : {ttft:.0f} ms · Tour complet : {total:.2f} s\n")
+
+    report = compaction_report(events)
+    if report:
+        print(f"{report}\n")
+
+
+async def main(stream: bool = False, db_path: str | None = None):
+    """Fonction principale pour lancer l'agent.
+
+    Args:
+        stream: Afficher les réponses au fil de l'eau au lieu d'attendre la fin du tour
+        db_path: Base SQLite où conserver la session entre deux lancements
+    """
+    # Imports ADK et construction de l'agent en arrière-plan, pendant la saisie
+    loading = asyncio.get_running_loop().run_in_executor(None, load_agent)
+    runner = None
     
     print("🤖 Agent RAG (Retrieval-Augmented Generation) démarré!")
     print("💡 Tapez 'quit' ou 'exit' pour quitter\n")
@@ -56,6 +169,12 @@ async def main():
             if not user_input:
                 continue
             
+            if runner is None:
+                runner = await create_runner(await loading, db_path)
+
+            from google.genai import types
+            from src.rag_agent.compaction import compaction_report
+
             # Créer le message
             content = types.Content(
                 role='user',
@@ -64,6 +183,10 @@ async def main():
             
             # Exécuter l'agent
             print("\n🤔 Traitement en cours (Recherche RAG)...\n")
+            if stream:
+                await stream_response(runner, content)
+                continue
+
             events = []
             async for event in runner.run_async(
                 user_id="user123",
@@ -83,6 +206,11 @@ async def main():
                         print(f"Agent: {response.content.parts[0].text}\n")
             else:
                 print("Agent: (Pas de réponse finale)\n")
+
+            # Tokens économisés par la compaction de l'historique
+            report = compaction_report(events)
+            if report:
+                print(f"{report}\n")
                 
         except KeyboardInterrupt:
             print("\n\n👋 Au revoir!")
@@ -90,7 +218,32 @@ async def main():
         except Exception as e:
             print(f"\n❌ Erreur: {e}\n")
 
+    # Compteurs du cache modèle (MODEL_CACHE)
+    if runner is not None:
+        from src.rag_agent.model_cache import get_model_cache
+
+        cache = get_model_cache()
+        if cache is not None:
+            for agent, stats in cache.report().items():
+                print(f"💾 Cache {agent} : {stats['hits']} hits / {stats['misses']} misses")
+
+    # Écrire les événements encore en tampon avant de quitter
+    if runner is not None and db_path:
+        await runner.session_service.close()
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Afficher les réponses au fil de l'eau (agent actif, temps jusqu'au premier token)"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.getenv("SESSION_DB"),
+        help="Base SQLite des sessions, conservées entre deux lancements (défaut : $SESSION_DB)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(stream=args.stream, db_path=args.db))
 
@@ -1,36 +1,54 @@
-"""Agent avec RAG Vertex AI pour recherche contextuelle."""
+"""Agent avec RAG Vertex AI pour recherche contextuelle.
+
+``root_agent`` est construit au premier accès (PEP 562) : importer ce module
+ne charge ni ADK ni ``vertexai``, dont l'import est le plus coûteux du template.
+"""
 
 import os
-from google.adk.agents import Agent
-from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
-from vertexai.preview import rag
-
-# Récupérer le corpus RAG depuis les variables d'environnement
-rag_corpus = os.getenv("RAG_CORPUS")
-
-if not rag_corpus:
-    raise ValueError(
-        "RAG_CORPUS environment variable must be set. "
-        "Format: projects/PROJECT_ID/locations/LOCATION/ragCorpora/CORPUS_ID"
-    )
-
-# Créer l'outil RAG
-rag_retrieval_tool = VertexAiRagRetrieval(
-    name='retrieve_documentation',
-    description='Retrieve relevant documentation and reference materials from the RAG corpus',
-    rag_resources=[
-        rag.RagResource(rag_corpus=rag_corpus)
-    ],
-    similarity_top_k=10,
-    vector_distance_threshold=0.6,
-)
-
-# Créer l'agent avec RAG
-root_agent = Agent(
-    model='gemini-2.5-flash',
-    name='rag_agent',
-    description='Agent de documentation avec recherche RAG',
-    instruction="""You are a documentation assistant powered by RAG (Retrieval-Augmented Generation).
+import threading
+
+_lock = threading.Lock()
+_root_agent = None
+
+
+def build_root_agent():
+    """Construire l'agent RAG une seule fois (imports ADK et Vertex AI différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            # Récupérer le corpus RAG depuis les variables d'environnement
+            rag_corpus = os.getenv("RAG_CORPUS")
+
+            if not rag_corpus:
+                raise ValueError(
+                    "RAG_CORPUS environment variable must be set. "
+                    "Format: projects/PROJECT_ID/locations/LOCATION/ragCorpora/CORPUS_ID"
+                )
+
+            from google.adk.agents import Agent
+            from google.adk.tools.retrieval.vertex_ai_rag_retrieval import VertexAiRagRetrieval
+            from vertexai.preview import rag
+
+            from .compaction import install_history_compaction
+            from .model_cache import install_model_cache
+
+            # Créer l'outil RAG
+            rag_retrieval_tool = VertexAiRagRetrieval(
+                name='retrieve_documentation',
+                description='Retrieve relevant documentation and reference materials from the RAG corpus',
+                rag_resources=[
+                    rag.RagResource(rag_corpus=rag_corpus)
+                ],
+                similarity_top_k=10,
+                vector_distance_threshold=0.6,
+            )
+
+            # Créer l'agent avec RAG
+            _root_agent = Agent(
+                model='gemini-2.5-flash',
+                name='rag_agent',
+                description='Agent de documentation avec recherche RAG',
+                instruction="""You are a documentation assistant powered by RAG (Retrieval-Augmented Generation).
 
 Your capabilities:
 1. Answer questions using information from the RAG corpus
@@ -43,5 +61,17 @@ Guidelines:
 - Cite your sources when referencing retrieved information
 - If information is not found, clearly state that
 - Be concise but comprehensive in your answers""",
-    tools=[rag_retrieval_tool]
-)
+                tools=[rag_retrieval_tool]
+            )
+
+            # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+            install_history_compaction(_root_agent)
+            # Cache des appels modèle (désactivé sans MODEL_CACHE)
+            install_model_cache(_root_agent)
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
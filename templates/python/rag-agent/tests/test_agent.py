@@ -55,3 +55,18 @@ async def test_rag_query():
         events.append(event)
     
     assert len(events) > 0
+
+
+def test_agent_module_import_is_lazy():
+    """Test qu'importer agent.py ne charge pas ADK (construction différée)."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = {k: v for k, v in os.environ.items() if k != "ADK_FAKE_LLM"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, src.rag_agent.agent; print('google.adk' in sys.modules)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "False", result.stderr
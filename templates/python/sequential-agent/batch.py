@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Traiter un lot de demandes avec le pipeline d'écriture en file à étages.
+
+Writer, reviewer et refiner travaillent en même temps sur des demandes
+différentes (``src/sequential_agent/staged.py``), avec un nombre de workers
+par étage. Affiche l'utilisation de chaque étage et les demandes par minute.
+
+Usage :
+    python batch.py prompts.txt --workers 2,2,3 --output results.jsonl
+    cat prompts.txt | python batch.py - --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Charger le fichier .env
+env_path = Path(__file__).parent / '.env'
+if env_path.exists():
+    load_dotenv(env_path)
+
+
+def read_prompts(path: str) -> list:
+    """Une demande par ligne non vide (``-`` : entrée standard)."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+async def main(prompts: list, workers: str, output: str | None, db_path: str | None):
+    from src.sequential_agent.agent import build_root_agent
+    from src.sequential_agent.staged import StagedPipeline, parse_workers
+
+    root_agent = build_root_agent()
+    session_service = None
+    if db_path:
+        from src.sequential_agent.sqlite_session_service import SqliteSessionService
+        session_service = SqliteSessionService(db_path)
+
+    staged = StagedPipeline(
+        root_agent,
+        workers=parse_workers(workers, len(root_agent.sub_agents)),
+        session_service=session_service,
+    )
+    print(f"🏭 {len(prompts)} demandes · étages "
+          + " → ".join(f"{agent.name}×{count}"
+                       for agent, count in zip(root_agent.sub_agents, staged.workers)))
+    try:
+        result = await staged.run(prompts)
+    finally:
+        if db_path:
+            await session_service.close()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            for index, (prompt, text) in enumerate(zip(prompts, result.outputs)):
+                f.write(json.dumps({
+                    "prompt": prompt,
+                    "output": text,
+                    "error": result.errors.get(index),
+                }, ensure_ascii=False) + "\n")
+    print(result.report())
+
+    from src.sequential_agent.model_router import get_model_router
+
+    router = get_model_router()
+    if router is not None:
+        for agent, stats in router.report().items():
+            print(f"🔀 Routeur {agent} : {stats['fast']} flash / {stats['strong']} pro "
+                  f"(≈ {stats['saved_ms'] / 1000:.1f} s économisées)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prompts", help="Fichier de demandes, une par ligne (- : entrée standard)")
+    parser.add_argument(
+        "--workers",
+        default=os.getenv("BATCH_WORKERS", "1"),
+        help="Workers par étage : 2 (tous) ou 2,2,3 (writer,reviewer,refiner) "
+             "(défaut : $BATCH_WORKERS, sinon 1)"
+    )
+    parser.add_argument("--output", help="Fichier JSONL des sorties (prompt, output, error)")
+    parser.add_argument(
+        "--db",
+        default=os.getenv("SESSION_DB"),
+        help="Base SQLite des sessions du lot (défaut : $SESSION_DB, sinon en mémoire)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(read_prompts(args.prompts), args.workers, args.output, args.db))
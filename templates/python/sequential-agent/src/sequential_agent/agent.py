@@ -1,11 +1,43 @@
-"""Pipeline séquentiel : Writer → Reviewer → Refiner."""
+"""Pipeline séquentiel : Writer → Reviewer → Refiner.
 
-from google.adk.agents import Agent, SequentialAgent
-from .sub_agents import writer_agent, reviewer_agent, refiner_agent
+``root_agent`` est construit au premier accès (PEP 562) : importer ce module
+ne charge pas ADK et ne crée pas les sous-agents.
+"""
 
-# Créer le pipeline séquentiel
-root_agent = SequentialAgent(
-    name="writing_pipeline",
-    description="Pipeline séquentiel pour génération de contenu avec validation",
-    sub_agents=[writer_agent, reviewer_agent, refiner_agent]
-)
+import threading
+
+_lock = threading.Lock()
+_root_agent = None
+
+
+def build_root_agent():
+    """Construire le pipeline une seule fois (imports ADK différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            from google.adk.agents import SequentialAgent
+            from .compaction import install_history_compaction
+            from .model_cache import install_model_cache
+            from .model_router import install_model_router
+            from .sub_agents import writer_agent, reviewer_agent, refiner_agent
+
+            # Créer le pipeline séquentiel
+            _root_agent = SequentialAgent(
+                name="writing_pipeline",
+                description="Pipeline séquentiel pour génération de contenu avec validation",
+                sub_agents=[writer_agent, reviewer_agent, refiner_agent]
+            )
+
+            # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+            install_history_compaction(_root_agent)
+            # Cache des appels modèle (désactivé sans MODEL_CACHE)
+            install_model_cache(_root_agent)
+            # Flash ou pro choisi à chaque appel du refiner (désactivé sans MODEL_ROUTER)
+            install_model_router(_root_agent)
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
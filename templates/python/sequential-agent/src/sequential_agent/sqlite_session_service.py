@@ -0,0 +1,528 @@
+"""Service de sessions durable basé sur SQLite.
+
+Remplaçant direct d'``InMemorySessionService`` : les sessions survivent aux
+redémarrages et l'historique ne reste pas indéfiniment en mémoire.
+
+- Base en mode WAL (``synchronous=NORMAL``) : lectures pendant les écritures
+- Ajouts d'événements groupés : les événements sont mis en tampon puis écrits
+  en une seule transaction quand le lot est plein, après ``flush_interval``
+  secondes, avant toute lecture, ou sur ``flush()`` / ``close()``
+  ; un lot dont l'écriture échoue reste en tampon et sera réessayé
+- Index sur ``(app_name, user_id, session_id)`` pour les sessions et événements
+- Chargement partiel de l'historique : avec ``recent_events``, ``get_session``
+  ne désérialise que les N derniers événements ; ``load_events`` pagine le reste
+- Toutes les opérations SQLite s'exécutent dans un thread dédié : la boucle
+  d'événements du Runner n'est jamais bloquée par le disque
+
+L'état est stocké comme dans les services ADK : clés ``app:`` par application,
+``user:`` par utilisateur, clés ``temp:`` jamais persistées.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_session
+    ON events (app_name, user_id, session_id);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _split_state(delta: dict) -> tuple:
+    """Séparer un delta d'état en (app, user, session), sans les clés temp:."""
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in delta.items():
+        if key.startswith(State.APP_PREFIX):
+            app_state[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+def _merge_state(app_state: dict, user_state: dict, session_state: dict) -> dict:
+    merged = dict(session_state)
+    merged.update({State.APP_PREFIX + k: v for k, v in app_state.items()})
+    merged.update({State.USER_PREFIX + k: v for k, v in user_state.items()})
+    return merged
+
+
+class SqliteSessionService(BaseSessionService):
+    """Service de sessions persistant dans un fichier SQLite.
+
+    Args:
+        db_path: Chemin du fichier SQLite (``":memory:"`` pour les tests)
+        batch_size: Nombre d'événements en tampon avant écriture (1 = écriture
+            immédiate à chaque événement)
+        flush_interval: Délai maximal (s) avant écriture d'un lot incomplet
+        recent_events: Nombre d'événements chargés par défaut par
+            ``get_session`` (None = tout l'historique)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "sessions.db",
+        batch_size: int = 32,
+        flush_interval: float = 0.05,
+        recent_events: Optional[int] = None,
+    ):
+        self.db_path = str(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.recent_events = recent_events
+
+        # Une seule connexion, possédée par un seul thread : écritures sérialisées
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-sessions")
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Tampons d'écriture
+        self._pending_events: list = []
+        self._pending_sessions: dict = {}
+        self._pending_app_states: dict = {}
+        self._pending_user_states: dict = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Écriture différée en cours (référence gardée jusqu'à sa fin)
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Accès SQLite (thread dédié)
+    # ------------------------------------------------------------------
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _load_json_state(conn, query: str, params: tuple) -> dict:
+        row = conn.execute(query, params).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _read_scoped_states(self, conn, app_name: str, user_id: str) -> tuple:
+        app_state = self._load_json_state(
+            conn, "SELECT state FROM app_states WHERE app_name = ?", (app_name,)
+        )
+        user_state = self._load_json_state(
+            conn, "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id)
+        )
+        return app_state, user_state
+
+    @staticmethod
+    def _upsert_delta(conn, table: str, keys: dict, delta: dict) -> None:
+        """Fusionner ``delta`` dans l'état JSON d'une ligne (créée si absente)."""
+        where = " AND ".join(f"{k} = ?" for k in keys)
+        row = conn.execute(f"SELECT state FROM {table} WHERE {where}", tuple(keys.values())).fetchone()
+        state = json.loads(row[0]) if row else {}
+        state.update(delta)
+        columns = ", ".join([*keys, "state"])
+        placeholders = ", ".join("?" * (len(keys) + 1))
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+            (*keys.values(), json.dumps(state)),
+        )
+
+    def _write_batch(self, events: list, sessions: dict, app_states: dict, user_states: dict) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, event_id, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                events,
+            )
+            for (app_name, user_id, session_id), (delta, update_time) in sessions.items():
+                row = conn.execute(
+                    "SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (app_name, user_id, session_id),
+                ).fetchone()
+                if row is None:
+                    continue  # Session supprimée entre-temps
+                state = json.loads(row[0])
+                state.update(delta)
+                conn.execute(
+                    "UPDATE sessions SET state = ?, update_time = ? "
+                    "WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (json.dumps(state), update_time, app_name, user_id, session_id),
+                )
+            for app_name, delta in app_states.items():
+                self._upsert_delta(conn, "app_states", {"app_name": app_name}, delta)
+            for (app_name, user_id), delta in user_states.items():
+                self._upsert_delta(
+                    conn, "user_states", {"app_name": app_name, "user_id": user_id}, delta
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # API BaseSessionService
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        await self.flush()
+        session_id = session_id.strip() if session_id and session_id.strip() else uuid.uuid4().hex
+        app_delta, user_delta, session_state = _split_state(state or {})
+        now = time.time()
+
+        def create() -> tuple:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = conn.execute(
+                    "SELECT 1 FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (app_name, user_id, session_id),
+                ).fetchone()
+                if exists:
+                    raise ValueError(f"Session with id {session_id} already exists.")
+                conn.execute(
+                    "INSERT INTO sessions (app_name, user_id, id, state, create_time, update_time) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (app_name, user_id, session_id, json.dumps(session_state), now, now),
+                )
+                if app_delta:
+                    self._upsert_delta(conn, "app_states", {"app_name": app_name}, app_delta)
+                if user_delta:
+                    self._upsert_delta(
+                        conn, "user_states", {"app_name": app_name, "user_id": user_id}, user_delta
+                    )
+                scoped = self._read_scoped_states(conn, app_name, user_id)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return scoped
+
+        app_state, user_state = await self._run(create)
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=_merge_state(app_state, user_state, session_state),
+            events=[],
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+        limit = self.recent_events
+        after_timestamp = None
+        if config is not None:
+            if config.num_recent_events is not None:
+                limit = config.num_recent_events
+            after_timestamp = config.after_timestamp
+
+        def read() -> Optional[tuple]:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT state, update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            app_state, user_state = self._read_scoped_states(conn, app_name, user_id)
+
+            query = "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+            params: list = [app_name, user_id, session_id]
+            if after_timestamp is not None:
+                query += " AND timestamp >= ?"
+                params.append(after_timestamp)
+            query += " ORDER BY rowid DESC"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            # Désérialisation dans le thread SQLite, du plus ancien au plus récent
+            events = [Event.model_validate_json(data) for (data,) in conn.execute(query, params)]
+            events.reverse()
+            return json.loads(row[0]), row[1], app_state, user_state, events
+
+        result = await self._run(read)
+        if result is None:
+            return None
+        session_state, update_time, app_state, user_state, events = result
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=_merge_state(app_state, user_state, session_state),
+            events=events,
+            last_update_time=update_time,
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush()
+
+        def read() -> list:
+            query = "SELECT user_id, id, update_time FROM sessions WHERE app_name = ?"
+            params: list = [app_name]
+            if user_id is not None:
+                query += " AND user_id = ?"
+                params.append(user_id)
+            query += " ORDER BY update_time, user_id, id"
+            return self._connection().execute(query, params).fetchall()
+
+        rows = await self._run(read)
+        return ListSessionsResponse(sessions=[
+            Session(id=sid, app_name=app_name, user_id=uid, state={}, events=[],
+                    last_update_time=update_time)
+            for uid, sid, update_time in rows
+        ])
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.flush()
+
+        def delete() -> None:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    (app_name, user_id, session_id),
+                )
+                conn.execute(
+                    "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (app_name, user_id, session_id),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(delete)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        await self.flush()
+
+        def read() -> dict:
+            return self._read_scoped_states(self._connection(), app_name, user_id)[1]
+
+        return await self._run(read)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Mise à jour de la session en mémoire (état, clés temp:, liste d'événements)
+        event = await super().append_event(session, event)
+        session.last_update_time = event.timestamp
+
+        self._pending_events.append((
+            session.app_name, session.user_id, session.id,
+            event.id, event.timestamp, event.model_dump_json(exclude_none=True),
+        ))
+        delta = event.actions.state_delta if event.actions else {}
+        app_delta, user_delta, session_delta = _split_state(delta or {})
+        key = (session.app_name, session.user_id, session.id)
+        pending_delta, _ = self._pending_sessions.get(key, ({}, 0.0))
+        pending_delta.update(session_delta)
+        self._pending_sessions[key] = (pending_delta, event.timestamp)
+        if app_delta:
+            self._pending_app_states.setdefault(session.app_name, {}).update(app_delta)
+        if user_delta:
+            self._pending_user_states.setdefault(
+                (session.app_name, session.user_id), {}
+            ).update(user_delta)
+
+        if len(self._pending_events) >= self.batch_size:
+            await self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._start_deferred_flush
+            )
+        return event
+
+    def _start_deferred_flush(self) -> None:
+        """Lancer l'écriture différée ; la tâche est gardée jusqu'à sa fin."""
+        self._flush_handle = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        task.add_done_callback(self._deferred_flush_done)
+        self._flush_task = task
+
+    def _deferred_flush_done(self, task: asyncio.Task) -> None:
+        if self._flush_task is task:
+            self._flush_task = None
+        if task.cancelled() or task.exception() is None:
+            return
+        # Personne n'attend cette tâche : journaliser ; le lot reste en tampon
+        # et sera réessayé au prochain flush (au plus tard dans close())
+        logger.error("Écriture différée des événements en échec", exc_info=task.exception())
+
+    def _restore_batch(self, events: list, sessions: dict, app_states: dict,
+                       user_states: dict) -> None:
+        """Remettre en tampon un lot non écrit, avant les entrées arrivées depuis."""
+        self._pending_events = events + self._pending_events
+        for key, (delta, update_time) in self._pending_sessions.items():
+            previous, _ = sessions.get(key, ({}, 0.0))
+            previous.update(delta)
+            sessions[key] = (previous, update_time)
+        self._pending_sessions = sessions
+        for merged, newer in ((app_states, self._pending_app_states),
+                              (user_states, self._pending_user_states)):
+            for key, delta in newer.items():
+                merged.setdefault(key, {}).update(delta)
+        self._pending_app_states, self._pending_user_states = app_states, user_states
+
+    # ------------------------------------------------------------------
+    # Extensions
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Écrire les événements et deltas d'état en tampon (une transaction).
+
+        En cas d'échec, le lot est remis en tampon (réessayé au prochain appel)
+        et l'erreur est propagée.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending_events and not self._pending_sessions:
+            return
+
+        batch = (
+            self._pending_events, self._pending_sessions,
+            self._pending_app_states, self._pending_user_states,
+        )
+        # Tampons neufs pendant l'écriture : les événements ajoutés entre-temps
+        # iront dans le lot suivant
+        self._pending_events, self._pending_sessions = [], {}
+        self._pending_app_states, self._pending_user_states = {}, {}
+        try:
+            await self._run(self._write_batch, *batch)
+        except BaseException:
+            self._restore_batch(*batch)
+            raise
+
+    async def load_events(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[Event]:
+        """Charger une page d'historique, en remontant depuis les plus récents.
+
+        ``offset=0`` renvoie les ``limit`` derniers événements, ``offset=limit``
+        la page précédente, etc. (toujours du plus ancien au plus récent).
+        """
+        await self.flush()
+
+        def read() -> list:
+            rows = self._connection().execute(
+                "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? "
+                "ORDER BY rowid DESC LIMIT ? OFFSET ?",
+                (app_name, user_id, session_id, limit, offset),
+            ).fetchall()
+            return [Event.model_validate_json(data) for (data,) in reversed(rows)]
+
+        return await self._run(read)
+
+    async def count_events(self, *, app_name: str, user_id: str, session_id: str) -> int:
+        """Nombre d'événements stockés pour une session."""
+        await self.flush()
+
+        def count() -> int:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()[0]
+
+        return await self._run(count)
+
+    async def close(self) -> None:
+        """Écrire les tampons puis fermer la base.
+
+        Lève ``RuntimeError`` si les tampons ne peuvent toujours pas être écrits
+        (événements perdus).
+        """
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        unwritten = len(self._pending_events)
+        error = None
+        try:
+            await self.flush()
+        except Exception as e:
+            error = e
+
+        def close() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        await self._run(close)
+        self._executor.shutdown(wait=True)
+        if error is not None:
+            raise RuntimeError(
+                f"Écriture des événements en échec : {unwritten} événement(s) perdu(s)"
+            ) from error
@@ -0,0 +1,259 @@
+"""Mode débit : ``writing_pipeline`` exécuté comme une file à étages.
+
+``SequentialAgent`` traite une demande à la fois : tant que le refiner
+travaille sur la demande k, writer et reviewer attendent. ``StagedPipeline``
+découpe le pipeline en étages (un par sous-agent) reliés par des files
+``asyncio.Queue`` :
+
+- chaque étage a ses propres workers (nombre configurable par étage)
+- chaque demande a sa session ; un étage exécute son sous-agent sur la
+  session de la demande, puis la passe à l'étage suivant
+- pendant que la demande k est affinée, k+1 est relue et k+2 rédigée
+
+Le message utilisateur est ajouté une seule fois, par le premier étage
+(``Runner``) ; les étages suivants s'exécutent sur la session de la demande
+sans nouveau tour utilisateur. Chaque sous-agent voit ainsi le même historique
+et le même état (``generated_content``, ``review_feedback``) que dans
+``writing_pipeline``. Une demande en erreur quitte la file sans bloquer les
+suivantes.
+
+Rapport : utilisation de chaque étage (temps occupé / temps disponible des
+workers) et demandes traitées par minute.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from google.adk.agents.invocation_context import InvocationContext, new_invocation_context_id
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+    from google.adk.sessions import BaseSessionService
+
+logger = logging.getLogger(__name__)
+
+
+def parse_workers(spec: str, stages: int) -> list:
+    """Workers par étage depuis ``"2"`` (tous les étages) ou ``"2,3,1"``."""
+    counts = [int(part) for part in spec.split(",") if part.strip()]
+    if len(counts) == 1:
+        counts = counts * stages
+    if len(counts) != stages or min(counts) < 1:
+        raise ValueError(
+            f"Workers par étage invalides : {spec!r} ({stages} étages, au moins 1 chacun)"
+        )
+    return counts
+
+
+@dataclass
+class StageStats:
+    """Compteurs d'un étage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    errors: int = 0
+    busy_s: float = 0.0
+
+    def utilization(self, wall_s: float) -> float:
+        """Part du temps des workers passée à traiter une demande (0..1)."""
+        if wall_s <= 0:
+            return 0.0
+        return min(self.busy_s / (self.workers * wall_s), 1.0)
+
+
+@dataclass
+class BatchResult:
+    """Sorties et compteurs d'un lot."""
+
+    outputs: list
+    errors: dict = field(default_factory=dict)
+    stages: list = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for output in self.outputs if output is not None)
+
+    @property
+    def prompts_per_minute(self) -> float:
+        return self.completed / self.wall_s * 60 if self.wall_s > 0 else 0.0
+
+    def report(self) -> str:
+        """Résumé lisible : débit global puis utilisation par étage."""
+        lines = [
+            f"📦 {self.completed}/{len(self.outputs)} demandes en {self.wall_s:.2f} s "
+            f"({self.prompts_per_minute:.1f} demandes/min)"
+        ]
+        for stage in self.stages:
+            errors = f", {stage.errors} erreurs" if stage.errors else ""
+            lines.append(
+                f"   {stage.name:<10} {stage.workers} workers · "
+                f"utilisation {stage.utilization(self.wall_s):.0%} · "
+                f"{stage.processed} traitées{errors}"
+            )
+        return "\n".join(lines)
+
+
+class StagedPipeline:
+    """Exécute les sous-agents d'un pipeline séquentiel en file à étages.
+
+    Args:
+        pipeline: Pipeline séquentiel (un étage par sous-agent)
+        workers: Workers par étage (un entier pour tous, ou un par étage)
+        session_service: Service des sessions des demandes (défaut : en mémoire)
+        app_name: Nom d'application des sessions
+        user_id: Utilisateur des sessions du lot
+        output_key: Clé d'état de la sortie finale (défaut : celle du dernier étage)
+    """
+
+    def __init__(
+        self,
+        pipeline: BaseAgent,
+        workers: int | Sequence[int] = 1,
+        session_service: Optional[BaseSessionService] = None,
+        app_name: str = "agents",
+        user_id: str = "batch",
+        output_key: Optional[str] = None,
+    ):
+        stages = list(pipeline.sub_agents)
+        if not stages:
+            raise ValueError(f"{pipeline.name} n'a aucun sous-agent à exécuter en étages")
+        counts = [workers] * len(stages) if isinstance(workers, int) else list(workers)
+        if len(counts) != len(stages) or min(counts) < 1:
+            raise ValueError(f"Workers par étage invalides : {counts} ({len(stages)} étages)")
+
+        self.session_service = session_service or InMemorySessionService()
+        self.app_name = app_name
+        self.user_id = user_id
+        self.output_key = output_key or getattr(stages[-1], "output_key", None)
+        self._stages = stages
+        self._workers = counts
+        # Le premier étage reçoit le message utilisateur par un Runner
+        self._runner = Runner(
+            agent=stages[0], app_name=app_name, session_service=self.session_service
+        )
+
+    @property
+    def workers(self) -> list:
+        """Workers par étage, dans l'ordre du pipeline."""
+        return list(self._workers)
+
+    async def run(self, prompts: Sequence[str], session_prefix: str = "batch") -> BatchResult:
+        """Traiter ``prompts`` ; les sorties sont dans l'ordre des demandes."""
+        stats = [
+            StageStats(name=stage.name, workers=count)
+            for stage, count in zip(self._stages, self._workers)
+        ]
+        result = BatchResult(outputs=[None] * len(prompts), stages=stats)
+        queues = [asyncio.Queue() for _ in self._stages]
+
+        async def worker(index: int) -> None:
+            queue = queues[index]
+            while True:
+                item = await queue.get()
+                session_id = f"{session_prefix}_{item}"
+                try:
+                    ok = await self._run_stage(index, item, prompts[item], session_id,
+                                               stats[index], result)
+                    if ok and index + 1 < len(queues):
+                        queues[index + 1].put_nowait(item)
+                    elif ok:
+                        result.outputs[item] = await self._output(session_id)
+                except Exception as e:
+                    # Erreur hors du sous-agent (ex. lecture de la sortie) : la
+                    # demande quitte la file, le worker continue
+                    stats[index].errors += 1
+                    result.errors[item] = f"{stats[index].name}: {e}"
+                    logger.warning("Demande %d en erreur à l'étage %s : %s",
+                                   item, stats[index].name, e)
+                finally:
+                    queue.task_done()
+
+        start = time.perf_counter()
+        for item in range(len(prompts)):
+            queues[0].put_nowait(item)
+        tasks = [
+            asyncio.create_task(worker(index))
+            for index, count in enumerate(self._workers)
+            for _ in range(count)
+        ]
+        try:
+            # Une demande passe à l'étage suivant avant task_done : joindre
+            # les files dans l'ordre attend la fin de tout le lot
+            for queue in queues:
+                await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        result.wall_s = time.perf_counter() - start
+        return result
+
+    async def _run_stage(self, index: int, item: int, prompt: str, session_id: str,
+                         stats: StageStats, result: BatchResult) -> bool:
+        """Exécuter l'étage ``index`` pour une demande ; False en cas d'erreur."""
+        started = time.perf_counter()
+        try:
+            content = types.Content(role="user", parts=[types.Part(text=prompt)])
+            if index == 0:
+                await self.session_service.create_session(
+                    app_name=self.app_name, user_id=self.user_id, session_id=session_id
+                )
+                async for _ in self._runner.run_async(
+                    user_id=self.user_id, session_id=session_id, new_message=content
+                ):
+                    pass
+            else:
+                await self._continue(self._stages[index], session_id, content)
+        except Exception as e:
+            stats.errors += 1
+            result.errors[item] = f"{stats.name}: {e}"
+            logger.warning("Demande %d en erreur à l'étage %s : %s", item, stats.name, e)
+            return False
+        finally:
+            stats.busy_s += time.perf_counter() - started
+        stats.processed += 1
+        return True
+
+    async def _continue(self, stage: BaseAgent, session_id: str,
+                        content: types.Content) -> None:
+        """Exécuter ``stage`` sur la session, sans nouveau tour utilisateur.
+
+        Comme ``SequentialAgent`` avec ses sous-agents : même session, les
+        événements produits y sont ajoutés au fil de l'exécution.
+        """
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        )
+        if session is None:
+            raise ValueError(f"Session {session_id} introuvable")
+        ctx = InvocationContext(
+            session_service=self.session_service,
+            invocation_id=new_invocation_context_id(),
+            agent=stage,
+            session=session,
+            user_content=content,
+            run_config=RunConfig(),
+        )
+        async for event in stage.run_async(ctx):
+            if not event.partial:
+                await self.session_service.append_event(session, event)
+
+    async def _output(self, session_id: str) -> Optional[str]:
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=self.user_id, session_id=session_id
+        )
+        if session is None or self.output_key is None:
+            return None
+        output = session.state.get(self.output_key)
+        return None if output is None else str(output)
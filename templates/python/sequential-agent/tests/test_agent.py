@@ -1,5 +1,6 @@
 """Tests pour le pipeline séquentiel."""
 
+import os
 import pytest
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
@@ -69,3 +70,18 @@ def test_sub_agents_order():
     assert sub_agents[0].name == "writer"
     assert sub_agents[1].name == "reviewer"
     assert sub_agents[2].name == "refiner"
+
+
+def test_agent_module_import_is_lazy():
+    """Test qu'importer agent.py ne charge pas ADK (construction différée)."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = {k: v for k, v in os.environ.items() if k != "ADK_FAKE_LLM"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, src.sequential_agent.agent; print('google.adk' in sys.modules)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "False", result.stderr
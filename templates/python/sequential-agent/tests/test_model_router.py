@@ -0,0 +1,55 @@
+"""Tests pour le routeur de modèles flash / pro du refiner."""
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from src.sequential_agent.fake_llm import CALL_COUNTS
+from src.sequential_agent.model_router import (
+    DEFAULT_POLICIES,
+    ModelRouter,
+    RoutedLlm,
+    RoutePolicy,
+    install_model_router,
+)
+
+FLASH, PRO = "gemini-2.5-flash", "gemini-2.5-pro"
+
+
+def test_policy_decision_rules():
+    """Test : entrée courte → flash, longue → pro, seuil relevé quand pro est lent."""
+    policy = RoutePolicy(max_fast_tokens=100, latency_budget_ms=1000)
+    assert (policy.decide(80)[0], policy.decide(150)[0]) == (FLASH, PRO)
+    assert policy.decide(10, quality="high")[0] == PRO
+    assert policy.decide(150, strong_latency_ms=2500)[0] == FLASH
+    assert set(DEFAULT_POLICIES) == {"refiner"}
+    with pytest.raises(ValueError):
+        RoutePolicy(quality="premium")
+
+
+@pytest.mark.asyncio
+async def test_refiner_is_routed_per_call():
+    """Test : seul le refiner est routé ; contenu court sur flash, long sur pro."""
+    writer = Agent(name="writer", model=FLASH, instruction="Write.",
+                   output_key="generated_content")
+    refiner = Agent(name="refiner", model=PRO, instruction="Refine: {generated_content}",
+                    output_key="final_content")
+    pipeline = SequentialAgent(name="writing_pipeline", sub_agents=[writer, refiner])
+    router = install_model_router(pipeline, ModelRouter({"refiner": {"max_fast_tokens": 300}}))
+    assert isinstance(refiner.model, RoutedLlm) and writer.model == FLASH
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="agents", session_service=session_service)
+    for session_id, prompt in (("short", "A haiku"), ("long", "An essay. " * 300)):
+        await session_service.create_session(app_name="agents", user_id="u",
+                                             session_id=session_id)
+        content = types.Content(role="user", parts=[types.Part(text=prompt)])
+        async for _ in runner.run_async(user_id="u", session_id=session_id, new_message=content):
+            pass
+
+    report = router.report()
+    assert (report["refiner"]["fast"], report["refiner"]["strong"]) == (1, 1)
+    assert list(report) == ["refiner"]
+    assert CALL_COUNTS[PRO] >= 1
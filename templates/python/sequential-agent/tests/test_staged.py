@@ -0,0 +1,125 @@
+"""Tests pour le mode débit (pipeline en file à étages)."""
+
+import asyncio
+
+import pytest
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+from src.sequential_agent.staged import StagedPipeline, parse_workers
+
+# Appels modèle en cours (``now``) et maximum observé
+ACTIVE = {"now": 0, "max": 0}
+# Rôles et textes des requêtes reçues, par étage
+SEEN: dict = {}
+
+
+class StageLlm(BaseLlm):
+    """Modèle de test : répond ``<étage>(<demande>)`` après ``delay`` s.
+
+    ``ACTIVE`` est partagé par les étages : le maximum observé indique si
+    plusieurs étages travaillent en même temps.
+    """
+
+    delay: float = 0.02
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        SEEN[self.model] = [(c.role, c.parts[0].text) for c in llm_request.contents]
+        prompt = llm_request.contents[0].parts[0].text
+        if "boom" in prompt and self.model == "reviewer":
+            raise RuntimeError("reviewer indisponible")
+        ACTIVE["now"] += 1
+        ACTIVE["max"] = max(ACTIVE["max"], ACTIVE["now"])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            ACTIVE["now"] -= 1
+        text = f"{self.model}({prompt})"
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def build_pipeline() -> SequentialAgent:
+    def stage(name, key):
+        return Agent(name=name, model=StageLlm(model=name),
+                     instruction=f"{name}.", output_key=key)
+
+    return SequentialAgent(name="writing_pipeline", sub_agents=[
+        stage("writer", "generated_content"),
+        stage("reviewer", "review_feedback"),
+        stage("refiner", "final_content"),
+    ])
+
+
+def test_parse_workers():
+    """Test : un nombre pour tous les étages, ou un par étage."""
+    assert parse_workers("2", 3) == [2, 2, 2]
+    assert parse_workers("1, 2,4", 3) == [1, 2, 4]
+    for bad in ("1,2", "0", "2,0,1"):
+        with pytest.raises(ValueError):
+            parse_workers(bad, 3)
+
+
+@pytest.mark.asyncio
+async def test_stages_overlap_and_outputs_keep_prompt_order():
+    """Test : les étages travaillent en même temps, sorties dans l'ordre des demandes."""
+    ACTIVE["max"] = 0
+    staged = StagedPipeline(build_pipeline(), workers=[2, 1, 1])
+    prompts = [f"prompt {i}" for i in range(6)]
+    result = await staged.run(prompts)
+
+    assert result.outputs == [f"refiner({p})" for p in prompts]
+    assert ACTIVE["max"] > 1
+    assert [stage.processed for stage in result.stages] == [6, 6, 6]
+    assert all(0 < stage.utilization(result.wall_s) <= 1 for stage in result.stages)
+    assert result.prompts_per_minute > 0
+    assert "6/6 demandes" in result.report()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_leaves_the_queue_without_blocking_others():
+    """Test : une erreur à un étage n'arrête que la demande concernée."""
+    staged = StagedPipeline(build_pipeline(), workers=1)
+    result = await staged.run(["first", "boom", "last"])
+
+    assert result.outputs == ["refiner(first)", None, "refiner(last)"]
+    assert list(result.errors) == [1]
+    assert result.errors[1].startswith("reviewer:")
+    assert [stage.errors for stage in result.stages] == [0, 1, 0]
+    assert result.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_later_stages_see_the_pipeline_history():
+    """Test : un seul tour utilisateur, les étages suivants voient le contexte du pipeline."""
+    staged = StagedPipeline(build_pipeline(), workers=1)
+    result = await staged.run(["story about rain"])
+    assert result.outputs == ["refiner(story about rain)"]
+
+    prompt = ("user", "story about rain")
+    for stage in ("writer", "reviewer", "refiner"):
+        assert SEEN[stage].count(prompt) == 1
+    assert SEEN["reviewer"][0] == prompt and len(SEEN["reviewer"]) == 2
+    assert SEEN["refiner"][-1] != prompt and len(SEEN["refiner"]) == 3
+
+    session = await staged.session_service.get_session(app_name="agents", user_id="batch",
+                                                       session_id="batch_0")
+    assert [event.author for event in session.events] == ["user", "writer", "reviewer",
+                                                          "refiner"]
+
+
+@pytest.mark.asyncio
+async def test_output_error_does_not_stop_the_worker():
+    """Test : une erreur de lecture de la sortie n'arrête que la demande concernée."""
+    staged = StagedPipeline(build_pipeline(), workers=1)
+    output = staged._output
+
+    async def flaky_output(session_id):
+        if session_id == "batch_0":
+            raise RuntimeError("database is locked")
+        return await output(session_id)
+
+    staged._output = flaky_output
+    result = await asyncio.wait_for(staged.run(["first", "second"]), timeout=5)
+    assert result.outputs == [None, "refiner(second)"]
+    assert result.errors[0] == "refiner: database is locked"
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark hors-ligne du backend météo (cache, coalescence, latence).
+
+Démarre le stub météo en processus, puis envoie des vagues d'appels
+concurrents à ``get_weather`` avec une distribution de villes biaisée
+(quelques villes très demandées). Affiche le taux de hit, le nombre
+d'appels amont et les latences p50/p99, avec et sans cache.
+
+Usage :
+    python benchmarks/bench_weather.py --requests 5000 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.simple_agent.weather_backend import (  # noqa: E402
+    CachedWeatherProvider,
+    HttpWeatherProvider,
+    WeatherProvider,
+)
+from weather_stub_server import STUB_DATA, WeatherStubServer  # noqa: E402
+
+
+def percentile(values: list, pct: float) -> float:
+    """Percentile par rang le plus proche."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(provider: WeatherProvider, requests: int, concurrency: int, seed: int) -> list:
+    """Envoyer ``requests`` appels avec au plus ``concurrency`` en vol."""
+    rng = random.Random(seed)
+    cities = [c.title() for c in STUB_DATA]
+    # Distribution de Zipf approximative : la 1re ville domine le trafic
+    weights = [1 / (rank + 1) for rank in range(len(cities))]
+    queries = [
+        (rng.choices(cities, weights)[0], rng.choice(["celsius", "fahrenheit"]))
+        for _ in range(requests)
+    ]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(city: str, units: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await provider.fetch(city, units)
+            latencies.append(time.perf_counter() - start)
+            assert result["status"] == "success", result
+
+    await asyncio.gather(*(one(city, units) for city, units in queries))
+    return latencies
+
+
+async def scenario(name: str, cached: bool, args) -> None:
+    server = WeatherStubServer(latency_ms=args.latency_ms)
+    await server.start()
+
+    http = HttpWeatherProvider(server.url, max_connections=args.concurrency)
+    provider: WeatherProvider = (
+        CachedWeatherProvider(http, ttl=args.ttl, max_entries=args.cache_size)
+        if cached else http
+    )
+
+    start = time.perf_counter()
+    latencies = await run_load(provider, args.requests, args.concurrency, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n📊 {name}")
+    print(f"   Requêtes          : {args.requests} (concurrence {args.concurrency})")
+    print(f"   Appels amont      : {server.request_count}")
+    if cached:
+        stats = provider.stats
+        print(f"   Hits / coalescés  : {stats.hits} / {stats.coalesced} (misses {stats.misses})")
+        print(f"   Taux de hit       : {stats.hit_rate:.1%}")
+    print(f"   Débit             : {args.requests / elapsed:,.0f} req/s")
+    print(f"   Latence p50 / p99 : {statistics.median(latencies) * 1000:.1f} ms"
+          f" / {percentile(latencies, 99) * 1000:.1f} ms")
+
+    await provider.aclose()
+    await server.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark du backend météo")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--ttl", type=float, default=300.0)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    await scenario("Sans cache (client HTTP poolé)", cached=False, args=args)
+    await scenario("Avec cache TTL/LRU + coalescence", cached=True, args=args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
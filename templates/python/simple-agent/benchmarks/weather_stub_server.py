@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Serveur HTTP local simulant une API météo (mesures hors-ligne).
+
+Répond à ``GET /weather?city=...&units=...`` avec une latence configurable
+et compte les requêtes reçues, ce qui permet de mesurer l'effet du cache et
+de la coalescence sans réseau.
+
+Usage :
+    python benchmarks/weather_stub_server.py --port 8765 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+# Données identiques au mock du template, en °C
+STUB_DATA = {
+    "paris": {"temp": 15, "condition": "cloudy"},
+    "london": {"temp": 12, "condition": "rainy"},
+    "new york": {"temp": 20, "condition": "sunny"},
+    "tokyo": {"temp": 18, "condition": "partly cloudy"},
+    "berlin": {"temp": 11, "condition": "windy"},
+    "madrid": {"temp": 22, "condition": "sunny"},
+    "rome": {"temp": 19, "condition": "sunny"},
+    "sydney": {"temp": 24, "condition": "clear"},
+}
+
+
+class WeatherStubServer:
+    """Mini serveur HTTP/1.1 (keep-alive) basé sur ``asyncio.start_server``."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 50.0):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000
+        self.request_count = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                # Ignorer les en-têtes
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+
+                self.request_count += 1
+                _, target, _ = request_line.decode().split(" ", 2)
+                status, body = await self._route(target)
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "Connection: keep-alive\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, target: str) -> tuple:
+        url = urlsplit(target)
+        if url.path != "/weather":
+            return "404 Not Found", {"error": "not found"}
+
+        query = parse_qs(url.query)
+        city = query.get("city", [""])[0]
+        units = query.get("units", ["celsius"])[0]
+
+        await asyncio.sleep(self.latency)
+
+        data = STUB_DATA.get(city.lower())
+        if data is None:
+            return "404 Not Found", {"error": f"unknown city {city}"}
+
+        temp = data["temp"]
+        if units == "fahrenheit":
+            temp = (temp * 9/5) + 32
+        return "200 OK", {"temperature": temp, "condition": data["condition"]}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stub d'API météo local")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    server = WeatherStubServer(args.host, args.port, args.latency_ms)
+    await server.start()
+    print(f"🌦️  Stub météo sur {server.url} (latence {args.latency_ms} ms)")
+    print(f"   export WEATHER_API_URL={server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,19 +1,50 @@
-"""Agent principal simple avec capacité météo."""
+"""Agent principal simple avec capacité météo.
 
-from google.adk.agents import Agent
-from .tools import get_weather_tool
+``root_agent`` est construit au premier accès (PEP 562) : importer ce module
+ne charge pas ADK, ce qui réduit le démarrage de la CLI et des instances
+déployées.
+"""
 
-root_agent = Agent(
-    model="gemini-2.5-flash",
-    name="simple_agent",
-    description="Agent simple avec capacité de fournir des informations météo",
-    instruction="""You are a helpful assistant that can provide weather information.
+import threading
+
+_lock = threading.Lock()
+_root_agent = None
+
+
+def build_root_agent():
+    """Construire l'agent principal une seule fois (imports ADK différés)."""
+    global _root_agent
+    with _lock:
+        if _root_agent is None:
+            from google.adk.agents import Agent
+            from .compaction import install_history_compaction
+            from .model_cache import install_model_cache
+            from .tools import get_weather_batch_tool, get_weather_tool
+
+            _root_agent = Agent(
+                model="gemini-2.5-flash",
+                name="simple_agent",
+                description="Agent simple avec capacité de fournir des informations météo",
+                instruction="""You are a helpful assistant that can provide weather information.
 
 When users ask about the weather:
 1. Identify the city name from their query
 2. Use the get_weather tool to retrieve weather information
+   - If the user asks about several cities, call get_weather_batch once with all of them
 3. Present the information in a friendly and clear manner
 
 Be concise and helpful. If you don't have weather information for a city, apologize and suggest checking a weather service directly.""",
-    tools=[get_weather_tool]
-)
+                tools=[get_weather_tool, get_weather_batch_tool]
+            )
+
+            # Compaction de l'historique (désactivée sans HISTORY_KEEP_TURNS)
+            install_history_compaction(_root_agent)
+            # Cache des appels modèle (désactivé sans MODEL_CACHE)
+            install_model_cache(_root_agent)
+    return _root_agent
+
+
+def __getattr__(name: str):
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,21 @@
 """Outils pour l'agent simple."""
 
+import asyncio
 from google.adk.tools import FunctionTool
 from typing import Literal
-import os
 
+from .weather_backend import convert_temperatures, get_weather_provider
 
-def get_weather(
+
+async def get_weather(
     city: str,
     units: Literal["celsius", "fahrenheit"] = "celsius"
 ) -> dict:
     """
     Get current weather information for a city.
     
-    This is a mock implementation. Replace with actual API call to a weather service.
+    Data comes from the configured weather provider (mock data by default,
+    or the HTTP API set in WEATHER_API_URL), behind a shared TTL cache.
     
     Args:
         city: The name of the city
@@ -27,41 +30,63 @@ def get_weather(
         - condition: Weather condition (e.g., "sunny", "rainy")
         - message: Error message if status is "error"
     """
-    # Mock implementation - replace with real API call
-    # Example: OpenWeatherMap, WeatherAPI, etc.
+    # Appel asynchrone : ne bloque pas la boucle d'événements du Runner
+    return await get_weather_provider().fetch(city, units)
+
+
+async def get_weather_batch(
+    cities: list[str],
+    units: Literal["celsius", "fahrenheit"] = "celsius"
+) -> dict:
+    """
+    Get current weather for several cities in a single call.
     
-    # Mock data for demonstration
-    mock_data = {
-        "paris": {"temp": 15, "condition": "cloudy"},
-        "london": {"temp": 12, "condition": "rainy"},
-        "new york": {"temp": 20, "condition": "sunny"},
-        "tokyo": {"temp": 18, "condition": "partly cloudy"},
-    }
+    Use this instead of calling get_weather repeatedly when the user asks
+    about more than one city (comparisons, lists of destinations, etc.).
     
-    city_lower = city.lower()
+    Args:
+        cities: The names of the cities
+        units: Temperature units (celsius or fahrenheit)
     
-    if city_lower in mock_data:
-        data = mock_data[city_lower]
-        
-        # Convert temperature if needed
-        temp = data["temp"]
-        if units == "fahrenheit":
-            temp = (temp * 9/5) + 32
-        
-        return {
-            "status": "success",
-            "city": city,
-            "temperature": str(temp),
-            "units": units,
-            "condition": data["condition"]
-        }
-    else:
-        return {
-            "status": "error",
-            "city": city,
-            "message": f"Weather information not available for {city}"
-        }
+    Returns:
+        Dictionary with keys:
+        - status: "success" if at least one city was found, else "error"
+        - units: Temperature units
+        - results: Mapping of city name to {"temperature", "condition"}
+        - unavailable: Cities with no weather information
+    """
+    # Dédoublonner (sans tenir compte de la casse) en gardant l'ordre de la demande
+    by_key = {}
+    for city in cities:
+        city = city.strip()
+        if city:
+            by_key.setdefault(city.lower(), city)
+    unique_cities = list(by_key.values())
+
+    # Récupérations concurrentes, toujours en °C pour partager les entrées
+    # du cache quelle que soit l'unité demandée
+    provider = get_weather_provider()
+    fetched = await asyncio.gather(
+        *(provider.fetch(city, "celsius") for city in unique_cities)
+    )
+
+    found = [(city, r) for city, r in zip(unique_cities, fetched) if r["status"] == "success"]
+    unavailable = [city for city, r in zip(unique_cities, fetched) if r["status"] != "success"]
+
+    # Conversion des températures en une seule passe
+    temperatures = convert_temperatures([float(r["temperature"]) for _, r in found], units)
+
+    return {
+        "status": "success" if found else "error",
+        "units": units,
+        "results": {
+            city: {"temperature": temp, "condition": r["condition"]}
+            for (city, r), temp in zip(found, temperatures)
+        },
+        "unavailable": unavailable
+    }
 
 
-# Créer l'outil ADK
+# Créer les outils ADK
 get_weather_tool = FunctionTool(get_weather)
+get_weather_batch_tool = FunctionTool(get_weather_batch)
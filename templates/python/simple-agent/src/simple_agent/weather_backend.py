@@ -0,0 +1,323 @@
+"""Backends météo asynchrones pour l'outil get_weather.
+
+Ce module sépare la source de données météo de l'outil ADK :
+
+- ``WeatherProvider`` : interface asynchrone commune
+- ``MockWeatherProvider`` : données statiques (comportement par défaut du template)
+- ``HttpWeatherProvider`` : client HTTP avec pool de connexions partagé
+- ``CachedWeatherProvider`` : cache TTL/LRU par (ville, unités) avec
+  coalescence des requêtes concurrentes identiques
+
+Le provider utilisé par l'outil est construit une seule fois par processus
+via ``get_weather_provider()`` à partir des variables d'environnement.
+"""
+
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+
+# Données de démonstration (°C)
+MOCK_WEATHER_DATA = {
+    "paris": {"temp": 15, "condition": "cloudy"},
+    "london": {"temp": 12, "condition": "rainy"},
+    "new york": {"temp": 20, "condition": "sunny"},
+    "tokyo": {"temp": 18, "condition": "partly cloudy"},
+}
+
+
+def celsius_to_fahrenheit(temp: float) -> float:
+    """Convertir une température de °C en °F."""
+    return (temp * 9/5) + 32
+
+
+def convert_temperatures(temps: list, units: str) -> list:
+    """Convertir une série de températures en °C vers ``units`` en une passe.
+
+    Les valeurs sont arrondies à 0,1 degré pour garder la réponse compacte.
+    """
+    if units == "fahrenheit":
+        return [round(t * 1.8 + 32, 1) for t in temps]
+    return [round(t, 1) for t in temps]
+
+
+class WeatherProvider(ABC):
+    """Interface d'un fournisseur de données météo.
+
+    ``fetch`` renvoie toujours un dictionnaire au format de l'outil
+    get_weather (clé ``status`` à "success" ou "error").
+    """
+
+    @abstractmethod
+    async def fetch(self, city: str, units: str) -> dict:
+        """Récupérer la météo d'une ville."""
+
+    async def aclose(self) -> None:
+        """Libérer les ressources (connexions, etc.)."""
+
+
+class MockWeatherProvider(WeatherProvider):
+    """Provider statique basé sur ``MOCK_WEATHER_DATA``."""
+
+    def __init__(self, data: Optional[dict] = None):
+        self._data = data if data is not None else MOCK_WEATHER_DATA
+
+    async def fetch(self, city: str, units: str) -> dict:
+        data = self._data.get(city.lower())
+        if data is None:
+            return {
+                "status": "error",
+                "city": city,
+                "message": f"Weather information not available for {city}"
+            }
+
+        temp = data["temp"]
+        if units == "fahrenheit":
+            temp = celsius_to_fahrenheit(temp)
+
+        return {
+            "status": "success",
+            "city": city,
+            "temperature": str(temp),
+            "units": units,
+            "condition": data["condition"]
+        }
+
+
+class HttpWeatherProvider(WeatherProvider):
+    """Provider HTTP avec un ``httpx.AsyncClient`` partagé.
+
+    Le client est créé paresseusement et réutilisé pour tous les appels, ce
+    qui garde les connexions keep-alive ouvertes au lieu d'ouvrir une
+    connexion TCP/TLS par appel d'outil.
+
+    L'API attendue répond à ``GET {base_url}/weather?city=...&units=...``
+    avec un JSON contenant ``temperature`` et ``condition``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client HTTP partagé (pool de connexions)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+            )
+        return self._client
+
+    async def fetch(self, city: str, units: str) -> dict:
+        params = {"city": city, "units": units}
+        if self.api_key:
+            params["appid"] = self.api_key
+
+        try:
+            response = await self.client.get("/weather", params=params)
+        except httpx.HTTPError as e:
+            return {"status": "error", "city": city, "message": f"API error: {e}"}
+
+        if response.status_code == 404:
+            return {
+                "status": "error",
+                "city": city,
+                "message": f"Weather information not available for {city}"
+            }
+        if response.status_code != 200:
+            return {
+                "status": "error",
+                "city": city,
+                "message": f"API error: HTTP {response.status_code}"
+            }
+
+        try:
+            data = response.json()
+            temperature, condition = data["temperature"], data["condition"]
+        except (ValueError, KeyError, TypeError) as e:
+            # Corps non JSON ou champs manquants : même erreur qu'un échec HTTP
+            return {
+                "status": "error",
+                "city": city,
+                "message": f"API error: invalid response ({e!r})"
+            }
+        return {
+            "status": "success",
+            "city": city,
+            "temperature": str(temperature),
+            "units": units,
+            "condition": condition
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+@dataclass
+class CacheStats:
+    """Compteurs du cache météo."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Part des appels servis sans requête amont dédiée."""
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Éviter l'avertissement "exception never retrieved" si plus personne n'attend."""
+    if not task.cancelled():
+        task.exception()
+
+
+class CachedWeatherProvider(WeatherProvider):
+    """Cache TTL + LRU devant un autre provider.
+
+    - Clé : ``(ville normalisée, unités)``
+    - Les entrées expirent après ``ttl`` secondes
+    - Au-delà de ``max_entries``, l'entrée la moins récemment utilisée est évincée
+    - Les appels concurrents sur une même clé partagent une seule requête
+      amont (coalescence) : 500 « météo à Paris » simultanés = 1 appel
+
+    Les réponses en erreur ne sont pas mises en cache.
+    """
+
+    def __init__(
+        self,
+        provider: WeatherProvider,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+    ):
+        self.provider = provider
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict = OrderedDict()
+        self._inflight: dict = {}
+
+    @staticmethod
+    def _key(city: str, units: str) -> tuple:
+        return (" ".join(city.lower().split()), units)
+
+    async def fetch(self, city: str, units: str) -> dict:
+        key = self._key(city, units)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return {**result, "city": city}
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            # Requête amont détachée de l'appelant qui la lance : annuler cet
+            # appelant n'annule pas la requête partagée par les autres
+            task = asyncio.create_task(self._fetch_upstream(key, city, units))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+        result = await asyncio.shield(task)
+        return {**result, "city": city}
+
+    async def _fetch_upstream(self, key: tuple, city: str, units: str) -> dict:
+        try:
+            result = await self.provider.fetch(city, units)
+            if result.get("status") == "success":
+                self._store(key, result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def _store(self, key: tuple, result: dict) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Vider le cache et remettre les compteurs à zéro."""
+        self._entries.clear()
+        self.stats = CacheStats()
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+
+_provider: Optional[WeatherProvider] = None
+
+
+def build_weather_provider() -> WeatherProvider:
+    """Construire le provider à partir des variables d'environnement.
+
+    - ``WEATHER_API_URL`` : URL de l'API météo (sinon données mock)
+    - ``WEATHER_API_KEY`` : clé d'API optionnelle
+    - ``WEATHER_CACHE_TTL`` : durée de vie du cache en secondes (0 = désactivé)
+    - ``WEATHER_CACHE_SIZE`` : nombre maximal d'entrées en cache
+    """
+    api_url = os.getenv("WEATHER_API_URL")
+    if api_url:
+        provider: WeatherProvider = HttpWeatherProvider(
+            base_url=api_url,
+            api_key=os.getenv("WEATHER_API_KEY"),
+        )
+    else:
+        provider = MockWeatherProvider()
+
+    ttl = float(os.getenv("WEATHER_CACHE_TTL", "300"))
+    if ttl <= 0:
+        return provider
+
+    return CachedWeatherProvider(
+        provider,
+        ttl=ttl,
+        max_entries=int(os.getenv("WEATHER_CACHE_SIZE", "1024")),
+    )
+
+
+def get_weather_provider() -> WeatherProvider:
+    """Provider partagé par le processus (construit au premier appel)."""
+    global _provider
+    if _provider is None:
+        _provider = build_weather_provider()
+    return _provider
+
+
+def set_weather_provider(provider: Optional[WeatherProvider]) -> None:
+    """Remplacer le provider partagé (tests, benchmarks, intégration)."""
+    global _provider
+    _provider = provider
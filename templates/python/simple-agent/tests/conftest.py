@@ -14,3 +14,11 @@ else:
     if env_example_path.exists():
         load_dotenv(env_example_path)
 
+# Sans identifiants Gemini réels, utiliser le backend LLM local (ADK_FAKE_LLM)
+_placeholders = ("", "your-api-key-here", "your-project-id")
+if os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "0").lower() in ("1", "true"):
+    _has_credentials = os.getenv("GOOGLE_CLOUD_PROJECT", "") not in _placeholders
+else:
+    _has_credentials = os.getenv("GOOGLE_API_KEY", "") not in _placeholders
+if not _has_credentials:
+    os.environ.setdefault("ADK_FAKE_LLM", "1")
@@ -1,5 +1,6 @@
 """Tests pour l'agent simple."""
 
+import os
 import pytest
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
@@ -53,22 +54,42 @@ async def test_agent_basic_interaction():
     assert len(final_responses) > 0
 
 
-def test_weather_tool():
+@pytest.mark.asyncio
+async def test_weather_tool():
     """Test de l'outil météo."""
     from src.simple_agent.tools import get_weather
     
     # Test avec une ville connue
-    result = get_weather("Paris", "celsius")
+    result = await get_weather("Paris", "celsius")
     assert result["status"] == "success"
     assert result["city"] == "Paris"
     assert "temperature" in result
     
     # Test avec une ville inconnue
-    result = get_weather("UnknownCity", "celsius")
+    result = await get_weather("UnknownCity", "celsius")
     assert result["status"] == "error"
     assert "message" in result
 
 
+@pytest.mark.asyncio
+async def test_weather_batch_tool():
+    """Test de l'outil météo multi-villes."""
+    from src.simple_agent.tools import get_weather_batch
+    
+    result = await get_weather_batch(
+        ["Paris", "Tokyo", "paris", "UnknownCity"], "fahrenheit"
+    )
+    assert result["status"] == "success"
+    assert result["units"] == "fahrenheit"
+    assert list(result["results"]) == ["Paris", "Tokyo"]
+    assert result["results"]["Paris"]["temperature"] == 59.0
+    assert result["unavailable"] == ["UnknownCity"]
+    
+    result = await get_weather_batch(["UnknownCity"], "celsius")
+    assert result["status"] == "error"
+    assert result["results"] == {}
+
+
 @pytest.mark.asyncio
 async def test_agent_weather_query():
     """Test de l'agent avec une requête météo."""
@@ -109,3 +130,18 @@ async def test_agent_weather_query():
         e for e in events if e.is_final_response()
     ]
     assert len(final_responses) > 0
+
+
+def test_agent_module_import_is_lazy():
+    """Test qu'importer agent.py ne charge pas ADK (construction différée)."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = {k: v for k, v in os.environ.items() if k != "ADK_FAKE_LLM"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, src.simple_agent.agent; print('google.adk' in sys.modules)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "False", result.stderr
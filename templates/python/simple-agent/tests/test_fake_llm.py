@@ -0,0 +1,82 @@
+"""Tests pour le backend LLM local (ADK_FAKE_LLM)."""
+
+import json
+
+import pytest
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from src.simple_agent.fake_llm import FakeGemini
+from src.simple_agent.tools import get_weather_batch_tool, get_weather_tool
+
+
+def make_request(text: str, instruction: str = "You are helpful.", tools=()) -> LlmRequest:
+    """Construire une requête LLM minimale avec des outils déclarés."""
+    request = LlmRequest(
+        model="gemini-2.5-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(system_instruction=instruction),
+    )
+    request.append_tools(list(tools))
+    return request
+
+
+async def collect(llm: FakeGemini, request: LlmRequest, stream: bool = False) -> list:
+    return [r async for r in llm.generate_content_async(request, stream=stream)]
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_calls_matching_tool():
+    """Test que le fake émet un appel d'outil avec la ville extraite."""
+    llm = FakeGemini(model="gemini-2.5-flash")
+    tools = [get_weather_tool, get_weather_batch_tool]
+
+    [single] = await collect(llm, make_request("What's the weather in Paris?", tools=tools))
+    call = single.content.parts[0].function_call
+    assert call.name == "get_weather"
+    assert call.args == {"city": "Paris"}
+
+    [batch] = await collect(llm, make_request("Weather in Paris and New York?", tools=tools))
+    call = batch.content.parts[0].function_call
+    assert call.name == "get_weather_batch"
+    assert call.args == {"cities": ["Paris", "New York"]}
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_is_deterministic_and_reports_usage():
+    """Test du texte déterministe et des compteurs de tokens."""
+    llm = FakeGemini(model="gemini-2.5-flash", output_tokens=12)
+    [first] = await collect(llm, make_request("Hello"))
+    [second] = await collect(llm, make_request("Hello"))
+
+    assert first.content.parts[0].text == second.content.parts[0].text
+    assert len(first.content.parts[0].text.split()) == 12
+    assert first.usage_metadata.candidates_token_count > 0
+    assert first.usage_metadata.prompt_token_count > 0
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_streams_partial_chunks():
+    """Test du mode streaming : chunks partiels puis réponse agrégée."""
+    llm = FakeGemini(model="gemini-2.5-flash", output_tokens=5)
+    responses = await collect(llm, make_request("Hello"), stream=True)
+
+    partials = [r for r in responses if r.partial]
+    assert len(partials) == 5
+    final = responses[-1]
+    assert final.partial is False
+    assert "".join(p.content.parts[0].text for p in partials) == final.content.parts[0].text
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_scripted_rules(tmp_path, monkeypatch):
+    """Test des règles scriptées chargées depuis ADK_FAKE_LLM_SCRIPT."""
+    script = tmp_path / "script.json"
+    script.write_text(json.dumps([
+        {"match": "Tokyo", "text": "Always sunny in Tokyo."},
+    ]))
+    monkeypatch.setenv("ADK_FAKE_LLM_SCRIPT", str(script))
+
+    llm = FakeGemini(model="gemini-2.5-flash")
+    [response] = await collect(llm, make_request("Weather in Tokyo?", tools=[get_weather_tool]))
+    assert response.content.parts[0].text == "Always sunny in Tokyo."
@@ -0,0 +1,70 @@
+"""Tests pour le serveur HTTP multi-utilisateurs."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from server import AgentServer, SessionLocks, create_app
+from src.simple_agent.agent import build_root_agent
+
+
+@pytest.mark.asyncio
+async def test_session_locks_order_and_parallelism():
+    """Test : ordre conservé dans une session, sessions différentes en parallèle."""
+    locks = SessionLocks()
+    log = []
+    running = 0
+    max_running = 0
+
+    async def turn(session: str, index: int):
+        nonlocal running, max_running
+        async with locks.hold(("user", session)):
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            log.append((session, index))
+            running -= 1
+
+    await asyncio.gather(*(turn(s, i) for i in range(5) for s in ("a", "b", "c")))
+
+    for session in ("a", "b", "c"):
+        assert [i for s, i in log if s == session] == list(range(5))
+    assert max_running == 3
+    assert len(locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_in_one_session_stay_ordered():
+    """Test : les messages d'une session sont enregistrés dans l'ordre d'envoi."""
+    session_service = InMemorySessionService()
+    runner = Runner(agent=build_root_agent(), app_name="agents", session_service=session_service)
+    server = AgentServer(runner, session_service)
+
+    messages = [f"Weather in Paris, question {i}?" for i in range(5)]
+    results = await asyncio.gather(*(server.run_turn("alice", "s1", m) for m in messages))
+    assert all(r.events > 0 for r in results)
+
+    session = await session_service.get_session(app_name="agents", user_id="alice", session_id="s1")
+    user_texts = [e.content.parts[0].text for e in session.events if e.author == "user"]
+    assert user_texts == messages
+    assert server.turns == 5 and server.in_flight == 0
+
+
+def test_http_endpoints():
+    """Test des routes HTTP (message et santé)."""
+    with TestClient(create_app(InMemorySessionService())) as client:
+        response = client.post(
+            "/users/bob/sessions/s1/messages", json={"message": "What's the weather in Paris?"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["user_id"] == "bob" and body["session_id"] == "s1"
+        assert body["response"]
+
+        health = client.get("/health").json()
+        assert health == {"status": "ok", "turns": 1, "in_flight": 0, "active_sessions": 0}
+
+        assert client.post("/users/bob/sessions/s1/messages", json={}).status_code == 422
@@ -0,0 +1,161 @@
+"""Tests pour les backends météo asynchrones."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.simple_agent.weather_backend import (
+    CachedWeatherProvider,
+    HttpWeatherProvider,
+    MockWeatherProvider,
+    WeatherProvider,
+)
+
+
+class SlowCountingProvider(WeatherProvider):
+    """Provider de test qui compte les appels amont."""
+
+    def __init__(self, delay: float = 0.01):
+        self.calls = 0
+        self.delay = delay
+
+    async def fetch(self, city: str, units: str) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if city.lower() == "nowhere":
+            return {"status": "error", "city": city, "message": "unknown"}
+        return {"status": "success", "city": city, "temperature": "15",
+                "units": units, "condition": "cloudy"}
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_converts_units():
+    """Test de la conversion °C → °F du provider mock."""
+    provider = MockWeatherProvider()
+    result = await provider.fetch("Paris", "fahrenheit")
+    assert result["status"] == "success"
+    assert float(result["temperature"]) == 59.0
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_requests():
+    """Test que 500 appels simultanés ne font qu'un appel amont."""
+    upstream = SlowCountingProvider()
+    cache = CachedWeatherProvider(upstream, ttl=60)
+
+    results = await asyncio.gather(
+        *(cache.fetch("Paris", "celsius") for _ in range(500))
+    )
+
+    assert upstream.calls == 1
+    assert all(r["status"] == "success" for r in results)
+    assert cache.stats.misses == 1
+    assert cache.stats.coalesced == 499
+
+
+@pytest.mark.asyncio
+async def test_cancelling_first_caller_does_not_cancel_coalesced_waiters():
+    """Test : la requête partagée survit à l'annulation de l'appelant qui l'a lancée."""
+    upstream = SlowCountingProvider(delay=0.05)
+    cache = CachedWeatherProvider(upstream, ttl=60)
+
+    leader = asyncio.create_task(cache.fetch("Paris", "celsius"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.fetch("Paris", "celsius"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    result = await waiter
+    assert result["status"] == "success"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert upstream.calls == 1
+    assert (await cache.fetch("Paris", "celsius"))["status"] == "success"
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_keys_on_units_and_skips_errors():
+    """Test de la clé (ville, unités) et de la non-mise en cache des erreurs."""
+    upstream = SlowCountingProvider(delay=0)
+    cache = CachedWeatherProvider(upstream, ttl=60)
+
+    await cache.fetch("Paris", "celsius")
+    await cache.fetch("paris ", "celsius")
+    await cache.fetch("Paris", "fahrenheit")
+    assert upstream.calls == 2
+
+    await cache.fetch("Nowhere", "celsius")
+    await cache.fetch("Nowhere", "celsius")
+    assert upstream.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_and_lru_eviction():
+    """Test de l'expiration TTL et de l'éviction LRU."""
+    upstream = SlowCountingProvider(delay=0)
+    cache = CachedWeatherProvider(upstream, ttl=60, max_entries=2)
+
+    await cache.fetch("Paris", "celsius")
+    await cache.fetch("London", "celsius")
+    await cache.fetch("Paris", "celsius")  # Paris devient le plus récent
+    await cache.fetch("Tokyo", "celsius")  # évince London
+    assert cache.stats.evictions == 1
+
+    await cache.fetch("Paris", "celsius")
+    assert upstream.calls == 3
+    await cache.fetch("London", "celsius")
+    assert upstream.calls == 4
+
+    cache.ttl = 0
+    cache.clear()
+    await cache.fetch("Paris", "celsius")
+    await cache.fetch("Paris", "celsius")
+    assert upstream.calls == 6
+
+
+@pytest.mark.asyncio
+async def test_http_provider_against_stub_server():
+    """Test du provider HTTP contre le stub météo local."""
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+    from weather_stub_server import WeatherStubServer
+
+    server = WeatherStubServer(latency_ms=0)
+    await server.start()
+    provider = HttpWeatherProvider(server.url)
+    try:
+        ok = await provider.fetch("Tokyo", "celsius")
+        missing = await provider.fetch("Atlantis", "celsius")
+    finally:
+        await provider.aclose()
+        await server.stop()
+
+    assert ok["status"] == "success"
+    assert ok["condition"] == "partly cloudy"
+    assert missing["status"] == "error"
+    assert server.request_count == 2
+
+
+@pytest.mark.asyncio
+async def test_http_provider_invalid_body_is_an_error():
+    """Test : corps non JSON ou champs manquants → erreur, pas d'exception."""
+    bodies = {"Lima": b"<html>maintenance</html>", "Oslo": b'{"temperature": 4}',
+              "Rome": b"[1, 2]"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=bodies[request.url.params["city"]])
+
+    provider = HttpWeatherProvider("http://weather.test")
+    provider._client = httpx.AsyncClient(base_url=provider.base_url,
+                                         transport=httpx.MockTransport(handler))
+    try:
+        results = [await provider.fetch(city, "celsius") for city in bodies]
+    finally:
+        await provider.aclose()
+
+    assert [r["status"] for r in results] == ["error"] * 3
+    assert all(r["message"].startswith("API error: invalid response") for r in results)